@@ -0,0 +1,314 @@
+"""Share WebSocket events, connected clients and skip votes between uvicorn workers through Redis.
+
+Skip vote totals are kept incrementally: each client's vote weight is added when it joins and
+subtracted when it leaves, and votes move the voted total by the voter's weight, all inside Lua
+scripts so concurrent workers never read half an update. Reading the status is then one round
+trip no matter how many clients are connected.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+
+import redis.asyncio as aioredis
+
+from backend.config import settings
+from backend.services.redis_client import get_redis_queue_client
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "ws:events"
+CLIENTS_KEY = "ws:clients"
+SKIP_VOTES_KEY = "ws:skip_votes"
+CLIENT_WEIGHTS_KEY = "ws:client_weights"
+VOTE_TOTALS_KEY = "ws:vote_totals"
+WORKER_KEY_PREFIX = "ws:worker:"
+WORKER_TTL = 15
+WORKER_HEARTBEAT_INTERVAL = 5
+RECONNECT_DELAY = 2.0
+
+# Identifies this process on the backplane so it can ignore its own events
+WORKER_ID = uuid.uuid4().hex
+
+# KEYS: weights, votes, totals. ARGV: client_id, weight. Adds or re-weights a connected client
+_JOIN_SCRIPT = """
+local delta = tonumber(ARGV[2]) - (tonumber(redis.call('hget', KEYS[1], ARGV[1])) or 0)
+redis.call('hset', KEYS[1], ARGV[1], ARGV[2])
+redis.call('hincrby', KEYS[3], 'total', delta)
+if redis.call('sismember', KEYS[2], ARGV[1]) == 1 then
+    redis.call('hincrby', KEYS[3], 'votes', delta)
+end
+return delta
+"""
+
+# KEYS: clients. ARGV: client_id, JSON object of fields. Merges fields into an existing entry, keeping its worker
+_MERGE_SCRIPT = """
+local raw = redis.call('hget', KEYS[1], ARGV[1])
+if not raw then
+    return 0
+end
+local entry = cjson.decode(raw)
+for field, value in pairs(cjson.decode(ARGV[2])) do
+    entry[field] = value
+end
+redis.call('hset', KEYS[1], ARGV[1], cjson.encode(entry))
+return 1
+"""
+
+# KEYS: clients, weights, votes, totals. ARGV: client_id. Removes a client, its weight and its vote
+_LEAVE_SCRIPT = """
+redis.call('hdel', KEYS[1], ARGV[1])
+local weight = tonumber(redis.call('hget', KEYS[2], ARGV[1]))
+if not weight then
+    redis.call('srem', KEYS[3], ARGV[1])
+    return 0
+end
+redis.call('hdel', KEYS[2], ARGV[1])
+redis.call('hincrby', KEYS[4], 'total', -weight)
+if redis.call('srem', KEYS[3], ARGV[1]) == 1 then
+    redis.call('hincrby', KEYS[4], 'votes', -weight)
+end
+return weight
+"""
+
+# KEYS: weights, votes, totals. ARGV: client_id, 1 to vote or 0 to withdraw. Ignores unknown clients
+_VOTE_SCRIPT = """
+local weight = tonumber(redis.call('hget', KEYS[1], ARGV[1]))
+if not weight then
+    return 0
+end
+if ARGV[2] == '1' then
+    if redis.call('sadd', KEYS[2], ARGV[1]) == 1 then
+        redis.call('hincrby', KEYS[3], 'votes', weight)
+    end
+elseif redis.call('srem', KEYS[2], ARGV[1]) == 1 then
+    redis.call('hincrby', KEYS[3], 'votes', -weight)
+end
+return 1
+"""
+
+# KEYS: votes, totals. Drops every vote while keeping the connected total
+_CLEAR_SCRIPT = """
+redis.call('del', KEYS[1])
+redis.call('hset', KEYS[2], 'votes', 0)
+return 1
+"""
+
+
+def _leave(pipe, client_id: str):
+    pipe.eval(_LEAVE_SCRIPT, 4, CLIENTS_KEY, CLIENT_WEIGHTS_KEY, SKIP_VOTES_KEY, VOTE_TOTALS_KEY, client_id)
+
+
+def publish_event(message: dict, groups: tuple[str, ...] = (), coalesce: str | None = None, target: str | None = None):
+    """Publish a WebSocket message for the other workers to deliver to their own sockets.
+
+    groups names the active_connections groups to fan out to, and target a single client_id.
+    Publishing is best effort: with Redis down every worker still serves its own sockets.
+    """
+    event = {"origin": WORKER_ID, "groups": list(groups), "coalesce": coalesce, "target": target, "message": message}
+    try:
+        get_redis_queue_client().publish(EVENTS_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.debug("Failed to publish WebSocket event to the backplane: %s", e)
+
+
+def publish_client_update(client_id: str, fields: dict):
+    """Tell the other workers to apply a registry change to their local entry for a client."""
+    event = {"origin": WORKER_ID, "client_update": {"client_id": client_id, "fields": fields}}
+    try:
+        get_redis_queue_client().publish(EVENTS_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.debug("Failed to publish client update to the backplane: %s", e)
+
+
+async def _relay(pubsub, deliver: Callable[[dict], Awaitable[None]]):
+    """Hand every event on a subscribed connection that another worker published to deliver()."""
+    async for raw in pubsub.listen():
+        if raw.get("type") != "message":
+            continue
+        event = json.loads(raw["data"])
+        if event.get("origin") == WORKER_ID:
+            continue
+        try:
+            await deliver(event)
+        except Exception:
+            logger.exception("Failed to deliver backplane event")
+
+
+async def backplane_listener(deliver: Callable[[dict], Awaitable[None]]):
+    """Background task that hands events published by other workers to deliver()."""
+    logger.info("WebSocket backplane listener started for worker %s.", WORKER_ID)
+    while True:
+        client = aioredis.from_url(settings.redis_url, decode_responses=True)
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(EVENTS_CHANNEL)
+            await _relay(pubsub, deliver)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("WebSocket backplane connection lost (%s), reconnecting.", e)
+        finally:
+            await pubsub.aclose()
+            await client.aclose()
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def worker_heartbeat():
+    """Background task that advertises this worker as alive so its clients count towards totals.
+
+    Each beat also prunes the clients of workers that stopped heartbeating, which takes their
+    weight and votes back out of the shared skip vote totals.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(
+                get_redis_queue_client().set, f"{WORKER_KEY_PREFIX}{WORKER_ID}", "1", ex=WORKER_TTL
+            )
+            await asyncio.to_thread(load_clients)
+        except Exception as e:
+            logger.debug("Failed to refresh backplane worker heartbeat: %s", e)
+        await asyncio.sleep(WORKER_HEARTBEAT_INTERVAL)
+
+
+def retire_worker(client_ids):
+    """Remove this worker and the clients it was serving from the shared state on shutdown."""
+    try:
+        client = get_redis_queue_client()
+        pipe = client.pipeline()
+        pipe.delete(f"{WORKER_KEY_PREFIX}{WORKER_ID}")
+        for client_id in client_ids:
+            _leave(pipe, client_id)
+        pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to retire backplane worker: %s", e)
+
+
+def store_client(client_id: str, entry: dict, weight: int = 1) -> bool:
+    """Record a connected client in the shared registry, tagged with the worker serving it.
+
+    weight is the client's skip vote weight, folded into the shared totals.
+
+    Returns:
+        True if the entry reached Redis.
+    """
+    try:
+        client = get_redis_queue_client()
+        pipe = client.pipeline()
+        pipe.hset(CLIENTS_KEY, client_id, json.dumps({**entry, "worker": WORKER_ID}))
+        pipe.set(f"{WORKER_KEY_PREFIX}{WORKER_ID}", "1", ex=WORKER_TTL)
+        pipe.eval(_JOIN_SCRIPT, 3, CLIENT_WEIGHTS_KEY, SKIP_VOTES_KEY, VOTE_TOTALS_KEY, client_id, weight)
+        pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to store client %s on the backplane: %s", client_id, e)
+        return False
+    return True
+
+
+def merge_client(client_id: str, fields: dict) -> bool:
+    """Change fields of a client's shared registry entry, leaving the worker that serves it as its owner.
+
+    Unlike store_client, this never moves the client to this worker or touches its vote weight,
+    so the owning worker still removes it when it disconnects.
+
+    Returns:
+        True if the client had a shared entry and it was updated.
+    """
+    try:
+        return bool(get_redis_queue_client().eval(_MERGE_SCRIPT, 1, CLIENTS_KEY, client_id, json.dumps(fields)))
+    except Exception as e:
+        logger.debug("Failed to update client %s on the backplane: %s", client_id, e)
+        return False
+
+
+def drop_client(client_id: str, *, owned_only: bool = True):
+    """Remove a disconnected client, its vote weight and its skip vote from the shared state.
+
+    With owned_only, an entry that a reconnect already moved to another worker is left alone.
+    """
+    try:
+        client = get_redis_queue_client()
+        if owned_only:
+            raw = client.hget(CLIENTS_KEY, client_id)
+            if isinstance(raw, str) and json.loads(raw).get("worker") not in {None, WORKER_ID}:
+                return
+        client.eval(_LEAVE_SCRIPT, 4, CLIENTS_KEY, CLIENT_WEIGHTS_KEY, SKIP_VOTES_KEY, VOTE_TOTALS_KEY, client_id)
+    except Exception as e:
+        logger.debug("Failed to drop client %s from the backplane: %s", client_id, e)
+
+
+def load_clients() -> dict[str, dict] | None:
+    """Read every connected client across workers, pruning clients of workers that stopped heartbeating.
+
+    Returns:
+        A dict of client_id to registry entry, or None if Redis is unreachable.
+    """
+    try:
+        client = get_redis_queue_client()
+        raw = client.hgetall(CLIENTS_KEY)
+        if not isinstance(raw, dict):
+            return None
+        entries = {client_id: json.loads(value) for client_id, value in raw.items()}
+
+        workers = sorted({entry.get("worker") for entry in entries.values() if entry.get("worker")})
+        pipe = client.pipeline(transaction=False)
+        for worker in workers:
+            pipe.exists(f"{WORKER_KEY_PREFIX}{worker}")
+        dead = {worker for worker, alive in zip(workers, pipe.execute(), strict=True) if not alive}
+    except Exception as e:
+        logger.debug("Failed to load clients from the backplane: %s", e)
+        return None
+
+    stale = [client_id for client_id, entry in entries.items() if entry.get("worker") in dead]
+    if stale:
+        logger.info("Pruning %d clients of stopped workers from the backplane.", len(stale))
+        for client_id in stale:
+            entries.pop(client_id)
+            drop_client(client_id, owned_only=False)
+    return entries
+
+
+def cast_vote(client_id: str, vote: bool) -> bool:
+    """Add or withdraw a client's skip vote, moving the shared voted total by its weight.
+
+    Returns:
+        True if the change reached Redis.
+    """
+    try:
+        get_redis_queue_client().eval(
+            _VOTE_SCRIPT, 3, CLIENT_WEIGHTS_KEY, SKIP_VOTES_KEY, VOTE_TOTALS_KEY, client_id, 1 if vote else 0
+        )
+    except Exception as e:
+        logger.debug("Failed to record skip vote for %s on the backplane: %s", client_id, e)
+        return False
+    return True
+
+
+def clear_votes():
+    """Drop every skip vote across all workers."""
+    try:
+        get_redis_queue_client().eval(_CLEAR_SCRIPT, 2, SKIP_VOTES_KEY, VOTE_TOTALS_KEY)
+    except Exception as e:
+        logger.debug("Failed to clear skip votes on the backplane: %s", e)
+
+
+def load_vote_status() -> dict | None:
+    """Read the weighted skip vote totals kept across all workers.
+
+    Returns:
+        The votes, total and voted_ids of the current skip vote, or None if Redis is unreachable.
+    """
+    try:
+        pipe = get_redis_queue_client().pipeline(transaction=True)
+        pipe.hmget(VOTE_TOTALS_KEY, ["votes", "total"])
+        pipe.smembers(SKIP_VOTES_KEY)
+        totals, voted_ids = pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to load skip votes from the backplane: %s", e)
+        return None
+    if not isinstance(totals, list) or not isinstance(voted_ids, set):
+        return None
+    votes, total = (int(value or 0) for value in totals)
+    return {"votes": votes, "total": total, "voted_ids": sorted(voted_ids)}
@@ -0,0 +1,110 @@
+"""Compare WebSocket broadcast latency before and after the concurrent broadcast hub.
+
+Run with ``python -m backend.benchmarks.broadcast_latency``. Each simulated socket takes a few
+milliseconds to accept a frame, and a handful behave like phones on bad party Wi-Fi.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from backend.broadcast import broadcast
+
+
+class SimulatedSocket:
+    """Accept text frames after a per-socket network delay."""
+
+    def __init__(self, delay: float):
+        """Create a socket that takes delay seconds to accept each frame."""
+        self.delay = delay
+
+    async def send_text(self, payload: str):
+        """Accept a frame once the simulated network delay has passed."""
+        await asyncio.sleep(self.delay)
+
+    async def close(self):
+        """Close the socket; there is nothing to release."""
+
+
+def build_sockets(count: int, slow: int, seed: int) -> dict:
+    """Build count simulated sockets, slow of them stalling for 250 ms per frame.
+
+    Returns:
+        The sockets keyed by session id, as in an active_connections group.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    sockets = {str(i): SimulatedSocket(rng.uniform(0.0005, 0.003)) for i in range(count)}
+    for session_id in rng.sample(list(sockets), slow):
+        sockets[session_id].delay = 0.25
+    return sockets
+
+
+def build_message(queue_length: int) -> dict:
+    """Build a queue_update message shaped like a real one.
+
+    Returns:
+        The message, with queue_length queue entries.
+    """
+    queue = [
+        {
+            "item_id": 100000 + i,
+            "title": f"Track {i}",
+            "artist": "Some Artist",
+            "duration": 215000,
+            "album_art": f"/library/metadata/{100000 + i}/thumb/1700000000",
+            "server_id": "0123456789abcdef0123456789abcdef01234567",
+            "server_name": "Living Room Plex",
+            "moods": ["Energetic", "Party"],
+        }
+        for i in range(queue_length)
+    ]
+    return {"type": "queue_update", "message": "Queue update", "queue": queue, "vibes": ["Party"]}
+
+
+async def sequential_broadcast(message: dict, connections: dict):
+    """The previous behaviour: await each socket in turn, serializing the message every time."""
+    for ws in list(connections.values()):
+        await ws.send_text(json.dumps(message))
+
+
+async def run(count: int, slow: int, rounds: int, queue_length: int, send_timeout: float):
+    """Time both broadcast strategies over fresh sockets each round and print the results."""
+    message = build_message(queue_length)
+    results = {}
+    for name, send in (
+        ("sequential", lambda conns: sequential_broadcast(message, conns)),
+        ("hub", lambda conns: broadcast(message, conns, send_timeout=send_timeout)),
+    ):
+        timings = []
+        for round_number in range(rounds):
+            connections = build_sockets(count, slow, seed=round_number)
+            start = time.perf_counter()
+            await send(connections)
+            timings.append(time.perf_counter() - start)
+        results[name] = timings
+
+    print(f"{count} sockets ({slow} slow), {queue_length}-entry queue, {rounds} rounds")  # noqa: T201
+    for name, timings in results.items():
+        print(  # noqa: T201
+            f"  {name:<10} median {statistics.median(timings) * 1000:9.1f} ms   "
+            f"max {max(timings) * 1000:9.1f} ms"
+        )
+
+
+def main():
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sockets", type=int, default=500)
+    parser.add_argument("--slow", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--queue-length", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(run(args.sockets, args.slow, args.rounds, args.queue_length, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare the size of a queue_update frame in each WebSocket framing a client can negotiate.
+
+Run with ``python -m backend.benchmarks.frame_size``. Deflated sizes follow permessage-deflate
+(RFC 7692): raw deflate, sync-flushed, with the trailing empty block stripped. The "next frame"
+column sends the same queue again with one entry removed over a connection that keeps its
+compression context, as uvicorn's default permessage-deflate does.
+"""
+
+import argparse
+import zlib
+
+from backend.benchmarks.broadcast_latency import build_message
+from backend.broadcast import JSON, MSGPACK, encode, msgpack
+
+
+def deflate_frames(payloads: list[bytes]) -> list[int]:
+    """Compress consecutive frames on one permessage-deflate context.
+
+    Returns:
+        The compressed size of each frame in bytes.
+    """
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    sizes = []
+    for payload in payloads:
+        data = compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        sizes.append(len(data.removesuffix(b"\x00\x00\xff\xff")))
+    return sizes
+
+
+def as_bytes(payload: str | bytes) -> bytes:
+    """Return a frame as the bytes that go on the wire."""
+    return payload.encode() if isinstance(payload, str) else payload
+
+
+def main():
+    """Parse the command line and print the frame size table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queue-length", type=int, default=200)
+    args = parser.parse_args()
+
+    first = build_message(args.queue_length)
+    second = {**first, "queue": first["queue"][1:]}
+
+    encodings = [JSON] if msgpack is None else [JSON, MSGPACK]
+    baseline = len(as_bytes(encode(first, JSON)))
+    print(f"queue_update frame with {args.queue_length} entries")  # noqa: T201
+    print(f"{'framing':<20}{'bytes':>10}{'vs JSON':>10}{'next frame':>12}")  # noqa: T201
+    for encoding in encodings:
+        payloads = [as_bytes(encode(first, encoding)), as_bytes(encode(second, encoding))]
+        size = len(payloads[0])
+        print(f"{encoding:<20}{size:>10}{size / baseline:>10.0%}{len(payloads[1]):>12}")  # noqa: T201
+        deflated, next_deflated = deflate_frames(payloads)
+        label = f"{encoding} + deflate"
+        print(f"{label:<20}{deflated:>10}{deflated / baseline:>10.0%}{next_deflated:>12}")  # noqa: T201
+    if msgpack is None:
+        print("msgpack is not installed; only JSON framings were measured.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
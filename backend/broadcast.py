@@ -0,0 +1,383 @@
+"""Fan WebSocket messages out to many connections at once."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from fastapi import WebSocket
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Frame encodings a connection can ask for; msgpack frames are sent as binary
+JSON = "json"
+MSGPACK = "msgpack"
+# Server-Sent Events text, used by the read-only display feed rather than negotiated
+SSE = "sse"
+
+SEND_TIMEOUT = 2.0
+OUTBOX_MAX_FRAMES = 64
+OUTBOX_MAX_BYTES = 1024 * 1024
+OUTBOX_GRACE = 5.0
+
+# Keep references to fire-and-forget close tasks so they are not garbage collected mid-flight
+_closing: set[asyncio.Task] = set()
+
+
+def encode(message: dict, encoding: str = JSON) -> str | bytes:
+    """Serialize a message for the wire in the given frame encoding.
+
+    An SSE frame is a complete event whose id is the message's seq, so a display can resume
+    from it with Last-Event-ID.
+
+    Returns:
+        JSON text, msgpack bytes, or SSE event text.
+    """
+    if encoding == MSGPACK:
+        return msgpack.packb(message, use_bin_type=True)
+    payload = json.dumps(message)
+    if encoding == SSE:
+        event_id = f"id: {message['seq']}\n" if message.get("seq") else ""
+        return f"{event_id}data: {payload}\n\n"
+    return payload
+
+
+async def _send_frame(ws: WebSocket, payload: str | bytes):
+    if isinstance(payload, bytes):
+        await ws.send_bytes(payload)
+    else:
+        await ws.send_text(payload)
+
+
+async def _close_quietly(ws: WebSocket):
+    with contextlib.suppress(Exception):
+        await ws.close()
+
+
+def _close_in_background(ws: WebSocket):
+    task = asyncio.create_task(_close_quietly(ws))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+class Outbox:
+    """Bounded, coalescing buffer of frames waiting to be written to one WebSocket.
+
+    Producers call put() and return immediately; a dedicated writer task drains the buffer
+    to the socket. Frames queued with a coalesce key replace any older pending frame with
+    the same key, so a slow client skips stale now-playing ticks and queue snapshots rather
+    than replaying them. A client that stays over budget for OUTBOX_GRACE seconds, or falls
+    twice as far behind as the frame budget allows, is disconnected. encoding is the frame
+    encoding the client negotiated.
+    """
+
+    def __init__(
+        self,
+        ws: WebSocket,
+        max_frames: int = OUTBOX_MAX_FRAMES,
+        max_bytes: int = OUTBOX_MAX_BYTES,
+        grace: float = OUTBOX_GRACE,
+    ):
+        """Wrap a socket in an empty outbox and start its writer task."""
+        self.ws = ws
+        self.encoding = JSON
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.grace = grace
+        self.frames: deque[tuple[str | None, str | bytes]] = deque()
+        self.size = 0
+        self.over_budget_since: float | None = None
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._writer_task = asyncio.create_task(self._writer())
+
+    def _over_budget(self) -> bool:
+        return len(self.frames) > self.max_frames or self.size > self.max_bytes
+
+    def _check_budget(self) -> bool:
+        """Track how long the buffer has been over budget.
+
+        Returns:
+            False if the client has exhausted its grace period or hard limit.
+        """
+        if not self._over_budget():
+            self.over_budget_since = None
+            return True
+        now = time.monotonic()
+        if self.over_budget_since is None:
+            self.over_budget_since = now
+        return now - self.over_budget_since <= self.grace and len(self.frames) <= 2 * self.max_frames
+
+    def put(self, payload: str | bytes, coalesce: str | None = None) -> bool:
+        """Queue a serialized frame without waiting on the network.
+
+        Returns:
+            True if the frame was queued, False if the connection is closed or was just evicted.
+        """
+        if self.closed:
+            return False
+
+        if coalesce is not None:
+            for index, (key, stale) in enumerate(self.frames):
+                if key == coalesce:
+                    del self.frames[index]
+                    self.size -= len(stale)
+                    break
+
+        self.frames.append((coalesce, payload))
+        self.size += len(payload)
+        self._ready.set()
+
+        if not self._check_budget():
+            self.evict("stayed over its outbound budget")
+            return False
+        return True
+
+    async def _writer(self):
+        try:
+            while True:
+                await self._ready.wait()
+                while self.frames:
+                    _, payload = self.frames.popleft()
+                    self.size -= len(payload)
+                    await asyncio.wait_for(_send_frame(self.ws, payload), SEND_TIMEOUT)
+                    self._check_budget()
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.evict("failed or timed out on send")
+
+    def evict(self, reason: str):
+        """Stop writing, drop pending frames and close the socket in the background."""
+        if self.closed:
+            return
+        logger.warning("Disconnecting WebSocket client %s: %s.", getattr(self.ws, "client", None), reason)
+        self.shutdown()
+        _close_in_background(self.ws)
+
+    def shutdown(self):
+        """Stop writing and drop pending frames, leaving the socket to its owner."""
+        self.closed = True
+        self.frames.clear()
+        self.size = 0
+        if self._writer_task is not asyncio.current_task():
+            self._writer_task.cancel()
+
+
+# Outboxes for sockets accepted by the WebSocket handler, keyed by the socket itself
+_outboxes: dict[WebSocket, Outbox] = {}
+
+
+def attach_outbox(ws: WebSocket) -> Outbox:
+    """Give a connection its own outbound buffer and writer task.
+
+    Returns:
+        The connection's Outbox.
+    """
+    outbox = _outboxes.get(ws)
+    if outbox is None or outbox.closed:
+        outbox = _outboxes[ws] = Outbox(ws)
+    return outbox
+
+
+def evict(ws: WebSocket, reason: str):
+    """Drop a connection's pending frames and close it in the background."""
+    outbox = _outboxes.pop(ws, None)
+    if outbox is not None:
+        outbox.evict(reason)
+    else:
+        _close_in_background(ws)
+
+
+def negotiate_encoding(ws: WebSocket, requested: str | None) -> str:
+    """Switch a connection to the frame encoding it asked for, if this server supports it.
+
+    Returns:
+        The encoding frames to this connection will use from now on.
+    """
+    outbox = _outboxes.get(ws)
+    if outbox is None or requested is None:
+        return outbox.encoding if outbox else JSON
+    if requested == MSGPACK and msgpack is None:
+        logger.info("Client asked for msgpack frames, but msgpack is not installed; sending JSON.")
+        requested = JSON
+    if requested in {JSON, MSGPACK}:
+        outbox.encoding = requested
+    return outbox.encoding
+
+
+def detach_outbox(ws: WebSocket):
+    """Stop a connection's writer task once the socket is gone."""
+    outbox = _outboxes.pop(ws, None)
+    if outbox is not None:
+        outbox.shutdown()
+
+
+async def _deliver(ws: WebSocket, payload: str | bytes, send_timeout: float) -> bool:
+    """Send a pre-serialized payload to one socket within send_timeout.
+
+    Returns:
+        True if the frame was handed to the socket in time.
+    """
+    try:
+        await asyncio.wait_for(_send_frame(ws, payload), send_timeout)
+    except Exception:
+        return False
+    return True
+
+
+async def send(ws: WebSocket, message: dict, coalesce: str | None = None) -> bool:
+    """Send a message to a single connection, through its outbox when it has one.
+
+    Returns:
+        True if the message was queued or delivered.
+    """
+    outbox = _outboxes.get(ws)
+    if outbox is not None:
+        return outbox.put(encode(message, outbox.encoding), coalesce)
+    return await _deliver(ws, encode(message), SEND_TIMEOUT)
+
+
+def _collect_targets(groups: tuple[dict, ...], exclude: set[str] | None) -> list[tuple[dict, str, WebSocket]]:
+    """List each connection in the groups once, as (group, session_id, ws), leaving out excluded sessions.
+
+    Returns:
+        The connections to send to.
+    """
+    targets = []
+    seen = set()
+    for group in groups:
+        for session_id, ws in list(group.items()):
+            # A multiplexed socket sits in several groups but gets each message once
+            if ws in seen or (exclude and session_id in exclude):
+                continue
+            seen.add(ws)
+            targets.append((group, session_id, ws))
+    return targets
+
+
+def _queue_to_outboxes(message: dict, targets: list, coalesce: str | None, payloads: dict) -> tuple[int, list, list]:
+    """Queue message on every target's outbox, serializing it once per encoding into payloads.
+
+    Returns:
+        (number queued, targets without an outbox, targets whose outbox evicted them).
+    """
+    queued = 0
+    direct = []
+    dropped = []
+    for target in targets:
+        outbox = _outboxes.get(target[2])
+        if outbox is None:
+            direct.append(target)
+            continue
+        if outbox.encoding not in payloads:
+            payloads[outbox.encoding] = encode(message, outbox.encoding)
+        if outbox.put(payloads[outbox.encoding], coalesce):
+            queued += 1
+        else:
+            dropped.append(target)
+    return queued, direct, dropped
+
+
+async def _deliver_direct(payload: str | bytes, targets: list, send_timeout: float) -> tuple[int, list]:
+    """Send payload to sockets without an outbox concurrently, closing the ones that fail.
+
+    Returns:
+        (number delivered, targets that failed or timed out).
+    """
+    results = await asyncio.gather(*(_deliver(ws, payload, send_timeout) for _, _, ws in targets))
+    failed = [target for target, ok in zip(targets, results, strict=True) if not ok]
+    for _, _, ws in failed:
+        _close_in_background(ws)
+    return len(targets) - len(failed), failed
+
+
+async def broadcast(
+    message: dict,
+    *groups: dict,
+    coalesce: str | None = None,
+    exclude: set[str] | None = None,
+    send_timeout: float = SEND_TIMEOUT,
+) -> int:
+    """Serialize message once per frame encoding and hand it to every connection in the given groups.
+
+    Connections accepted by the WebSocket handler have an Outbox, so the message is only
+    queued and this never waits on their network; coalesce names the message kind whose
+    older pending copies it supersedes. Other sockets are sent to directly and concurrently,
+    each bounded by send_timeout. Connections that fail, time out or are evicted are removed from
+    their group and closed, and the client's reconnect logic brings them back with a fresh
+    snapshot. Session ids in exclude are skipped.
+
+    Returns:
+        The number of connections the message was queued for or delivered to.
+    """
+    targets = _collect_targets(groups, exclude)
+    if not targets:
+        return 0
+
+    payloads = {}
+    delivered, direct, dropped = _queue_to_outboxes(message, targets, coalesce, payloads)
+    if direct:
+        sent, failed = await _deliver_direct(payloads.get(JSON) or encode(message), direct, send_timeout)
+        delivered += sent
+        dropped += failed
+
+    for group, session_id, ws in dropped:
+        logger.warning("Dropping WebSocket session %s after a failed or slow send.", session_id)
+        if group.get(session_id) is ws:
+            group.pop(session_id, None)
+
+    return delivered
+
+
+class Coalescer:
+    """Merge requests that arrive within a short window into a single run of emit().
+
+    Because the next window only opens once the previous one has closed, emit() also runs at
+    most once per window however fast requests arrive.
+    """
+
+    def __init__(self, window: float, emit: Callable[[], Awaitable[None]]):
+        """Coalesce requests into emit() calls at most once per window seconds."""
+        self.window = window
+        self.emit = emit
+        self.counters = {"requested": 0, "emitted": 0}
+        self._pending: asyncio.Task | None = None
+
+    def schedule(self) -> asyncio.Task:
+        """Ask for an emit() without waiting for it.
+
+        Returns:
+            The task of the shared run this request joined.
+        """
+        self.counters["requested"] += 1
+        if self._pending is None:
+            self._pending = asyncio.create_task(self._flush())
+            self._pending.add_done_callback(self._log_failure)
+        return self._pending
+
+    async def request(self):
+        """Ask for an emit() and wait until the shared run has finished."""
+        # Shielded so one cancelled caller does not cancel the run the others are waiting on
+        await asyncio.shield(self.schedule())
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Coalesced broadcast failed", exc_info=task.exception())
+
+    async def _flush(self):
+        await asyncio.sleep(self.window)
+        # Requests from here on may follow newer changes than this run sees, so they get a new run
+        self._pending = None
+        self.counters["emitted"] += 1
+        await self.emit()
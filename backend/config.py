@@ -16,6 +16,8 @@ class Settings(BaseSettings):
     tunebox_url: str = ""
     testing: bool = False
     admin_token: str = ""
+    # Where the stats and play history SQLite database lives; defaults to backend/stats.db
+    stats_db_path: str = ""
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,125 @@
+"""Keep a short, sequence-numbered log of broadcast events so reconnecting clients can catch up.
+
+Every event fanned out to a WebSocket group is appended to a capped Redis Stream shared by all
+workers, and its stream ID is sent along as the frame's seq. A client that reconnects with the
+last seq it saw is replayed only the events after it; one whose seq has been trimmed from the
+log gets full snapshots instead. While Redis is unreachable, each worker keeps its own log
+with seqs only it recognizes.
+"""
+
+import json
+import logging
+from collections import deque
+
+from backend.backplane import WORKER_ID
+from backend.services.redis_client import get_redis_queue_client
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOG_KEY = "ws:event_log"
+EVENT_LOG_LENGTH = 500
+
+# Events this worker logged while Redis was unreachable, as (number, groups, coalesce, message)
+_local_log: deque[tuple[int, list[str], str | None, dict]] = deque(maxlen=EVENT_LOG_LENGTH)
+_local_counter = 0
+_LOCAL_PREFIX = f"{WORKER_ID}:"
+
+
+def _stream_id(seq: str) -> tuple[int, int] | None:
+    """Parse a Redis Stream ID into a comparable tuple, or None if seq is not one."""
+    try:
+        millis, _, counter = seq.partition("-")
+        return int(millis), int(counter)
+    except (AttributeError, ValueError):
+        return None
+
+
+def append_event(message: dict, groups: tuple[str, ...], coalesce: str | None = None) -> str:
+    """Log a broadcast event for later replay.
+
+    Returns:
+        The event's seq.
+    """
+    global _local_counter  # noqa: PLW0603
+    fields = {"groups": json.dumps(list(groups)), "coalesce": coalesce or "", "message": json.dumps(message)}
+    try:
+        seq = get_redis_queue_client().xadd(EVENT_LOG_KEY, fields, maxlen=EVENT_LOG_LENGTH, approximate=True)
+        if isinstance(seq, str):
+            return seq
+    except Exception as e:
+        logger.debug("Failed to append to the shared event log: %s", e)
+
+    _local_counter += 1
+    _local_log.append((_local_counter, list(groups), coalesce, message))
+    return f"{_LOCAL_PREFIX}{_local_counter}"
+
+
+def latest_seq() -> str | None:
+    """Return the seq of the newest logged event, for clients to resume from after a snapshot."""
+    try:
+        newest = get_redis_queue_client().xrevrange(EVENT_LOG_KEY, count=1)
+        if isinstance(newest, list):
+            return newest[0][0] if newest else None
+    except Exception as e:
+        logger.debug("Failed to read the shared event log: %s", e)
+    return f"{_LOCAL_PREFIX}{_local_log[-1][0]}" if _local_log else None
+
+
+def events_since(seq: str, *groups: str) -> list[tuple[dict, str | None]] | None:
+    """Find the events for any of groups that were logged after seq.
+
+    Returns:
+        The missed (message, coalesce) pairs in order, each message carrying its seq, or None if
+        seq is no longer in the retained window and the client needs full snapshots.
+    """
+    if isinstance(seq, str) and seq.startswith(_LOCAL_PREFIX):
+        return _local_events_since(seq, groups)
+
+    last_seen = _stream_id(seq)
+    if last_seen is None:
+        return None
+    entries = _stream_entries_after(seq, last_seen)
+    if entries is None:
+        return None
+    return [
+        ({**json.loads(fields["message"]), "seq": entry_id}, fields["coalesce"] or None)
+        for entry_id, fields in entries
+        if not set(groups).isdisjoint(json.loads(fields["groups"]))
+    ]
+
+
+def _stream_entries_after(seq: str, last_seen: tuple[int, int]) -> list | None:
+    """Read the shared log's entries after seq, in one transaction with its retained bounds.
+
+    Returns:
+        The (entry_id, fields) entries, or None if the log is unreadable or seq has been trimmed.
+    """
+    try:
+        pipe = get_redis_queue_client().pipeline(transaction=True)
+        pipe.xrange(EVENT_LOG_KEY, count=1)
+        pipe.xrevrange(EVENT_LOG_KEY, count=1)
+        pipe.xrange(EVENT_LOG_KEY, min=f"({seq}", max="+")
+        oldest, newest, entries = pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to read the shared event log: %s", e)
+        return None
+    if not isinstance(oldest, list) or not oldest or not newest:
+        return None
+    # Only a seq that is itself still retained proves nothing in between was trimmed
+    if not _stream_id(oldest[0][0]) <= last_seen <= _stream_id(newest[0][0]):
+        return None
+    return entries
+
+
+def _local_events_since(seq: str, groups: tuple[str, ...]) -> list[tuple[dict, str | None]] | None:
+    try:
+        last_seen = int(seq.removeprefix(_LOCAL_PREFIX))
+    except ValueError:
+        return None
+    if not _local_log or not _local_log[0][0] <= last_seen <= _local_log[-1][0]:
+        return None
+    return [
+        ({**message, "seq": f"{_LOCAL_PREFIX}{number}"}, coalesce)
+        for number, event_groups, coalesce, message in _local_log
+        if number > last_seen and not set(groups).isdisjoint(event_groups)
+    ]
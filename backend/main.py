@@ -7,10 +7,11 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.backplane import backplane_listener, retire_worker, worker_heartbeat
 from backend.config import settings
-from backend.routers import auth, music, stats
+from backend.routers import auth, events, music, stats
+from backend.websockets import client_registry, connection_sweeper, deliver_event, update_websocket_clients
 from backend.websockets import router as websockets_router
-from backend.websockets import update_websocket_clients
 
 # Logging configuration
 logging.basicConfig(level=logging.DEBUG)
@@ -20,11 +21,28 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application startup and shutdown lifecycle."""
+    from backend.services.enrichment import mood_enrichment_worker  # noqa: PLC0415
+    from backend.services.leadership import leadership_keeper, release_leadership  # noqa: PLC0415
     from backend.services.plex import playback_orchestrator  # noqa: PLC0415
+    from backend.services.prefetch import prefetch_worker  # noqa: PLC0415
+    from backend.services.stats import close_db, stats_writer  # noqa: PLC0415
 
     # Start background tasks
-    ws_task = asyncio.create_task(update_websocket_clients())
-    orch_task = asyncio.create_task(playback_orchestrator())
+    tasks = [
+        asyncio.create_task(leadership_keeper()),
+        asyncio.create_task(update_websocket_clients()),
+        asyncio.create_task(playback_orchestrator()),
+        asyncio.create_task(prefetch_worker()),
+        asyncio.create_task(mood_enrichment_worker()),
+        asyncio.create_task(backplane_listener(deliver_event)),
+        asyncio.create_task(worker_heartbeat()),
+        asyncio.create_task(connection_sweeper()),
+        asyncio.create_task(stats_writer()),
+    ]
+
+    # Reconcile the queue mood histogram with the persisted queue
+    from backend.services.redis import rebuild_vibes  # noqa: PLC0415
+    await asyncio.to_thread(rebuild_vibes)
 
     # Pre-warm caches asynchronously in a background thread
     from backend.services.plex import pre_warm_all_caches  # noqa: PLC0415
@@ -34,12 +52,19 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         # Cleanup tasks on shutdown
-        ws_task.cancel()
-        orch_task.cancel()
-        for task in [ws_task, orch_task]:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             with contextlib.suppress(asyncio.CancelledError):
                 await task
 
+        await asyncio.to_thread(release_leadership)
+        await asyncio.to_thread(retire_worker, list(client_registry))
+        await asyncio.to_thread(close_db)
+
+        from backend.services.artwork import close_art_client  # noqa: PLC0415
+        await close_art_client()
+
 
 # Initialize the FastAPI backend
 app = FastAPI(
@@ -62,6 +87,7 @@ app.add_middleware(
 )
 
 app.include_router(auth.router)
+app.include_router(events.router)
 app.include_router(music.router)
 app.include_router(stats.router)
 app.include_router(websockets_router)
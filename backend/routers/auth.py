@@ -444,7 +444,7 @@ async def get_clients(x_admin_token: str | None = Header(None)):
     if not settings.admin_token or x_admin_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
 
-    return [{"client_id": cid, **info} for cid, info in ws.client_registry.items()]
+    return [{"client_id": cid, **info} for cid, info in ws.get_connected_clients().items()]
 
 
 @router.post("/clients/{client_id}/set-display")
@@ -453,10 +453,9 @@ async def set_client_display(client_id: str, x_admin_token: str | None = Header(
     if not settings.admin_token or x_admin_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
 
-    if client_id not in ws.client_registry:
+    if ws.update_client(client_id, is_display=True) is None:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    ws.client_registry[client_id]["is_display"] = True
     await ws.send_to_client_id(client_id, {"type": "set_display_mode"})
     return {"message": f"Client {client_id} set as shared display"}
 
@@ -467,10 +466,9 @@ async def unset_client_display(client_id: str, x_admin_token: str | None = Heade
     if not settings.admin_token or x_admin_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
 
-    if client_id not in ws.client_registry:
+    if ws.update_client(client_id, is_display=False) is None:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    ws.client_registry[client_id]["is_display"] = False
     await ws.send_to_client_id(client_id, {"type": "unset_display_mode"})
     return {"message": f"Client {client_id} display mode removed"}
 
@@ -485,10 +483,9 @@ async def rename_client(client_id: str, req: RenameClientRequest, x_admin_token:
     if not settings.admin_token or x_admin_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
 
-    if client_id not in ws.client_registry:
+    if ws.update_client(client_id, name=req.name) is None:
         raise HTTPException(status_code=404, detail="Client not found")
 
-    ws.client_registry[client_id]["name"] = req.name
     await ws.send_to_client_id(client_id, {"type": "rename_client", "name": req.name})
     return {"message": f"Client {client_id} renamed to {req.name}"}
 
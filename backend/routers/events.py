@@ -0,0 +1,152 @@
+"""Serve now-playing and queue updates as a read-only Server-Sent Events stream."""
+
+import asyncio
+import logging
+import zlib
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+
+from backend.broadcast import SSE, attach_outbox, detach_outbox, encode
+from backend.event_log import events_since, latest_seq
+from backend.services.plex import check_plexamp_resync, get_redis_queue
+from backend.websockets import active_connections, event_sessions, now_playing_message, queue_message
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+logger = logging.getLogger(__name__)
+
+SSE_CHANNELS = ("music_control", "queue_update")
+SSE_KEEPALIVE = 15.0
+SSE_KEEPALIVE_FRAME = ": keepalive\n\n"
+SSE_RETRY_MS = 3000
+
+
+class EventStreamConnection:
+    """Stand-in for a WebSocket that hands broadcast frames to an SSE response.
+
+    It joins the same groups as WebSocket clients, with its own Outbox, so a display on a slow
+    link skips stale frames and is dropped after the same budget. Its Outbox encodes frames as
+    SSE events, so broadcasts arrive ready to write. send_text() only returns once the response
+    has taken the previous frame, which keeps the backlog in the Outbox.
+    """
+
+    def __init__(self, client=None):
+        """Create an open connection for the client address the stream is served to."""
+        self.client = client
+        self.closed = False
+        self._frames: asyncio.Queue[str | None] = asyncio.Queue(maxsize=1)
+
+    async def send_text(self, payload: str):
+        """Hand an encoded SSE event to the response, waiting until it has taken the previous one.
+
+        Raises:
+            RuntimeError: If the connection is closed.
+        """
+        if self.closed:
+            msg = "Event stream is closed"
+            raise RuntimeError(msg)
+        await self._frames.put(payload)
+
+    async def close(self):
+        """Drop any frame not yet taken and end the response."""
+        self.closed = True
+        while not self._frames.empty():
+            self._frames.get_nowait()
+        self._frames.put_nowait(None)
+
+    async def next_frame(self, keepalive_after: float) -> str | None:
+        """Wait for the next broadcast frame.
+
+        Returns:
+            The SSE event, a keepalive comment if nothing was broadcast within keepalive_after
+            seconds, or None once the connection is closed.
+        """
+        try:
+            return await asyncio.wait_for(self._frames.get(), keepalive_after)
+        except TimeoutError:
+            # Comment lines keep proxies from timing out the idle connection
+            return SSE_KEEPALIVE_FRAME
+
+
+async def _initial_events(channels: list[str], last_event_id: str | None) -> list[str]:
+    """Replay what a resuming client missed, or snapshot every channel for a new one."""
+    if last_event_id:
+        missed = events_since(last_event_id, *channels)
+        if missed is not None:
+            return [encode(message, SSE) for message, _ in missed]
+
+    # Read before any state, so resuming from it only replays events the snapshot covers
+    seq = latest_seq()
+    frames = []
+    if "music_control" in channels:
+        await check_plexamp_resync(force_align=True)
+        frames.append(now_playing_message())
+    if "queue_update" in channels:
+        frames.append(queue_message(get_redis_queue()))
+    if frames and seq:
+        frames[-1]["seq"] = seq
+    return [encode(frame, SSE) for frame in frames]
+
+
+async def event_stream(
+    channels: list[str],
+    last_event_id: str | None = None,
+    compress: bool = False,
+    client=None,
+) -> AsyncIterator[bytes]:
+    """Yield SSE bytes for a display: catch-up or snapshots first, then live broadcasts.
+
+    With compress, the stream is one gzip member that is sync-flushed after every event, so
+    each event can be decoded as soon as it arrives instead of waiting for a full block.
+    """
+    connection = EventStreamConnection(client)
+    session_id = f"sse-{id(connection)}"
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+
+    def to_bytes(text: str) -> bytes:
+        if compressor is None:
+            return text.encode()
+        return compressor.compress(text.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    attach_outbox(connection).encoding = SSE
+    # Displays interpolate progress themselves, so they only need state-change frames
+    event_sessions.add(session_id)
+    for channel in channels:
+        active_connections[channel][session_id] = connection
+    try:
+        initial = await _initial_events(channels, last_event_id)
+        yield to_bytes(f"retry: {SSE_RETRY_MS}\n\n" + "".join(initial))
+        while (frame := await connection.next_frame(SSE_KEEPALIVE)) is not None:
+            yield to_bytes(frame)
+    finally:
+        for channel in channels:
+            if active_connections[channel].get(session_id) is connection:
+                active_connections[channel].pop(session_id)
+        event_sessions.discard(session_id)
+        detach_outbox(connection)
+
+
+@router.get("")
+async def stream_events(
+    request: Request,
+    channels: str = ",".join(SSE_CHANNELS),
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """Stream now-playing and queue frames to read-only displays as Server-Sent Events.
+
+    channels is a comma-separated subset of music_control and queue_update. The browser sends
+    Last-Event-ID on reconnect; the last_event_id query parameter serves first connections.
+    """
+    requested = [channel for channel in SSE_CHANNELS if channel in channels.split(",")]
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        event_stream(requested, last_event_id_header or last_event_id, compress, request.client),
+        media_type="text/event-stream",
+        headers=headers,
+    )
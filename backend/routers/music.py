@@ -13,7 +13,6 @@ from backend.services.plex import (
     fetch_accessible_plex_servers,
     fetch_albums_for_artist,
     fetch_all_artists,
-    fetch_art,
     fetch_tracks_for_album,
     get_active_player,
     get_all_players,
@@ -28,6 +27,7 @@ from backend.services.plex import (
     fetch_playlists,
     seed_queue_from_playlist,
 )
+from backend.services.artwork import fetch_art_stream
 from backend.services.redis import (
     add_to_queue_redis,
     clear_cache,
@@ -39,7 +39,7 @@ from backend.services.redis import (
     is_autoplay_enabled,
     set_autoplay_enabled,
 )
-from backend.websockets import send_current_playing, send_queue
+from backend.websockets import broadcast_stats, send_current_playing, send_queue
 
 router = APIRouter(prefix="/api/music", tags=["Music"])
 logger = logging.getLogger(__name__)
@@ -137,7 +137,8 @@ async def add_to_queue(
 
         if username:
             from backend.services.stats import increment_adds
-            increment_adds(username)
+            increment_adds(username, song.ratingKey)
+            broadcast_stats()
 
         background_tasks.add_task(send_queue)
 
@@ -286,7 +287,7 @@ async def skip_track(
     from backend.websockets import reset_skip_votes  # noqa: PLC0415
     await reset_skip_votes()
 
-    result = skip_current_track()
+    result = await asyncio.to_thread(skip_current_track)
     background_tasks.add_task(send_queue)
     background_tasks.add_task(send_current_playing)
     return result
@@ -473,14 +474,13 @@ async def clear_redis_cache(key: str):
         return result
 
 
-@router.get("/artist-image/{artist_id}")
-def get_artist_image(artist_id: int, request: Request, server_id: str | None = None):
-    """Fetch and proxy the artist image from Plex.
+async def _proxy_art(item_id: int, item_type: str, request: Request, server_id: str | None, label: str):
+    """Stream artwork for an item through the shared async art client, honoring ETags.
 
     Returns:
-        Artist image from Plex in streaming response format.
+        A 304 when the browser copy is current, otherwise the streamed image.
     """
-    etag = f'"artist-{artist_id}-{server_id or "primary"}"'
+    etag = f'"{item_type}-{item_id}-{server_id or "primary"}"'
     headers = {
         "Cache-Control": "public, max-age=86400, stale-while-revalidate=604800",
         "ETag": etag,
@@ -489,75 +489,45 @@ def get_artist_image(artist_id: int, request: Request, server_id: str | None = N
         return Response(status_code=304, headers=headers)
 
     try:
-        response = fetch_art(artist_id, "artist", server_id=server_id)
+        body = await fetch_art_stream(item_id, item_type, server_id=server_id)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error fetching artist image: {e}"
+            status_code=500, detail=f"Error fetching {label}: {e}"
         ) from e
     else:
-        return StreamingResponse(
-            response.iter_content(chunk_size=1024), media_type="image/jpeg", headers=headers
-        )
+        return StreamingResponse(body, media_type="image/jpeg", headers=headers)
+
+
+@router.get("/artist-image/{artist_id}")
+async def get_artist_image(artist_id: int, request: Request, server_id: str | None = None):
+    """Fetch and proxy the artist image from Plex.
+
+    Returns:
+        Artist image from Plex in streaming response format.
+    """
+    return await _proxy_art(artist_id, "artist", request, server_id, "artist image")
 
 
 @router.get("/album-art/{album_id}")
-def get_album_art(album_id: int, request: Request, server_id: str | None = None):
+async def get_album_art(album_id: int, request: Request, server_id: str | None = None):
     """Fetch and proxy the album art from Plex.
 
     Returns:
         Album art from Plex in streaming response format.
     """
-    etag = f'"album-{album_id}-{server_id or "primary"}"'
-    headers = {
-        "Cache-Control": "public, max-age=86400, stale-while-revalidate=604800",
-        "ETag": etag,
-    }
-    if request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers=headers)
-
-    try:
-        response = fetch_art(album_id, "album", server_id=server_id)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error fetching album art: {e}"
-        ) from e
-    else:
-        return StreamingResponse(
-            response.iter_content(chunk_size=1024), media_type="image/jpeg", headers=headers
-        )
+    return await _proxy_art(album_id, "album", request, server_id, "album art")
 
 
 @router.get("/track-art/{track_id}")
-def get_track_art(track_id: int, request: Request, server_id: str | None = None):
+async def get_track_art(track_id: int, request: Request, server_id: str | None = None):
     """Fetch and proxy the track art from Plex.
 
     Returns:
         Track art from Plex in streaming response format.
     """
-    etag = f'"track-{track_id}-{server_id or "primary"}"'
-    headers = {
-        "Cache-Control": "public, max-age=86400, stale-while-revalidate=604800",
-        "ETag": etag,
-    }
-    if request.headers.get("if-none-match") == etag:
-        return Response(status_code=304, headers=headers)
-
-    try:
-        response = fetch_art(track_id, "track", server_id=server_id)
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error fetching track art: {e}"
-        ) from e
-    else:
-        return StreamingResponse(
-            response.iter_content(chunk_size=1024), media_type="image/jpeg", headers=headers
-        )
+    return await _proxy_art(track_id, "track", request, server_id, "track art")
 
 
 @router.get("/playlists")
@@ -1,21 +1,105 @@
-from fastapi import APIRouter, Header, HTTPException
-from backend.services import stats
+"""Statistics endpoints: leaderboards, play history rankings and exports."""
+
+import asyncio
+import time
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
 from backend.config import settings
+from backend.services import export, history, stats
+from backend.websockets import broadcast_counters, broadcast_stats
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
+
 @router.get("")
 def get_leaderboards():
-    """Retrieve session and all-time statistics leaderboards."""
-    return {
-        "session": stats.get_session_stats(),
-        "all_time": stats.get_alltime_stats()
-    }
+    """Retrieve the top session and all-time statistics leaderboards."""
+    return stats.get_leaderboards()
+
+
+@router.get("/leaderboard")
+def get_leaderboard(
+    event_type: str = Query("adds", alias="type"),
+    window: str = "all",
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Retrieve one page of a leaderboard for a time window: hour, day, session or all."""
+    try:
+        page = stats.get_leaderboard(event_type, window, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {"type": event_type, "window": window, "limit": limit, "offset": offset, **page}
+
+
+def _since(window: str) -> float | None:
+    """Turn an hour, day or all window into the Unix time its plays start from."""
+    if window not in stats.STATS_WINDOWS or window == "session":
+        raise HTTPException(status_code=400, detail=f"Unknown play history window: {window}")
+    seconds = stats.STATS_WINDOWS[window]
+    return None if seconds is None else time.time() - seconds
+
+
+@router.get("/tracks")
+def get_top_tracks(order: str = "plays", window: str = "all", limit: int = Query(10, ge=1, le=100)):
+    """Retrieve the most played or most skipped tracks from the play history."""
+    try:
+        tracks = history.top_tracks(order, limit, _since(window))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {"order": order, "window": window, "tracks": tracks}
+
+
+@router.get("/artists")
+def get_top_artists(window: str = "all", limit: int = Query(10, ge=1, le=100)):
+    """Retrieve the most played artists from the play history."""
+    return {"window": window, "artists": history.top_artists(limit, _since(window))}
+
+
+@router.get("/broadcasts")
+def get_broadcast_counters():
+    """Report how many WebSocket broadcasts were requested versus emitted by this worker."""
+    return broadcast_counters
+
+
+@router.get("/export/{dataset}")
+def export_dataset(
+    dataset: str,
+    export_format: str = Query("ndjson", alias="format"),
+    since: float | None = None,
+    until: float | None = None,
+    x_admin_token: str | None = Header(None),
+):
+    """Stream the play history ("plays") or stat events ("events") as NDJSON or CSV (Admin only).
+
+    since and until are Unix times bounding the rows' start or event time.
+    """
+    if not settings.admin_token or x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
+    if dataset not in export.EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Unknown export: {dataset}")
+    if export_format not in export.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown export format: {export_format}")
+
+    if export_format == "csv":
+        chunks, media_type = export.export_csv(dataset, since, until), "text/csv"
+    else:
+        chunks, media_type = export.export_ndjson(dataset, since, until), "application/x-ndjson"
+    filename = f"tunebox-{dataset}.{export_format}"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 
 @router.post("/reset")
-def reset_session_stats(x_admin_token: str | None = Header(None)):
+async def reset_session_stats(x_admin_token: str | None = Header(None)):
     """Reset the current party/session statistics (Admin only)."""
     if not settings.admin_token or x_admin_token != settings.admin_token:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid admin token")
-    stats.clear_session_stats()
+    await asyncio.to_thread(stats.clear_session_stats)
+    broadcast_stats()
     return {"message": "Session stats successfully reset."}
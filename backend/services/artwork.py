@@ -0,0 +1,186 @@
+"""Proxy Plex artwork through a shared, connection-limited async HTTP client."""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import HTTPException
+
+from backend.config import settings
+from backend.services.plex import resolve_art_url
+
+logger = logging.getLogger(__name__)
+
+ART_CHUNK_SIZE = 64 * 1024
+ART_REQUEST_TIMEOUT = 12.0
+MAX_CONNECTIONS_PER_HOST = 6
+ART_QUEUE_TIMEOUT = 5.0
+ART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+ART_CACHE_MAX_ITEM_BYTES = 2 * 1024 * 1024
+
+MOCK_ART_PNG = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06"
+    b"\x00\x00\x00\x1f\x15c4\x00\x00\x00\rIDATx\x9cc`\x00\x01\x00\x00\x05\x00\x01"
+    b"\xa5\xf9\xd0\xb1\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+# One semaphore per Plex host bounds how many artwork transfers run against it at once
+_host_slots: dict[str, asyncio.Semaphore] = {}
+
+# Prefetched image bytes, least recently used first, keyed by (item_type, item_id, server_id)
+_art_cache: OrderedDict[tuple, bytes] = OrderedDict()
+_art_cache_size = 0
+
+
+def get_art_client():
+    """Lazy initialization of the shared artwork HTTP client.
+
+    Returns:
+        An httpx.AsyncClient reused by every artwork request.
+    """
+    if not hasattr(get_art_client, "client") or get_art_client.client.is_closed:
+        # ruff: noqa: S501
+        get_art_client.client = httpx.AsyncClient(
+            verify=False,
+            timeout=httpx.Timeout(ART_REQUEST_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=32),
+        )
+    return get_art_client.client
+
+
+async def close_art_client():
+    """Close the shared artwork HTTP client and forget per-host slots."""
+    client = getattr(get_art_client, "client", None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+    _host_slots.clear()
+
+
+def _host_slot(url: str) -> asyncio.Semaphore:
+    """Return the connection slot semaphore for the host serving url."""
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST)
+    return slot
+
+
+# Async so cached art keeps fetch_art_stream's async iterator contract, like a relayed stream
+async def _single_chunk_stream(data: bytes):  # noqa: RUF029
+    yield data
+
+
+def _art_cache_key(item_id, item_type: str, server_id: str | None) -> tuple:
+    return (item_type, str(item_id), server_id or None)
+
+
+def get_cached_art(item_id, item_type: str, server_id: str | None = None) -> bytes | None:
+    """Return prefetched image bytes for an item, if any.
+
+    Returns:
+        The cached image bytes or None.
+    """
+    key = _art_cache_key(item_id, item_type, server_id)
+    data = _art_cache.get(key)
+    if data is not None:
+        _art_cache.move_to_end(key)
+    return data
+
+
+def _store_art(key: tuple, data: bytes):
+    """Keep image bytes in the LRU cache, evicting the oldest entries past the size budget."""
+    global _art_cache_size
+    if len(data) > ART_CACHE_MAX_ITEM_BYTES:
+        return
+    previous = _art_cache.pop(key, None)
+    if previous is not None:
+        _art_cache_size -= len(previous)
+    _art_cache[key] = data
+    _art_cache_size += len(data)
+    while _art_cache_size > ART_CACHE_MAX_BYTES and _art_cache:
+        _, evicted = _art_cache.popitem(last=False)
+        _art_cache_size -= len(evicted)
+
+
+async def _prepend(first_chunk: bytes, chunks):
+    if first_chunk:
+        yield first_chunk
+    async for chunk in chunks:
+        yield chunk
+
+
+async def open_art_stream(image_url: str):
+    """Open a streaming GET for image_url while holding one of its host's connection slots.
+
+    Waiting for a slot happens on the event loop, so an artwork burst queues here instead of
+    occupying worker threads that queue and search routes need. Requests that cannot get a slot
+    within ART_QUEUE_TIMEOUT are shed with a 503 so the browser retries later.
+
+    Returns:
+        An async iterator over the image body. The slot is released once it is exhausted or closed.
+    """
+    slot = _host_slot(image_url)
+    try:
+        await asyncio.wait_for(slot.acquire(), ART_QUEUE_TIMEOUT)
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Artwork server is busy, try again shortly.",
+            headers={"Retry-After": "1"},
+        ) from e
+
+    try:
+        client = get_art_client()
+        response = await client.send(client.build_request("GET", image_url), stream=True)
+    except Exception as e:
+        slot.release()
+        raise HTTPException(status_code=404, detail=f"Image not accessible: {e}") from e
+
+    if not response.is_success:
+        await response.aclose()
+        slot.release()
+        raise HTTPException(status_code=404, detail="Image not found on Plex.")
+
+    async def relay():
+        try:
+            async for chunk in response.aiter_bytes(ART_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await response.aclose()
+            slot.release()
+
+    # Prime the relay so the event loop's async generator finalizer releases the slot
+    # even if the client disconnects before the response body is ever iterated.
+    chunks = relay()
+    first_chunk = await anext(chunks, b"")
+    return _prepend(first_chunk, chunks)
+
+
+async def fetch_art_stream(item_id: int, item_type: str, server_id: str | None = None):
+    """Fetch an artist, album, or track image from Plex as an async byte stream.
+
+    Returns:
+        An async iterator over the image bytes.
+    """
+    if settings.testing:
+        return _single_chunk_stream(MOCK_ART_PNG)
+
+    cached = get_cached_art(item_id, item_type, server_id)
+    if cached is not None:
+        return _single_chunk_stream(cached)
+
+    image_url = await asyncio.to_thread(resolve_art_url, item_id, item_type, server_id)
+    return await open_art_stream(image_url)
+
+
+async def warm_art(item_id: int, item_type: str, server_id: str | None = None):
+    """Download an item's image into the in-memory art cache ahead of the first request."""
+    if settings.testing or get_cached_art(item_id, item_type, server_id) is not None:
+        return
+
+    image_url = await asyncio.to_thread(resolve_art_url, item_id, item_type, server_id)
+    stream = await open_art_stream(image_url)
+    data = b"".join([chunk async for chunk in stream])
+    _store_art(_art_cache_key(item_id, item_type, server_id), data)
@@ -0,0 +1,120 @@
+"""Fill in queue entry moods in the background, off the add-to-queue request path."""
+
+import asyncio
+import logging
+import queue
+
+from backend.services.plex import load_queue_track
+from backend.services.redis import cache_data, get_cached_data, update_queue_entry
+
+logger = logging.getLogger(__name__)
+
+MOOD_CACHE_TTL = 86400
+
+# Thread-safe, since autoplay and playlist seeding add tracks from worker threads
+_pending: queue.SimpleQueue = queue.SimpleQueue()
+_wakeup = asyncio.Event()
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+
+def enqueue_mood_enrichment(entry: dict):
+    """Schedule a freshly queued entry for album/artist mood lookup and wake the worker.
+
+    Safe to call from any thread; the wakeup is handed to the worker's event loop.
+    """
+    _pending.put({
+        "item_id": entry["item_id"],
+        "server_id": entry.get("server_id"),
+        "server_name": entry.get("server_name"),
+    })
+    if _worker_loop is not None:
+        _worker_loop.call_soon_threadsafe(_wakeup.set)
+
+
+def _tags(items) -> list[str]:
+    return [m.tag if hasattr(m, "tag") else str(m) for m in items or []]
+
+
+def _cached_parent_moods(track, parent: str, server_id: str | None) -> list[str]:
+    """Look up album or artist moods for a track, cached per parent item.
+
+    Returns:
+        The parent's mood tags, possibly empty.
+    """
+    rating_key = getattr(track, "parentRatingKey" if parent == "album" else "grandparentRatingKey", None)
+    cache_key = f"moods:{server_id or 'primary'}:{parent}:{rating_key}" if rating_key else None
+
+    if cache_key:
+        cached = get_cached_data(cache_key)
+        if cached is not None:
+            return cached
+
+    moods = []
+    try:
+        if hasattr(track, parent):
+            parent_item = getattr(track, parent)()
+            if parent_item:
+                moods = _tags(getattr(parent_item, "moods", []))
+    except Exception as e:
+        logger.debug("Failed to load %s moods for %s: %s", parent, getattr(track, "title", track), e)
+        return moods
+
+    if cache_key:
+        cache_data(cache_key, moods, ttl=MOOD_CACHE_TTL)
+    return moods
+
+
+def resolve_moods(job: dict) -> list[str]:
+    """Cascade from track to album to artist moods for a queued entry.
+
+    Returns:
+        The first non-empty list of mood tags found, or an empty list.
+    """
+    track = load_queue_track(job)
+    moods = _tags(getattr(track, "moods", []))
+    if not moods:
+        moods = _cached_parent_moods(track, "album", job.get("server_id"))
+    if not moods:
+        moods = _cached_parent_moods(track, "artist", job.get("server_id"))
+    return moods
+
+
+async def _enrich_pending() -> bool:
+    """Resolve moods for every pending entry.
+
+    Returns:
+        Whether any queue entry was updated.
+    """
+    updated = False
+    while True:
+        try:
+            job = _pending.get_nowait()
+        except queue.Empty:
+            return updated
+        try:
+            moods = await asyncio.to_thread(resolve_moods, job)
+            if moods and update_queue_entry(job["item_id"], job.get("server_id"), moods=moods):
+                updated = True
+        except Exception as e:
+            logger.debug("Mood enrichment failed for queue item %s: %s", job.get("item_id"), e)
+
+
+async def mood_enrichment_worker():
+    """Background task that enriches pending queue entries and rebroadcasts the queue once per batch.
+
+    Sleeps until enqueue_mood_enrichment wakes it rather than polling.
+    """
+    global _wakeup, _worker_loop
+    _wakeup = asyncio.Event()
+    _worker_loop = asyncio.get_running_loop()
+    logger.info("Mood enrichment worker started.")
+    try:
+        while True:
+            # Clear before draining so an entry queued mid-batch still wakes the next pass
+            _wakeup.clear()
+            if await _enrich_pending():
+                from backend.websockets import send_queue  # noqa: PLC0415
+                await send_queue()
+            await _wakeup.wait()
+    finally:
+        _worker_loop = None
@@ -0,0 +1,250 @@
+"""Keep a long-term log of every play in the local stats database.
+
+Each track that starts playing gets a play_history row: what it was, which server it came from,
+who queued it, when it started and how it ended. track_totals keeps per-track play, completion
+and skip counts in step with the log, so all-time rankings are index reads; windowed rankings
+aggregate the started_at index range instead. It also keeps each track's duration and thumb, so
+autoplay can queue a previously played track without fetching it from Plex.
+"""
+
+import logging
+import time
+
+from backend.services.stats import database, read_only_database
+
+logger = logging.getLogger(__name__)
+
+TOP_TRACK_ORDERS = ("plays", "skips")
+
+
+def init_history_db():
+    """Initialize the play history schema in the stats database."""
+    try:
+        with database() as conn, conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS play_history (
+                    id INTEGER PRIMARY KEY,
+                    track_key TEXT NOT NULL,
+                    server_id TEXT NOT NULL DEFAULT '',
+                    title TEXT,
+                    artist TEXT,
+                    album TEXT,
+                    added_by TEXT,
+                    started_at REAL NOT NULL,
+                    ended_at REAL,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    skipped INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS play_history_by_time
+                    ON play_history (started_at, server_id, track_key, skipped);
+                CREATE INDEX IF NOT EXISTS play_history_by_artist
+                    ON play_history (artist, started_at);
+                CREATE TABLE IF NOT EXISTS track_totals (
+                    server_id TEXT NOT NULL DEFAULT '',
+                    track_key TEXT NOT NULL,
+                    title TEXT,
+                    artist TEXT,
+                    duration INTEGER,
+                    thumb TEXT,
+                    plays INTEGER NOT NULL DEFAULT 0,
+                    completions INTEGER NOT NULL DEFAULT 0,
+                    skips INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (server_id, track_key)
+                );
+                CREATE INDEX IF NOT EXISTS track_totals_by_plays ON track_totals (plays DESC);
+                CREATE INDEX IF NOT EXISTS track_totals_by_skips ON track_totals (skips DESC);
+                CREATE INDEX IF NOT EXISTS track_totals_by_artist ON track_totals (artist, plays);
+                """
+            )
+            # Databases from before autoplay queued tracks from track_totals lack these columns
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(track_totals)")}
+            for column, column_type in (("duration", "INTEGER"), ("thumb", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE track_totals ADD COLUMN {column} {column_type}")
+    except Exception:
+        logger.exception("Failed to initialize play history.")
+
+
+def _end_open_play(conn, ended_at: float, completed: bool, skipped: bool) -> bool:
+    """Close the newest play if it is still open, and count its outcome in track_totals.
+
+    Returns:
+        True if a play was closed.
+    """
+    row = conn.execute(
+        "UPDATE play_history SET ended_at = ?, completed = ?, skipped = ? "
+        "WHERE id = (SELECT MAX(id) FROM play_history) AND ended_at IS NULL "
+        "RETURNING server_id, track_key",
+        (ended_at, int(completed), int(skipped)),
+    ).fetchone()
+    if row is None:
+        return False
+    if completed or skipped:
+        conn.execute(
+            "UPDATE track_totals SET completions = completions + ?, skips = skips + ? "
+            "WHERE server_id = ? AND track_key = ?",
+            (int(completed), int(skipped), *row),
+        )
+    return True
+
+
+def record_play_start(song):
+    """Log that a track started playing, ending the previous play if nothing else did.
+
+    Where the track came from and who queued it are read from the server_id and added_by
+    attributes that load_queue_track sets.
+    """
+    now = time.time()
+    server_id = getattr(song, "server_id", None) or ""
+    track_key = str(song.ratingKey)
+    artist = getattr(song, "grandparentTitle", None)
+    try:
+        with database() as conn, conn:
+            _end_open_play(conn, now, completed=False, skipped=False)
+            conn.execute(
+                "INSERT INTO play_history (track_key, server_id, title, artist, album, added_by, started_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    track_key,
+                    server_id,
+                    song.title,
+                    artist,
+                    getattr(song, "parentTitle", None),
+                    getattr(song, "added_by", None),
+                    now,
+                ),
+            )
+            conn.execute(
+                "INSERT INTO track_totals (server_id, track_key, title, artist, duration, thumb, plays) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1) "
+                "ON CONFLICT(server_id, track_key) DO UPDATE SET plays = plays + 1, "
+                "title = excluded.title, artist = excluded.artist, "
+                "duration = excluded.duration, thumb = excluded.thumb",
+                (
+                    server_id,
+                    track_key,
+                    song.title,
+                    artist,
+                    getattr(song, "duration", None),
+                    getattr(song, "thumb", None),
+                ),
+            )
+    except Exception as e:
+        logger.warning("Failed to record play of %s: %s", track_key, e)
+
+
+def record_play_end(completed: bool = False, skipped: bool = False):
+    """Log how the current play ended: played through, skipped, or neither."""
+    try:
+        with database() as conn, conn:
+            _end_open_play(conn, time.time(), completed, skipped)
+    except Exception as e:
+        logger.warning("Failed to record the end of the current play: %s", e)
+
+
+def top_tracks(order: str = "plays", limit: int = 10, since: float | None = None) -> list[dict]:
+    """Rank tracks by plays or skips, all-time or for plays started since a Unix time.
+
+    Returns:
+        Up to limit {"track_key", "server_id", "title", "artist", "plays", "skips"} dicts, the
+        most played or skipped first. Skip rankings leave out tracks that were never skipped.
+
+    Raises:
+        ValueError: If order is not plays or skips.
+    """
+    if order not in TOP_TRACK_ORDERS:
+        msg = f"Unknown track order: {order}"
+        raise ValueError(msg)
+    if since is None:
+        where = "WHERE skips > 0 " if order == "skips" else ""
+        query = (
+            "SELECT track_key, server_id, title, artist, plays, skips FROM track_totals "  # noqa: S608
+            f"{where}ORDER BY {order} DESC LIMIT ?"
+        )
+        params = (limit,)
+    else:
+        having = "HAVING skips > 0 " if order == "skips" else ""
+        query = (
+            "SELECT track_key, server_id, MAX(title), MAX(artist), COUNT(*) AS plays, "  # noqa: S608
+            "SUM(skipped) AS skips FROM play_history WHERE started_at >= ? GROUP BY server_id, track_key "
+            f"{having}ORDER BY {order} DESC, MAX(started_at) DESC LIMIT ?"
+        )
+        params = (since, limit)
+
+    try:
+        with read_only_database() as conn:
+            rows = conn.execute(query, params).fetchall()
+    except Exception as e:
+        logger.warning("Failed to rank tracks by %s: %s", order, e)
+        return []
+    keys = ("track_key", "server_id", "title", "artist", "plays", "skips")
+    return [{**dict(zip(keys, row, strict=True)), "server_id": row[1] or None} for row in rows]
+
+
+def track_details(keys: list[tuple[str, str]]) -> dict[tuple[str, str], dict]:
+    """Read what the play history stored about tracks, enough to queue them without asking Plex.
+
+    Returns:
+        A {"title", "artist", "duration", "thumb"} dict per (server_id, track_key) pair, for the
+        tracks that were played with a known duration.
+    """
+    if not keys:
+        return {}
+    rows_sql = ", ".join(["(?, ?)"] * len(keys))
+    query = (
+        "SELECT server_id, track_key, title, artist, duration, thumb FROM track_totals "  # noqa: S608
+        f"WHERE (server_id, track_key) IN (VALUES {rows_sql}) AND duration IS NOT NULL"
+    )
+    try:
+        with read_only_database() as conn:
+            rows = conn.execute(query, [part for key in keys for part in key]).fetchall()
+    except Exception as e:
+        logger.warning("Failed to read stored track details: %s", e)
+        return {}
+    return {
+        (server_id, track_key): {"title": title, "artist": artist, "duration": duration, "thumb": thumb}
+        for server_id, track_key, title, artist, duration, thumb in rows
+    }
+
+
+def most_played(limit: int = 10, since: float | None = None) -> list[dict]:
+    """Rank tracks by how often they were played."""
+    return top_tracks("plays", limit, since)
+
+
+def most_skipped(limit: int = 10, since: float | None = None) -> list[dict]:
+    """Rank tracks by how often they were skipped."""
+    return top_tracks("skips", limit, since)
+
+
+def top_artists(limit: int = 10, since: float | None = None) -> list[dict]:
+    """Rank artists by plays, all-time or for plays started since a Unix time.
+
+    Returns:
+        Up to limit {"artist", "plays", "skips"} dicts, the most played first.
+    """
+    if since is None:
+        query = (
+            "SELECT artist, SUM(plays) AS plays, SUM(skips) FROM track_totals WHERE artist IS NOT NULL "
+            "GROUP BY artist ORDER BY plays DESC, artist LIMIT ?"
+        )
+        params = (limit,)
+    else:
+        query = (
+            "SELECT artist, COUNT(*) AS plays, SUM(skipped) FROM play_history "
+            "WHERE started_at >= ? AND artist IS NOT NULL GROUP BY artist ORDER BY plays DESC, artist LIMIT ?"
+        )
+        params = (since, limit)
+
+    try:
+        with read_only_database() as conn:
+            rows = conn.execute(query, params).fetchall()
+    except Exception as e:
+        logger.warning("Failed to rank artists: %s", e)
+        return []
+    return [{"artist": artist, "plays": plays, "skips": skips} for artist, plays, skips in rows]
+
+
+# Initialize the schema on module import, like the stats tables
+init_history_db()
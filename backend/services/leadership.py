@@ -0,0 +1,89 @@
+"""Elect one worker to drive playback, using a Redis lock with a renewed lease."""
+
+import asyncio
+import logging
+import time
+
+from backend.backplane import WORKER_ID
+from backend.services.redis_client import get_redis_queue_client
+
+logger = logging.getLogger(__name__)
+
+LEADER_KEY = "orchestrator:leader"
+LEADER_LEASE_TTL = 10.0
+LEADER_RENEW_INTERVAL = 3.0
+
+# Extend the lease only while this worker still owns the lock
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Release the lock only if this worker still owns it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Monotonic deadline of the lease this worker holds; zero when it is not the leader
+_lease_expires_at = 0.0
+
+
+def is_leader() -> bool:
+    """Check whether this worker currently holds an unexpired orchestrator lease.
+
+    The deadline is tracked locally, so a worker whose renewals stall stops acting as
+    leader by the time its lease can have passed to another worker.
+    """
+    return time.monotonic() < _lease_expires_at
+
+
+def claim_leadership() -> bool:
+    """Renew this worker's lease, or take the lock if nobody holds it.
+
+    Returns:
+        True if this worker is the leader for the next LEADER_LEASE_TTL seconds.
+    """
+    global _lease_expires_at
+    was_leader = is_leader()
+    started = time.monotonic()
+    ttl_ms = int(LEADER_LEASE_TTL * 1000)
+    try:
+        client = get_redis_queue_client()
+        held = client.eval(_RENEW_SCRIPT, 1, LEADER_KEY, WORKER_ID, ttl_ms) == 1
+        if not held:
+            held = bool(client.set(LEADER_KEY, WORKER_ID, nx=True, px=ttl_ms))
+    except Exception as e:
+        logger.warning("Failed to renew orchestrator leadership: %s", e)
+        return is_leader()
+
+    if held:
+        _lease_expires_at = started + LEADER_LEASE_TTL
+        if not was_leader:
+            logger.info("Worker %s is now the playback orchestrator leader.", WORKER_ID)
+    else:
+        _lease_expires_at = 0.0
+        if was_leader:
+            logger.warning("Worker %s lost orchestrator leadership.", WORKER_ID)
+    return held
+
+
+def release_leadership():
+    """Give up the lease on shutdown so another worker can take over right away."""
+    global _lease_expires_at
+    _lease_expires_at = 0.0
+    try:
+        get_redis_queue_client().eval(_RELEASE_SCRIPT, 1, LEADER_KEY, WORKER_ID)
+    except Exception as e:
+        logger.debug("Failed to release orchestrator leadership: %s", e)
+
+
+async def leadership_keeper():
+    """Background task that keeps claiming or renewing the orchestrator lease."""
+    while True:
+        await asyncio.to_thread(claim_leadership)
+        await asyncio.sleep(LEADER_RENEW_INTERVAL)
@@ -1,32 +1,55 @@
 """Interact with our Plex server."""
 
 import asyncio
+import json
 import logging
+import random
 import time
 from functools import lru_cache
+from types import SimpleNamespace
 
-import requests
 import urllib3
 from fastapi import HTTPException
-from plexapi.exceptions import PlexApiException
+from plexapi.exceptions import NotFound, PlexApiException
 from plexapi.myplex import MyPlexAccount
 
 from backend.config import settings
 from backend.exceptions import PlexConnectionError
 from backend.services.mock_data import MOCK_ALBUMS, MOCK_ARTISTS, MOCK_TRACKS
 from backend.services.redis import (
+    add_entry_to_queue_redis,
     cache_data,
+    cache_negative,
     clear_cache,
+    clear_negative_cache,
     get_cached_data,
+    is_negatively_cached,
     get_redis_queue,
+    load_playback_clock,
+    save_playback_clock,
     remove_from_redis_queue,
     add_to_history,
     is_autoplay_enabled,
+    get_playback_history,
+    get_redis_cache_client,
+    queue_entry,
 )
+from backend.services.history import most_played, most_skipped, record_play_end, record_play_start, track_details
+from backend.services.leadership import is_leader
+from backend.services.recommender import recommend_tracks
 from backend.utils import TrackTimeTracker, milliseconds_to_seconds
 
 HEARTBEAT_INTERVAL = 5
 DRIFT_THRESHOLD = 8.0
+LIBRARY_SYNC_INTERVAL = 300
+SERVER_UNREACHABLE_TTL = 30
+RESYNC_REUSE_WINDOW = 2.0
+# Followers re-read the replicated clock at most this often, matching the once-a-second tick
+PLAYBACK_CLOCK_SYNC_INTERVAL = 1.0
+AUTOPLAY_CANDIDATES = 10
+AUTOPLAY_TRACKS = 10
+# Browsers may remember a real artwork miss briefly; unreachable servers are never cached client-side
+ART_MISS_CACHE_CONTROL = "private, max-age=60"
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -34,12 +57,43 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 logger = logging.getLogger(__name__)
 
 
-track_time_tracker = TrackTimeTracker()
+def _replicate_clock():
+    """Publish the playback clock and orchestrator state for the other workers."""
+    save_playback_clock({**track_time_tracker.snapshot(), "playback_active": playback_active})
+
+
+track_time_tracker = TrackTimeTracker(on_change=_replicate_clock)
 # Declare the global variable to manage playback state
 playback_active = False
 _cached_active_player = None
 _cached_active_player_name = None
 
+# The Plexamp resync that concurrent callers share, whether it force-aligns, and when the last one finished
+_resync_task: asyncio.Task | None = None
+_resync_forced = False
+_last_resync_at: float | None = None
+_last_resync_forced = False
+_last_clock_sync = float("-inf")
+
+
+def set_playback_active(active: bool):
+    """Turn queue driving on or off for whichever worker leads the orchestrator."""
+    # ruff: noqa: PLW0603
+    global playback_active
+    playback_active = active
+    _replicate_clock()
+
+
+def sync_playback_clock():
+    """Adopt the playback clock and orchestrator state last replicated by any worker."""
+    global playback_active, _last_clock_sync
+    _last_clock_sync = time.monotonic()
+    state = load_playback_clock()
+    if state is None:
+        return
+    track_time_tracker.restore(state)
+    playback_active = bool(state.get("playback_active", playback_active))
+
 
 @lru_cache
 def get_myplex_account():
@@ -80,12 +134,12 @@ def get_plex_connection():
 
 def reinitialize_plex():
     """Clear cached connection and force connection reload."""
-    global _cached_active_player, _cached_active_player_name, playback_active
+    global _cached_active_player, _cached_active_player_name
     get_myplex_account.cache_clear()
     get_plex_connection.cache_clear()
     _cached_active_player = None
     _cached_active_player_name = None
-    playback_active = False
+    set_playback_active(False)
     try:
         from backend.services.redis import clear_cache, clear_redis_queue
         track_time_tracker.stop()
@@ -94,6 +148,7 @@ def reinitialize_plex():
         clear_cache("all_artists")
         clear_cache("now_playing")
         clear_cache("queue")
+        clear_negative_cache()
     except Exception as e:
         logger.debug("Failed to purge Redis cache on reinitialize: %s", e)
     logger.info("Plex connection cache, playback state, and Redis keys cleared for reinitialization.")
@@ -113,6 +168,7 @@ def pre_warm_all_caches():
 
         # 2. Warm artists if plex connection works
         if settings.plex_token:
+            sync_library_state()
             logger.info("Background warming Plex artists cache...")
             clear_cache("all_artists")
             fetch_all_artists()
@@ -121,6 +177,33 @@ def pre_warm_all_caches():
         logger.error("Failed to pre-warm caches: %s", e)
 
 
+def sync_library_state():
+    """Detect Plex music library changes and drop negative cache entries that may now be stale.
+
+    Returns:
+        True if the library changed since the last sync.
+    """
+    if settings.testing:
+        return False
+
+    try:
+        section = get_plex_connection().library.section("Music")
+        marker = str(getattr(section, "contentChangedAt", None) or getattr(section, "scannedAt", None))
+    except Exception as e:
+        logger.debug("Library sync skipped, Plex unavailable: %s", e)
+        return False
+
+    previous = get_cached_data("library_content_marker")
+    if previous == marker:
+        return False
+
+    cache_data("library_content_marker", marker)
+    if previous is not None:
+        logger.info("Plex music library changed. Invalidating negative caches.")
+        clear_negative_cache()
+    return True
+
+
 def get_current_playing_track():
     """Fetch the currently playing track details from cache and the local tracker.
 
@@ -131,7 +214,9 @@ def get_current_playing_track():
     if not cached_track:
         return None
 
-    # Track time info is calculated dynamically from the tracker
+    # Track time info is calculated dynamically; the leader's tracker is the source, so only followers re-read it
+    if not is_leader() and time.monotonic() - _last_clock_sync >= PLAYBACK_CLOCK_SYNC_INTERVAL:
+        sync_playback_clock()
     elapsed = track_time_tracker.elapsed_time
     total_time = cached_track.get("duration", 0)  # duration in seconds
 
@@ -265,6 +350,23 @@ def get_active_player(client_name: str | None = None):
     raise PlexApiException("No active Plex players found or resolvable.")
 
 
+def fetch_item_checked(plex, item_id, server_id: str | None = None):
+    """Fetch an item from Plex, failing fast for items recently found to be missing.
+
+    Returns:
+        The Plex item.
+    """
+    miss_key = f"item:{server_id or 'primary'}:{item_id}"
+    if is_negatively_cached(miss_key):
+        msg = f"Item {item_id} was recently not found on Plex."
+        raise NotFound(msg)
+    try:
+        return plex.fetchItem(item_id)
+    except NotFound:
+        cache_negative(miss_key)
+        raise
+
+
 def get_track(item_id):
     """Get track ID from plex based on song.
 
@@ -295,12 +397,51 @@ def get_track(item_id):
 
     plex = get_plex_connection()
     logger.debug("Fetching track: %s", item_id)
-    track = plex.fetchItem(item_id)
+    track = fetch_item_checked(plex, item_id)
     logger.debug("Fetched track: %s", track.title)
 
     return track
 
 
+_track_cache = {}  # { (server_id, item_id): (track, timestamp) }
+TRACK_CACHE_TTL = 300
+
+
+def load_queue_track(entry: dict):
+    """Load the Plex track object for a queue entry, reusing a prefetched copy while it is fresh.
+
+    Returns:
+        A track object from the entry's Plex server.
+    """
+    key = (entry.get("server_id"), str(entry["item_id"]))
+    now = time.time()
+    cached = _track_cache.get(key)
+    if cached and now - cached[1] < TRACK_CACHE_TTL:
+        return cached[0]
+
+    server_id = entry.get("server_id")
+    if server_id and not settings.testing:
+        t_plex = get_target_plex_connection(server_id)
+        track = fetch_item_checked(t_plex, int(entry["item_id"]), server_id)
+        track.server_name = entry.get("server_name")
+    else:
+        track = get_track(entry["item_id"])
+    # Carried along so the play history knows where the track came from and who queued it
+    track.server_id = server_id
+    track.added_by = entry.get("added_by")
+
+    _track_cache[key] = (track, now)
+    return track
+
+
+def prune_track_cache(entries: list[dict]):
+    """Drop cached track objects that no longer belong to any of the given queue entries."""
+    keep = {(e.get("server_id"), str(e["item_id"])) for e in entries}
+    for key in list(_track_cache):
+        if key not in keep:
+            _track_cache.pop(key, None)
+
+
 def play_song(player, song, server_token=None, server_url=None):
     """Play a specific song on the Plex player."""
     logger.info("Attempting to play song: %s on player: %s", getattr(song, "title", "Track"), player.title)
@@ -334,6 +475,7 @@ def play_song(player, song, server_token=None, server_url=None):
     }
     cache_data("now_playing", song_data)
     add_to_history(song.ratingKey)
+    record_play_start(song)
 
     track_time_tracker.start(song.title)
     logger.info("Song %s started playing on player: %s", song.title, player.title)
@@ -344,8 +486,7 @@ def play_song(player, song, server_token=None, server_url=None):
 
 async def play_queue_on_device():
     """Start playing the entire queue on the active Plex device."""
-    global playback_active
-    playback_active = True
+    set_playback_active(True)
 
     if track_time_tracker.state == "paused":
         try:
@@ -360,6 +501,10 @@ async def play_queue_on_device():
         except Exception as e:
             logger.warning("Failed to resume player: %s", e)
 
+    # The orchestrator leader starts the first track on its next tick
+    if not is_leader():
+        return
+
     try:
         from backend.services.redis import get_redis_queue
         queue_items = get_redis_queue()
@@ -381,13 +526,17 @@ async def play_queue_on_device():
                 t_plex = PlexServer(s_url, s_token, timeout=5)
                 song_obj = await asyncio.to_thread(t_plex.fetchItem, top_item["item_id"])
                 song_obj.server_name = top_item.get("server_name")
+                song_obj.server_id = top_item.get("server_id")
+                song_obj.added_by = top_item.get("added_by")
                 await asyncio.to_thread(play_song, player, song_obj, s_token, s_url)
             except Exception as ex:
                 logger.warning("Failed to load multi-server track %s from %s: %s", top_item["item_id"], s_url, ex)
                 song_obj = await asyncio.to_thread(get_track, top_item["item_id"])
+                song_obj.added_by = top_item.get("added_by")
                 await asyncio.to_thread(play_song, player, song_obj)
         else:
             song_obj = await asyncio.to_thread(get_track, top_item["item_id"])
+            song_obj.added_by = top_item.get("added_by")
             await asyncio.to_thread(play_song, player, song_obj)
 
         from backend.websockets import send_current_playing, send_queue  # noqa: PLC0415
@@ -397,138 +546,165 @@ async def play_queue_on_device():
         logger.exception("Error starting queue playback: %s", e)
 
 
-def generate_autoplay_tracks():
-    """Analyze recent history, fetch related tracks from Plex, and seed the queue with fallback items."""
-    import random
-    import json
-    from backend.services.redis import get_playback_history, get_redis_cache_client, add_to_queue_redis
+def autoplay_seeds(history: list[int], count: int = 3) -> list[int]:
+    """Pick autoplay seed tracks: recent plays first, then the most played tracks of all time.
 
-    logger.info("Triggering Autoplay track generation.")
-    
-    # 1. Fetch recent playback history
-    history = get_playback_history()
-    
-    # If in testing mode or history is empty, fall back
-    if settings.testing or not history:
-        # We try to load cached playlist tracks as fallback pool
-        try:
-            cached = get_redis_cache_client().get("last_seeded_playlist_tracks")
-            if cached:
-                fallback_pool = json.loads(cached)
-                # Sample up to 10 tracks
-                sampled_ids = random.sample(fallback_pool, min(len(fallback_pool), 10))
-                for tid in sampled_ids:
-                    track = get_track(tid)
-                    try:
-                        add_to_queue_redis(track, is_fallback=True)
-                    except Exception:
-                        pass
-                logger.info("Autoplay seeded queue using cached playlist fallback.")
-                return
-        except Exception as ex:
-            logger.warning("Failed to retrieve cached playlist tracks for autoplay fallback: %s", ex)
-            
-        # Hard fallback to MOCK_TRACKS if cached playlist is unavailable
-        if settings.testing:
-            from backend.services.mock_data import MOCK_TRACKS
-            all_tracks = []
-            for album_tracks in MOCK_TRACKS.values():
-                all_tracks.extend(album_tracks)
-            sampled = random.sample(all_tracks, min(len(all_tracks), 10))
-            for t in sampled:
-                class MockTrack:
-                    ratingKey = t["track_id"]
-                    title = t["title"]
-                    grandparentTitle = t["artist"]
-                    parentTitle = t["album"]
-                    duration = t["duration"] * 1000
-                    thumb = f"/api/music/album-art/{t['track_id']}"
-                try:
-                    add_to_queue_redis(MockTrack(), is_fallback=True)
-                except Exception:
-                    pass
-            logger.info("Autoplay seeded queue using mock track fallback.")
-            return
+    Tracks that are among the most skipped never seed, and only tracks on the primary server
+    can, since seeds are loaded with get_track.
 
-    # 2. Select up to 3 distinct seeds from the history
-    seeds = list(set(history))[:3]
-    candidate_tracks = []
-    
-    # 3. Query Plex for related tracks
+    Returns:
+        Up to count distinct track IDs.
+    """
+    skipped = {(track["server_id"] or "", track["track_key"]) for track in most_skipped(limit=20)}
+    favourites = [
+        int(track["track_key"])
+        for track in most_played(limit=10)
+        if track["server_id"] is None and track["track_key"].isdigit()
+    ]
+    return [tid for tid in dict.fromkeys([*history, *favourites]) if ("", str(tid)) not in skipped][:count]
+
+
+def _recommended_entries(seeds: list[int], history: list) -> list[dict]:
+    """Build fallback queue entries for the primary-server tracks the co-occurrence model picks for the seeds.
+
+    Entries come from a track object still in the track cache or from what the play history stored
+    about the track, so no Plex request is made. Tracks skipped often or played recently are never
+    recommended.
+
+    Returns:
+        Up to AUTOPLAY_CANDIDATES entries, empty if NumPy is missing or nothing usable co-occurred.
+    """
+    skipped = [(track["server_id"] or "", track["track_key"]) for track in most_skipped(limit=20)]
+    recommended = recommend_tracks(
+        [("", str(seed_id)) for seed_id in seeds],
+        exclude=[*skipped, *(("", str(tid)) for tid in history)],
+        k=AUTOPLAY_CANDIDATES,
+    )
+    keys = [(server_id, track_key) for server_id, track_key in recommended or [] if not server_id and track_key.isdigit()]
+    details = track_details(keys)
+    entries = []
+    for key in keys:
+        cached = _track_cache.get((None, key[1]))
+        if cached:
+            entries.append(queue_entry(cached[0], is_fallback=True))
+        elif key in details:
+            track = details[key]
+            song = SimpleNamespace(
+                ratingKey=int(key[1]),
+                title=track["title"],
+                grandparentTitle=track["artist"] or "Unknown Artist",
+                duration=track["duration"],
+                thumb=track["thumb"],
+            )
+            entries.append(queue_entry(song, is_fallback=True))
+    return entries
+
+
+def _related_entries(seeds: list[int], history: list) -> list[dict]:
+    """Build fallback queue entries from the Plex related tracks of each seed, leaving out recent plays.
+
+    This costs two Plex round trips per seed, so autoplay only uses it when the model has nothing.
+    """
+    recent = {str(tid) for tid in history}
+    entries = []
     for seed_id in seeds:
         try:
-            seed_track = get_track(seed_id)
-            if hasattr(seed_track, "related") and not settings.testing:
-                related = seed_track.related()
-                for r_item in related:
-                    # Make sure it's a track
-                    if getattr(r_item, "type", "") == "track" or "track" in str(getattr(r_item, "type", "")):
-                        candidate_tracks.append(r_item)
+            related = get_track(seed_id).related()
         except Exception as e:
             logger.warning("Failed to query related tracks for seed %s: %s", seed_id, e)
-            
-    # Remove duplicates from candidates
-    unique_candidates = {}
-    for c in candidate_tracks:
-        unique_candidates[c.ratingKey] = c
-        
-    candidates = list(unique_candidates.values())
-    
-    # Filter out tracks already in the history to avoid immediate duplicates
-    filtered_candidates = []
-    for c in candidates:
-        if str(c.ratingKey) not in [str(h) for h in history]:
-            filtered_candidates.append(c)
-    
-    # If we have no/few candidates, fall back to cached playlist tracks
-    if len(filtered_candidates) < 10:
+            continue
+        entries += [
+            queue_entry(item, is_fallback=True)
+            for item in related
+            if "track" in str(getattr(item, "type", "")) and str(item.ratingKey) not in recent
+        ]
+    return entries
+
+
+def _playlist_entries(count: int, history: list) -> list[dict]:
+    """Build fallback queue entries for up to count tracks sampled from the last seeded playlist."""
+    try:
+        cached = get_redis_cache_client().get("last_seeded_playlist_tracks")
+    except Exception as e:
+        logger.warning("Autoplay fallback pool lookup failed: %s", e)
+        return []
+    pool = [tid for tid in json.loads(cached) if tid not in history] if cached else []
+    entries = []
+    for tid in random.sample(pool, min(len(pool), count)):
         try:
-            cached = get_redis_cache_client().get("last_seeded_playlist_tracks")
-            if cached:
-                fallback_pool = json.loads(cached)
-                needed = 10 - len(filtered_candidates)
-                sampled_ids = random.sample(fallback_pool, min(len(fallback_pool), needed))
-                for tid in sampled_ids:
-                    try:
-                        # Skip if already in history
-                        if tid in history:
-                            continue
-                        track = get_track(tid)
-                        filtered_candidates.append(track)
-                    except Exception:
-                        pass
-        except Exception as ex:
-            logger.warning("Autoplay fallback pool lookup failed: %s", ex)
-            
-    if not filtered_candidates:
+            entries.append(queue_entry(get_track(tid), is_fallback=True))
+        except Exception as e:
+            logger.debug("Failed to load playlist track %s for autoplay: %s", tid, e)
+    return entries
+
+
+def _mock_entries(count: int) -> list[dict]:
+    """Build fallback queue entries for up to count tracks sampled from the mock library."""
+    tracks = [track for album_tracks in MOCK_TRACKS.values() for track in album_tracks]
+    return [
+        queue_entry(
+            SimpleNamespace(
+                ratingKey=track["track_id"],
+                title=track["title"],
+                grandparentTitle=track["artist"],
+                duration=track["duration"] * 1000,
+                thumb=f"/api/music/album-art/{track['track_id']}",
+            ),
+            is_fallback=True,
+        )
+        for track in random.sample(tracks, min(len(tracks), count))
+    ]
+
+
+def _autoplay_candidates(history: list) -> list[dict]:
+    """Choose distinct fallback queue entries to continue from the recent and long-term play history.
+
+    The co-occurrence model is asked first, and Plex related tracks only when it has nothing usable.
+    Short lists are topped up from the last seeded playlist, and in testing mode from the mock library.
+
+    Returns:
+        The candidate entries, at most one per track.
+    """
+    seeds = [] if settings.testing else autoplay_seeds(history)
+    candidates = (_recommended_entries(seeds, history) or _related_entries(seeds, history)) if seeds else []
+    if len(candidates) < AUTOPLAY_TRACKS:
+        candidates += _playlist_entries(AUTOPLAY_TRACKS - len(candidates), history)
+    if not candidates and settings.testing:
+        candidates = _mock_entries(AUTOPLAY_TRACKS)
+    return list({(entry["server_id"], str(entry["item_id"])): entry for entry in candidates}.values())
+
+
+def generate_autoplay_tracks():
+    """Seed the queue with AUTOPLAY_TRACKS fallback tracks that fit what has been playing."""
+    logger.info("Triggering Autoplay track generation.")
+    candidates = _autoplay_candidates(get_playback_history())
+    if not candidates:
         logger.warning("No candidates found for autoplay.")
         return
-        
-    # Shuffle and select 10 tracks
-    random.shuffle(filtered_candidates)
-    selected = filtered_candidates[:10]
-    
-    for track in selected:
+
+    random.shuffle(candidates)
+    selected = candidates[:AUTOPLAY_TRACKS]
+    for entry in selected:
         try:
-            add_to_queue_redis(track, is_fallback=True)
-        except Exception:
-            pass
-            
+            add_entry_to_queue_redis(entry)
+        except Exception as e:
+            logger.debug("Skipped autoplay track %s: %s", entry["title"], e)
+
     logger.info("Successfully populated queue with %s autoplay fallback tracks.", len(selected))
 
 
 async def playback_orchestrator():
     """Central async background task that manages the playback state machine.
 
-    Ticks every 1 second:
+    Ticks every 1 second, but only on the worker holding the orchestrator lease:
     1. If playback is active, monitors and drives the custom queue.
     2. Broadcasts Now Playing WebSocket events (elapsed time increments) every second.
     3. Runs a low-frequency resync check (every HEARTBEAT_INTERVAL seconds) against Plexamp.
     """
-    global playback_active
     logger.info("Playback orchestrator background task started.")
 
     tick_count = 0
+    sync_tick_count = 0
     while True:
         try:
             # Skip loop if server is unauthenticated (unconfigured)
@@ -540,6 +716,12 @@ async def playback_orchestrator():
                 await asyncio.sleep(5)
                 continue
 
+            # Only the elected worker drives playback; the others serve the replicated clock
+            if not is_leader():
+                await asyncio.sleep(1)
+                continue
+            sync_playback_clock()
+
             # 1. Drive the queue if nothing is currently playing
             if playback_active:
                 queue = get_redis_queue()
@@ -556,16 +738,10 @@ async def playback_orchestrator():
                         next_song = queue[0]
                         try:
                             player = await asyncio.to_thread(get_active_player)
-                            s_id = next_song.get("server_id")
                             s_url = next_song.get("server_address")
                             s_token = next_song.get("server_token")
 
-                            if s_id and not settings.testing:
-                                t_plex = await asyncio.to_thread(get_target_plex_connection, s_id)
-                                track = await asyncio.to_thread(t_plex.fetchItem, int(next_song["item_id"]))
-                                track.server_name = next_song.get("server_name")
-                            else:
-                                track = await asyncio.to_thread(get_track, next_song["item_id"])
+                            track = await asyncio.to_thread(load_queue_track, next_song)
 
                             if s_url and s_token and not settings.testing:
                                 await asyncio.to_thread(play_song, player, track, s_token, s_url)
@@ -589,7 +765,7 @@ async def playback_orchestrator():
                             await send_queue()
                     else:
                         # Queue finished
-                        playback_active = False
+                        set_playback_active(False)
                         clear_cache("now_playing")
                         from backend.websockets import send_current_playing, reset_skip_votes  # noqa: PLC0415
                         await reset_skip_votes()
@@ -608,6 +784,7 @@ async def playback_orchestrator():
                             )
                             # Stop current tracking
                             track_time_tracker.stop()
+                            await asyncio.to_thread(record_play_end, completed=True)
                             # Remove finished track
                             remove_from_redis_queue(cached_track["item_id"])
 
@@ -627,6 +804,12 @@ async def playback_orchestrator():
                 tick_count = 0
                 await check_plexamp_resync()
 
+            # 4. Occasionally look for library changes that invalidate negative caches
+            sync_tick_count += 1
+            if sync_tick_count >= LIBRARY_SYNC_INTERVAL:
+                sync_tick_count = 0
+                await asyncio.to_thread(sync_library_state)
+
         except Exception:
             logger.exception("Error in playback orchestrator")
 
@@ -634,8 +817,14 @@ async def playback_orchestrator():
 
 
 async def check_plexamp_resync(force_align: bool = False):
-    """Align local playback state and timer with actual Plexamp sessions to catch drift and manual interactions."""
-    global playback_active
+    """Align local playback state and timer with actual Plexamp sessions to catch drift and manual interactions.
+
+    Concurrent callers share one in-flight check, and a check that finished less than
+    RESYNC_REUSE_WINDOW seconds ago is reused, so a burst of new connections costs one Plex
+    round trip. A force_align caller only shares a check that force-aligned as well.
+    """
+    # ruff: noqa: PLW0603
+    global _resync_task, _resync_forced
 
     # In testing mode there is no real Plex connection, so skip the resync entirely.
     if settings.testing:
@@ -649,6 +838,33 @@ async def check_plexamp_resync(force_align: bool = False):
     if not settings.plex_server_name:
         return
 
+    while True:
+        if _resync_task is None:
+            recent = _last_resync_at is not None and time.monotonic() - _last_resync_at < RESYNC_REUSE_WINDOW
+            if recent and (_last_resync_forced or not force_align):
+                return
+            _resync_forced = force_align
+            _resync_task = asyncio.create_task(_run_plexamp_resync(force_align))
+        task, forced = _resync_task, _resync_forced
+        # Shielded so one cancelled caller does not cancel the check the others are waiting on
+        await asyncio.shield(task)
+        if forced or not force_align:
+            return
+
+
+async def _run_plexamp_resync(force_align: bool):
+    """Run one shared resync and record when it finished."""
+    global _resync_task, _last_resync_at, _last_resync_forced
+    try:
+        await _resync_plexamp(force_align)
+    finally:
+        _resync_task = None
+        _last_resync_at = time.monotonic()
+        _last_resync_forced = force_align
+
+
+async def _resync_plexamp(force_align: bool):
+    """Poll Plexamp once and fold what it reports into the local tracker and now-playing cache."""
     try:
         plex = get_plex_connection()
         try:
@@ -769,17 +985,8 @@ async def check_plexamp_resync(force_align: bool = False):
                 track_time_tracker.stop()
                 track_time_tracker.start(session_title)
 
-                # If Plex is playing, resume tracker, else pause
-                if session_state == "paused":
-                    track_time_tracker.pause()
-                elif session_state == "playing":
-                    track_time_tracker.resume()
-
-                # Align elapsed time
-                track_time_tracker.accumulated_elapsed = float(plex_elapsed)
-                track_time_tracker.last_resume_time = (
-                    time.time() if session_state == "playing" else None
-                )
+                # Align elapsed time, playing only if Plex is playing
+                track_time_tracker.seek(plex_elapsed, playing=session_state == "playing")
 
                 await send_current_playing()
 
@@ -804,10 +1011,7 @@ async def check_plexamp_resync(force_align: bool = False):
                         force_align,
                     )
                     # Align elapsed time
-                    track_time_tracker.accumulated_elapsed = float(plex_elapsed)
-                    track_time_tracker.last_resume_time = (
-                        time.time() if session_state == "playing" else None
-                    )
+                    track_time_tracker.seek(plex_elapsed, playing=session_state == "playing")
                     state_changed = True
 
                 if state_changed:
@@ -826,7 +1030,7 @@ async def check_plexamp_resync(force_align: bool = False):
                     logger.info("No active Plexamp session found. Resynced to stopped.")
                     track_time_tracker.stop()
                     clear_cache("now_playing")
-                    playback_active = False
+                    set_playback_active(False)
                     await send_current_playing()
 
     except Exception:
@@ -840,7 +1044,6 @@ def stop_playback():
         A JSON message about stopping playback.
     """
     # ruff: noqa: PLW0603
-    global playback_active
 
     try:
         player = get_active_player()
@@ -865,7 +1068,7 @@ def stop_playback():
             if not stop_success:
                 logger.warning("All playback control stop/pause commands failed on player '%s'", player.title)
 
-            playback_active = False
+            set_playback_active(False)
 
             # Instead of resetting the tracker and clearing cache completely:
             # We keep the current track but mark it as stopped/paused with 0 elapsed.
@@ -875,9 +1078,7 @@ def stop_playback():
                 cache_data("now_playing", cached_track)
             
             # Reset tracker to paused state at 0 elapsed
-            track_time_tracker.state = "paused"
-            track_time_tracker.accumulated_elapsed = 0.0
-            track_time_tracker.last_resume_time = None
+            track_time_tracker.seek(0.0, playing=False)
             return {"message": "Playback stopped successfully."}
         raise HTTPException(status_code=400, detail="No active player found.")
     except Exception as e:
@@ -888,7 +1089,6 @@ def stop_playback():
 
 def skip_current_track():
     """Skip the currently playing track by stopping player and advancing queue."""
-    global playback_active
     try:
         player = get_active_player()
         if player:
@@ -910,10 +1110,11 @@ def skip_current_track():
     cached_track = get_cached_data("now_playing")
     if cached_track:
         remove_from_redis_queue(cached_track["item_id"])
+        record_play_end(skipped=True)
 
     track_time_tracker.stop()
     clear_cache("now_playing")
-    playback_active = True
+    set_playback_active(True)
     return {"message": "Track skipped successfully."}
 
 
@@ -968,6 +1169,10 @@ def get_target_plex_connection(server_id: str | None = None):
         if now - cached_time < 300:
             return cached_instance
 
+    # Skip the (slow) connection attempts while the server is known to be down
+    if is_negatively_cached(f"server:{server_id}"):
+        return primary_plex
+
     all_servers = fetch_accessible_plex_servers()
     target_res = next((s for s in all_servers if s["server_id"] == server_id), None)
     if not target_res or target_res.get("is_primary"):
@@ -995,6 +1200,7 @@ def get_target_plex_connection(server_id: str | None = None):
         _plex_connection_cache[server_id] = (conn, now)
         return conn
 
+    cache_negative(f"server:{server_id}", SERVER_UNREACHABLE_TTL)
     return primary_plex
 
 
@@ -1197,56 +1403,68 @@ def search_music(query):
     return formatted_results
 
 
-def fetch_art(item_id: int, item_type: str, server_id: str | None = None):
-    """Fetch image (either artist or album) from Plex.
+def thumb_cache_key(item_id: int, item_type: str, server_id: str | None = None) -> str:
+    """Build the Redis key holding the Plex thumb path for an item."""
+    return f"thumb_path:{server_id or 'primary'}:{item_type}:{item_id}"
 
-    Returns:
-        An image to serve to the frontend.
-    """
-    if settings.testing:
 
-        class MockResponse:
-            ok = True
+def _item_thumb(item) -> str | None:
+    """Find an item's own thumb, or failing that its album's or artist's."""
+    thumb_path = (
+        getattr(item, "thumb", None)
+        or getattr(item, "parentThumb", None)
+        or getattr(item, "grandparentThumb", None)
+    )
+    if not thumb_path and hasattr(item, "album"):
+        try:
+            alb = item.album()
+            if alb:
+                thumb_path = getattr(alb, "thumb", None)
+        except Exception:
+            pass
+    return thumb_path
 
-            def iter_content(self, chunk_size=1024):
-                yield (
-                    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06"
-                    b"\x00\x00\x00\x1f\x15c4\x00\x00\x00\rIDATx\x9cc`\x00\x01\x00\x00\x05\x00\x01"
-                    b"\xa5\xf9\xd0\xb1\x00\x00\x00\x00IEND\xaeB`\x82"
-                )
 
-        return MockResponse()
+def resolve_art_url(item_id: int, item_type: str, server_id: str | None = None):
+    """Resolve the Plex image URL for an artist, album, or track.
 
-    try:
-        plex = get_target_plex_connection(server_id)
+    The thumb path is cached in Redis, so only the first lookup for an item costs a Plex round trip.
 
-        if item_type not in {"artist", "album", "track"}:
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid item type. Must be 'artist', 'album', or 'track'.",
-            )
+    Returns:
+        The absolute, tokenized image URL on the Plex server.
+    """
+    if item_type not in {"artist", "album", "track"}:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid item type. Must be 'artist', 'album', or 'track'.",
+        )
+
+    server_key = f"server:{server_id or 'primary'}"
+    miss_key = f"art:{server_id or 'primary'}:{item_type}:{item_id}"
+    no_image = HTTPException(
+        status_code=404,
+        detail=f"No image available for this {item_type}.",
+        headers={"Cache-Control": ART_MISS_CACHE_CONTROL},
+    )
+    if is_negatively_cached(server_key):
+        raise HTTPException(status_code=404, detail=f"Image not accessible for {item_type}: server unreachable.")
+    if is_negatively_cached(miss_key):
+        raise no_image
+
+    try:
+        try:
+            plex = get_target_plex_connection(server_id)
+        except PlexConnectionError:
+            cache_negative(server_key, SERVER_UNREACHABLE_TTL)
+            raise
 
-        cache_key = f"thumb_path:{server_id or 'primary'}:{item_type}:{item_id}"
+        cache_key = thumb_cache_key(item_id, item_type, server_id)
         thumb_path = get_cached_data(cache_key)
         if not thumb_path:
-            item = plex.fetchItem(item_id)
-            thumb_path = (
-                getattr(item, "thumb", None)
-                or getattr(item, "parentThumb", None)
-                or getattr(item, "grandparentThumb", None)
-            )
-            if not thumb_path and hasattr(item, "album"):
-                try:
-                    alb = item.album()
-                    if alb:
-                        thumb_path = getattr(alb, "thumb", None)
-                except Exception:
-                    pass
-
+            thumb_path = _item_thumb(fetch_item_checked(plex, item_id, server_id))
             if not thumb_path:
-                raise HTTPException(
-                    status_code=404, detail=f"No image available for this {item_type}."
-                )
+                cache_negative(miss_key)
+                raise no_image
             cache_data(cache_key, thumb_path)
 
         # Get the server URL and token from the established connection
@@ -1254,22 +1472,16 @@ def fetch_art(item_id: int, item_type: str, server_id: str | None = None):
         server_url = getattr(plex, "_baseurl", "")
         # ruff: noqa: SLF001
         token = getattr(plex, "_token", "")
-        image_url = f"{server_url}{thumb_path}?X-Plex-Token={token}"
-
-        # ruff: noqa: S501
-        response = requests.get(image_url, stream=True, verify=False, timeout=12)
-        if not response.ok:
-            raise HTTPException(
-                status_code=404, detail=f"Image not found on Plex for {item_type}."
-            )
     except HTTPException:
         raise
+    except NotFound as e:
+        raise no_image from e
     except Exception as e:
         raise HTTPException(
             status_code=404, detail=f"Image not accessible for {item_type}: {e}"
         ) from e
     else:
-        return response
+        return f"{server_url}{thumb_path}?X-Plex-Token={token}"
 
 
 def fetch_accessible_plex_servers():
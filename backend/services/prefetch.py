@@ -0,0 +1,56 @@
+"""Warm Plex track objects, thumb paths and artwork for the upcoming queue entries."""
+
+import asyncio
+import logging
+
+from backend.services.artwork import warm_art
+from backend.services.plex import load_queue_track, prune_track_cache, thumb_cache_key
+from backend.services.redis import cache_data, get_cached_data
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_DEPTH = 5
+
+_upcoming: list[dict] = []
+_wakeup = asyncio.Event()
+
+
+def request_prefetch(queue: list[dict]):
+    """Record the latest queue snapshot and wake the prefetch worker.
+
+    Only the newest snapshot is kept, so a burst of queue mutations results in one warm-up pass.
+    """
+    global _upcoming
+    _upcoming = [entry for entry in queue[:PREFETCH_DEPTH] if entry.get("item_id") is not None]
+    _wakeup.set()
+
+
+async def warm_entry(entry: dict):
+    """Warm the track object, thumb path and art bytes for a single queue entry."""
+    item_id = entry["item_id"]
+    server_id = entry.get("server_id")
+
+    await asyncio.to_thread(load_queue_track, entry)
+
+    # Queue entries already carry the track thumb, so seed the path cache without asking Plex
+    thumb_key = thumb_cache_key(item_id, "track", server_id)
+    if entry.get("album_art") and not get_cached_data(thumb_key):
+        cache_data(thumb_key, entry["album_art"])
+
+    await warm_art(item_id, "track", server_id)
+
+
+async def prefetch_worker():
+    """Background task that warms the next PREFETCH_DEPTH queue entries whenever the queue changes."""
+    logger.info("Queue prefetch worker started.")
+    while True:
+        await _wakeup.wait()
+        _wakeup.clear()
+
+        entries = list(_upcoming)
+        prune_track_cache(entries)
+        for entry in entries:
+            try:
+                await warm_entry(entry)
+            except Exception as e:
+                logger.debug("Prefetch failed for queue item %s: %s", entry.get("item_id"), e)
@@ -0,0 +1,185 @@
+"""Recommend autoplay tracks from what past parties played together.
+
+Tracks played close together, and tracks queued by the same guest, co-occur. The counts live in
+a sparse, symmetric co-occurrence matrix in CSR form (indptr, indices, data, as in SciPy) that is
+updated incrementally from new play_history rows, so choosing autoplay candidates is a handful
+of vectorized NumPy operations instead of Plex related() calls. Should NumPy fail to import,
+recommend_tracks returns None and autoplay falls back to Plex.
+"""
+
+import logging
+import threading
+from collections import deque
+from collections.abc import Iterable
+
+from backend.services.stats import read_only_database
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only where numpy is missing
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Each play co-occurs with the NEIGHBOUR_WINDOW plays before it, weighted 1/distance
+NEIGHBOUR_WINDOW = 5
+# Plays further apart than this belong to different parties and never co-occur
+PARTY_GAP = 6 * 3600
+# Weight of a pair of tracks among one guest's last NEIGHBOUR_WINDOW adds
+GUEST_WEIGHT = 0.5
+
+TrackKey = tuple[str, str]  # (server_id, track_key), with "" for the primary server
+
+
+class CooccurrenceModel:
+    """A sparse track-by-track co-occurrence matrix built from the play history."""
+
+    def __init__(self):
+        """Start with an empty matrix that has seen no plays."""
+        self.track_ids: dict[TrackKey, int] = {}
+        self.tracks: list[TrackKey] = []
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.empty(0, dtype=np.int64)
+        self.data = np.empty(0, dtype=np.float64)
+        self.last_play_id = 0
+        # The latest plays, overall and per guest, as (track index, started_at)
+        self._recent: deque[tuple[int, float]] = deque(maxlen=NEIGHBOUR_WINDOW)
+        self._guest_recent: dict[str, deque[tuple[int, float]]] = {}
+
+    def _index(self, key: TrackKey) -> int:
+        if key not in self.track_ids:
+            self.track_ids[key] = len(self.tracks)
+            self.tracks.append(key)
+        return self.track_ids[key]
+
+    def _neighbour_pairs(self, track: int, started_at: float) -> list[tuple[int, int, float]]:
+        """Pair a play with the plays just before it in the same party, weighted 1/distance."""
+        pairs = []
+        for distance, (other, played_at) in enumerate(reversed(self._recent), start=1):
+            if started_at - played_at > PARTY_GAP:
+                break
+            if other != track:
+                pairs.append((track, other, 1 / distance))
+        return pairs
+
+    def _guest_pairs(self, track: int, started_at: float, added_by: str) -> list[tuple[int, int, float]]:
+        """Pair a play with the same guest's recent adds in the same party, and remember it for them."""
+        guest = self._guest_recent.setdefault(added_by, deque(maxlen=NEIGHBOUR_WINDOW))
+        pairs = [
+            (track, other, GUEST_WEIGHT)
+            for other, played_at in guest
+            if other != track and started_at - played_at <= PARTY_GAP
+        ]
+        guest.append((track, started_at))
+        return pairs
+
+    def update(self, plays: Iterable[tuple[int, str, str, str | None, float]]) -> int:
+        """Fold new plays, as (id, server_id, track_key, added_by, started_at) in id order, into the matrix.
+
+        Returns:
+            The number of plays folded in.
+        """
+        pairs: list[tuple[int, int, float]] = []
+        count = 0
+        for play_id, server_id, track_key, added_by, started_at in plays:
+            track = self._index((server_id or "", str(track_key)))
+            pairs += self._neighbour_pairs(track, started_at)
+            if added_by:
+                pairs += self._guest_pairs(track, started_at, added_by)
+            self._recent.append((track, started_at))
+            self.last_play_id = play_id
+            count += 1
+
+        # Tracks with no pairs yet still get an (empty) row
+        missing = len(self.tracks) + 1 - len(self.indptr)
+        if missing:
+            self.indptr = np.append(self.indptr, np.repeat(self.indptr[-1], missing))
+        if pairs:
+            rows, cols, weights = zip(*pairs, strict=True)
+            self._merge(np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(weights))
+        return count
+
+    def _merge(self, rows, cols, weights):
+        """Add pair weights in both directions and re-compress the matrix, summing duplicates."""
+        size = len(self.tracks)
+        existing_rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        all_rows = np.concatenate([existing_rows, rows, cols])
+        all_cols = np.concatenate([self.indices, cols, rows])
+        keys, positions = np.unique(all_rows * size + all_cols, return_inverse=True)
+        self.data = np.bincount(positions, weights=np.concatenate([self.data, weights, weights]))
+        self.indices = keys % size
+        self.indptr = np.searchsorted(keys // size, np.arange(size + 1))
+
+    def scores(self, seeds: list[int]):
+        """Sum the co-occurrence rows of the seed tracks.
+
+        Returns:
+            One score per known track.
+        """
+        spans = [slice(self.indptr[seed], self.indptr[seed + 1]) for seed in seeds]
+        if not spans:
+            return np.zeros(len(self.tracks))
+        indices = np.concatenate([self.indices[span] for span in spans])
+        data = np.concatenate([self.data[span] for span in spans])
+        return np.bincount(indices, weights=data, minlength=len(self.tracks))
+
+    def recommend(self, seeds: Iterable[TrackKey], exclude: Iterable[TrackKey] = (), k: int = 10) -> list[TrackKey]:
+        """Rank the tracks that co-occur most with the seeds.
+
+        Returns:
+            Up to k tracks, best first, leaving out the seeds, the excluded tracks and tracks
+            that never co-occurred with any seed.
+        """
+        seed_ids = [self.track_ids[key] for key in seeds if key in self.track_ids]
+        if not seed_ids:
+            return []
+        scores = self.scores(seed_ids)
+        scores[seed_ids] = 0
+        scores[[self.track_ids[key] for key in exclude if key in self.track_ids]] = 0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        best = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [self.tracks[index] for index in best]
+
+
+_model = CooccurrenceModel() if np is not None else None
+_model_lock = threading.Lock()
+
+
+def refresh_model() -> int:
+    """Fold plays logged since the last refresh into the shared model.
+
+    Returns:
+        The number of new plays.
+    """
+    if _model is None:
+        return 0
+    with _model_lock:
+        try:
+            with read_only_database() as conn:
+                plays = conn.execute(
+                    "SELECT id, server_id, track_key, added_by, started_at FROM play_history WHERE id > ? ORDER BY id",
+                    (_model.last_play_id,),
+                ).fetchall()
+        except Exception as e:
+            logger.warning("Failed to read new plays for the recommender: %s", e)
+            return 0
+        added = _model.update(plays)
+    if added:
+        logger.info("Recommender folded in %d new plays (%d tracks).", added, len(_model.tracks))
+    return added
+
+
+def recommend_tracks(seeds: list[TrackKey], exclude: Iterable[TrackKey] = (), k: int = 10) -> list[TrackKey] | None:
+    """Recommend tracks that past parties played alongside the seeds.
+
+    Returns:
+        Up to k (server_id, track_key) pairs, best first, or None if NumPy is not installed.
+    """
+    if _model is None:
+        return None
+    refresh_model()
+    with _model_lock:
+        return _model.recommend(seeds, exclude, k)
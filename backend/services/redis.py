@@ -4,6 +4,7 @@ import json
 import logging
 
 from fastapi import HTTPException, status
+from redis.exceptions import WatchError
 
 from backend.services.redis_client import get_redis_cache_client, get_redis_queue_client
 from backend.utils import is_song_in_queue, is_track_object
@@ -11,6 +12,10 @@ from backend.utils import is_song_in_queue, is_track_object
 logger = logging.getLogger(__name__)
 
 CACHE_TTL = 21600
+NEGATIVE_CACHE_TTL = 300
+NEGATIVE_CACHE_PREFIX = "negative:"
+VIBES_KEY = "queue_vibes"
+PLAYBACK_CLOCK_KEY = "playback_clock"
 
 
 def add_to_queue_redis(song, server_id=None, server_name=None, server_token=None, server_address=None, is_fallback=False, added_by=None):
@@ -18,42 +23,27 @@ def add_to_queue_redis(song, server_id=None, server_name=None, server_token=None
     if not is_track_object(song):
         msg = "Only songs can be added to the queue."
         raise ValueError(msg)
+    add_entry_to_queue_redis(
+        queue_entry(song, server_id, server_name, server_token, server_address, is_fallback=is_fallback, added_by=added_by)
+    )
 
-    target_server_id = server_id or getattr(song, "server_id", None)
-    if is_song_in_queue(song, server_id=target_server_id):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Song {song.title} is already in the queue.",
-        )
 
-    moods = [m.tag if hasattr(m, "tag") else str(m) for m in getattr(song, "moods", [])] if hasattr(song, "moods") else []
+def queue_entry(song, server_id=None, server_name=None, server_token=None, server_address=None, is_fallback=False, added_by=None) -> dict:
+    """Build the queue entry for a song, from a Plex track or anything with the same attributes.
 
-    # Cascade to Album and Artist level for moods if track level is empty
-    if not moods:
-        try:
-            if hasattr(song, "album"):
-                album = song.album()
-                if album and hasattr(album, "moods") and album.moods:
-                    moods = [m.tag if hasattr(m, "tag") else str(m) for m in album.moods]
-        except Exception:
-            pass
+    Returns:
+        The entry as it is stored in the Redis queue.
+    """
+    # Album and artist level moods are filled in later by the enrichment worker
+    moods = [m.tag if hasattr(m, "tag") else str(m) for m in getattr(song, "moods", [])] if hasattr(song, "moods") else []
 
-    if not moods:
-        try:
-            if hasattr(song, "artist"):
-                artist = song.artist()
-                if artist and hasattr(artist, "moods") and artist.moods:
-                    moods = [m.tag if hasattr(m, "tag") else str(m) for m in artist.moods]
-        except Exception:
-            pass
-
-    song_data = {
+    return {
         "item_id": song.ratingKey,
         "title": song.title,
         "artist": getattr(song, "grandparentTitle", "Unknown Artist"),
         "duration": song.duration,
         "album_art": song.thumb if hasattr(song, "thumb") else None,
-        "server_id": target_server_id,
+        "server_id": server_id or getattr(song, "server_id", None),
         "server_name": server_name or getattr(song, "server_name", None),
         "server_token": server_token or getattr(song, "server_token", None),
         "server_address": server_address or getattr(song, "server_address", None),
@@ -62,11 +52,28 @@ def add_to_queue_redis(song, server_id=None, server_name=None, server_token=None
         "added_by": added_by or ("System" if is_fallback else "Guest"),
     }
 
+
+def add_entry_to_queue_redis(song_data: dict):
+    """Add a queue entry built by queue_entry to the Redis queue.
+
+    Fallback entries go to the end; guest entries go ahead of the fallback tracks that are not playing.
+    """
+    if is_song_in_queue(song_data["item_id"], server_id=song_data["server_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Song {song_data['title']} is already in the queue.",
+        )
+
+    moods = song_data["moods"]
+    title = song_data["title"]
     client = get_redis_queue_client()
-    if is_fallback:
+    # Queue writes and mood histogram updates are applied in one MULTI/EXEC
+    pipe = client.pipeline()
+    _adjust_vibes(pipe, moods, 1)
+    if song_data["is_fallback"]:
         # If it's fallback, just append it to the end of the queue
-        client.rpush("playback_queue", json.dumps(song_data))
-        logger.info("Added fallback track %s to Redis queue.", song.title)
+        pipe.rpush("playback_queue", json.dumps(song_data))
+        logger.info("Added fallback track %s to Redis queue.", title)
     else:
         # If it's a guest song, check if fallback songs exist in the queue
         queue = client.lrange("playback_queue", 0, -1)
@@ -82,23 +89,60 @@ def add_to_queue_redis(song, server_id=None, server_name=None, server_token=None
             if candidate_indices:
                 first_fallback_idx = candidate_indices[0]
                 first_fallback_data = queue[first_fallback_idx]
-                client.linsert("playback_queue", "BEFORE", first_fallback_data, json.dumps(song_data))
+                pipe.linsert("playback_queue", "BEFORE", first_fallback_data, json.dumps(song_data))
                 
                 # Drop the last fallback track in the queue to maintain queue size
                 last_fallback_idx = fallback_indices[-1]
                 last_fallback_data = queue[last_fallback_idx]
-                client.lrem("playback_queue", -1, last_fallback_data)
-                logger.info("Inserted guest song %s before first non-playing fallback and dropped last fallback.", song.title)
+                pipe.lrem("playback_queue", -1, last_fallback_data)
+                _adjust_vibes(pipe, json.loads(last_fallback_data).get("moods"), -1)
+                logger.info("Inserted guest song %s before first non-playing fallback and dropped last fallback.", title)
             else:
                 # If the only fallback track is at index 0 (currently playing), append to the end
-                client.rpush("playback_queue", json.dumps(song_data))
-                logger.info("Added guest song %s to end of Redis queue (playing track is fallback).", song.title)
+                pipe.rpush("playback_queue", json.dumps(song_data))
+                logger.info("Added guest song %s to end of Redis queue (playing track is fallback).", title)
         else:
             # If no fallback tracks exist, just append to the end as normal
-            client.rpush("playback_queue", json.dumps(song_data))
-            logger.info("Added guest song %s to Redis queue.", song.title)
+            pipe.rpush("playback_queue", json.dumps(song_data))
+            logger.info("Added guest song %s to Redis queue.", title)
+    pipe.execute()
+
+    if not moods:
+        from backend.services.enrichment import enqueue_mood_enrichment  # noqa: PLC0415
+        enqueue_mood_enrichment(song_data)
 
 
+def update_queue_entry(item_id, server_id=None, **fields):
+    """Update fields of a queued entry in place without disturbing concurrent queue changes.
+
+    Returns:
+        True if the entry was found and updated.
+    """
+    client = get_redis_queue_client()
+    with client.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch("playback_queue")
+                queue = pipe.lrange("playback_queue", 0, -1)
+                for index, item_data in enumerate(queue):
+                    entry = json.loads(item_data)
+                    same_server = (entry.get("server_id") or None) == (server_id or None)
+                    if str(entry["item_id"]) == str(item_id) and same_server:
+                        old_moods = entry.get("moods")
+                        entry.update(fields)
+                        pipe.multi()
+                        pipe.lset("playback_queue", index, json.dumps(entry))
+                        if "moods" in fields:
+                            _adjust_vibes(pipe, old_moods, -1)
+                            _adjust_vibes(pipe, entry["moods"], 1)
+                        pipe.execute()
+                        return True
+                pipe.unwatch()
+                return False
+            except WatchError:
+                # The queue changed between read and write; retry against the new state
+                continue
+
 
 def remove_from_redis_queue(item_id):
     """Remove a song from the Redis playback queue by its item_id.
@@ -112,7 +156,10 @@ def remove_from_redis_queue(item_id):
         song = json.loads(song_data)
         if song["item_id"] == item_id:
             # Remove the song from the queue
-            get_redis_queue_client().lrem("playback_queue", 0, song_data)
+            pipe = get_redis_queue_client().pipeline()
+            pipe.lrem("playback_queue", 0, song_data)
+            _adjust_vibes(pipe, song.get("moods"), -1)
+            pipe.execute()
             logger.info("Removed %s from the Redis playback queue.", song["title"])
             return {"message": f"Removed {song['title']} from the queue."}
 
@@ -147,17 +194,20 @@ def clear_redis_queue():
     from backend.services.plex import track_time_tracker  # noqa: PLC0415
 
     if not track_time_tracker.is_playing and track_time_tracker.state != "paused":
-        client.delete("playback_queue")
+        client.delete("playback_queue", VIBES_KEY)
         logger.info("The Redis playback queue has been completely cleared since no track is active.")
     else:
         queue = client.lrange("playback_queue", 0, -1)
         if queue:
             first_item = queue[0]
-            client.delete("playback_queue")
-            client.rpush("playback_queue", first_item)
+            pipe = client.pipeline()
+            pipe.delete("playback_queue", VIBES_KEY)
+            pipe.rpush("playback_queue", first_item)
+            _adjust_vibes(pipe, json.loads(first_item).get("moods"), 1)
+            pipe.execute()
             logger.info("The Redis playback queue has been cleared, keeping the active playing track.")
         else:
-            client.delete("playback_queue")
+            client.delete("playback_queue", VIBES_KEY)
             logger.info("The Redis playback queue was empty and has been cleared.")
 
     return {"message": "The queue has been cleared."}
@@ -205,6 +255,42 @@ def move_to_top_redis_queue(from_index: int):
     return reorder_redis_queue(from_index, 1)
 
 
+def _adjust_vibes(pipe, moods, amount: int):
+    """Queue ZINCRBY updates of the mood histogram on a pipeline, pruning moods that drop to zero."""
+    if not moods:
+        return
+    for mood in moods:
+        pipe.zincrby(VIBES_KEY, amount, mood)
+    if amount < 0:
+        pipe.zremrangebyscore(VIBES_KEY, "-inf", 0)
+
+
+def get_top_vibes(count: int = 3) -> list[str]:
+    """Fetch the most common moods across the queue from the mood histogram.
+
+    Returns:
+        Up to count mood tags, most frequent first.
+    """
+    try:
+        return list(get_redis_queue_client().zrevrange(VIBES_KEY, 0, count - 1))
+    except Exception as e:
+        logger.warning("Failed to read queue vibes: %s", e)
+        return []
+
+
+def rebuild_vibes():
+    """Recompute the mood histogram from the queue, e.g. after Redis was edited externally."""
+    try:
+        client = get_redis_queue_client()
+        pipe = client.pipeline()
+        pipe.delete(VIBES_KEY)
+        for item_data in client.lrange("playback_queue", 0, -1):
+            _adjust_vibes(pipe, json.loads(item_data).get("moods"), 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to rebuild queue vibes: %s", e)
+
+
 def cache_data(key, data, ttl: int = CACHE_TTL):
     """Cache data in Redis with custom TTL."""
     try:
@@ -246,6 +332,68 @@ def clear_cache(key: str):
     return {"message": f"Cache cleared for key: {key}"}
 
 
+def cache_negative(key: str, ttl: int = NEGATIVE_CACHE_TTL):
+    """Remember that a lookup came back empty so repeated misses skip the expensive path."""
+    try:
+        get_redis_cache_client().setex(f"{NEGATIVE_CACHE_PREFIX}{key}", ttl, "1")
+        logger.debug("Cached negative result under key: %s (TTL: %d)", key, ttl)
+    except Exception as e:
+        logger.warning("Redis negative cache write error for key %s: %s", key, e)
+
+
+def is_negatively_cached(key: str) -> bool:
+    """Check whether a lookup is known to miss.
+
+    Returns:
+        True if a negative cache entry exists for the key.
+    """
+    try:
+        return bool(get_redis_cache_client().exists(f"{NEGATIVE_CACHE_PREFIX}{key}"))
+    except Exception as e:
+        logger.warning("Redis negative cache read error for key %s: %s", key, e)
+        return False
+
+
+def clear_negative_cache():
+    """Drop every negative cache entry, e.g. after the Plex library changed.
+
+    Returns:
+        The number of entries removed.
+    """
+    try:
+        client = get_redis_cache_client()
+        keys = list(client.scan_iter(match=f"{NEGATIVE_CACHE_PREFIX}*", count=500))
+        if keys:
+            client.delete(*keys)
+        logger.info("Cleared %d negative cache entries.", len(keys))
+        return len(keys)
+    except Exception as e:
+        logger.warning("Redis negative cache clear error: %s", e)
+        return 0
+
+
+def save_playback_clock(state: dict):
+    """Replicate the playback clock and orchestrator flags so every worker reports the same position."""
+    try:
+        get_redis_queue_client().set(PLAYBACK_CLOCK_KEY, json.dumps(state))
+    except Exception as e:
+        logger.warning("Failed to replicate playback clock: %s", e)
+
+
+def load_playback_clock() -> dict | None:
+    """Read the replicated playback clock.
+
+    Returns:
+        The last saved clock state, or None if none is stored or Redis is unreachable.
+    """
+    try:
+        raw = get_redis_queue_client().get(PLAYBACK_CLOCK_KEY)
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.debug("Failed to read playback clock: %s", e)
+        return None
+
+
 def add_to_history(track_id: int):
     """Add a track ID to the playback history list in Redis (capped at 10 items)."""
     try:
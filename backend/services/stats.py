@@ -1,150 +1,293 @@
+"""Guest statistics: stat events, leaderboards and the SQLite database they live in.
+
+Stat events are buffered in memory and written in batches by stats_writer over a single
+WAL-mode connection, which other local stores such as the play history share for their writes.
+Reads go through read_only_database instead, so they never queue behind a write.
+"""
+
+import asyncio
+import json
+import logging
 import os
 import sqlite3
-import logging
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from backend.config import settings
 from backend.services.redis import get_redis_queue_client
 
 logger = logging.getLogger(__name__)
 
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "stats.db")
+DB_PATH = settings.stats_db_path or os.path.join(os.path.dirname(os.path.dirname(__file__)), "stats.db")
+STAT_TYPES = ("adds", "skips_cast", "skips_received")
+STATS_FLUSH_INTERVAL = 2.0
+SESSION_ID_KEY = "stats:session_id"
+USER_ROLES_KEY = "stats:user_roles"
+# The combined leaderboards are cached in Redis, tagged with the stats version they were built at;
+# every stat change bumps the version, which invalidates the cached copy on all workers
+LEADERBOARDS_CACHE_KEY = "stats:leaderboards"
+LEADERBOARDS_VERSION_KEY = "stats:version"
+LEADERBOARDS_CACHE_TTL = 300
+STATS_TOP_N = 10
+# Leaderboard windows, as the number of seconds they reach back; "session" and "all" are special
+STATS_WINDOWS = {"hour": 3600, "day": 86400, "session": None, "all": None}
 
-def init_db():
-    """Initialize the SQLite database schema for all-time statistics."""
+# One writing connection for the process, shared by request threads and the writer under _db_lock
+_connection: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+# Stat events not yet written to SQLite, as (username, event_type, track_key, occurred_at, session_id)
+_pending: list[tuple[str, str, str | None, float, str | None]] = []
+_pending_lock = threading.Lock()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Open the long-lived stats connection on first use, in WAL mode.
+
+    Callers must hold _db_lock. With WAL, readers on their own connections (read_only_database)
+    never block this writer, and synchronous=NORMAL only syncs at checkpoints, so a batch commit
+    does not wait on an fsync.
+
+    Returns:
+        The shared SQLite connection.
+    """
+    global _connection  # noqa: PLW0603
+    if _connection is None:
+        _connection = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _connection.execute("PRAGMA journal_mode=WAL")
+        _connection.execute("PRAGMA synchronous=NORMAL")
+        _connection.execute("PRAGMA busy_timeout=5000")
+    return _connection
+
+
+@contextmanager
+def database() -> Generator[sqlite3.Connection]:
+    """Hold the shared stats connection for the duration of a block, for writes by other local stores."""
+    with _db_lock:
+        yield get_connection()
+
+
+@contextmanager
+def read_only_database() -> Generator[sqlite3.Connection]:
+    """Open a read-only connection to the stats database for the duration of a block.
+
+    Readers get their own connection rather than the shared one, so with WAL they never wait on
+    _db_lock, the write-behind flush or each other. The connection may be used from any thread.
+    """
+    uri = f"{Path(DB_PATH).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS adds (
-                username TEXT PRIMARY KEY,
-                count INTEGER DEFAULT 0
-            )
-            """
-        )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS skips_cast (
-                username TEXT PRIMARY KEY,
-                count INTEGER DEFAULT 0
-            )
-            """
-        )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS skips_received (
-                username TEXT PRIMARY KEY,
-                count INTEGER DEFAULT 0
-            )
-            """
-        )
-        conn.commit()
+        yield conn
+    finally:
         conn.close()
+
+
+def close_db():
+    """Write out pending increments and close the stats connection."""
+    global _connection  # noqa: PLW0603
+    flush_stats()
+    with _db_lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+def init_db():
+    """Initialize the SQLite database schema for statistics.
+
+    Every add, skip cast and skip received is kept as a row in stat_events, indexed for windowed
+    leaderboards. stat_totals holds the all-time count per user and type, kept in step with the
+    events, so all-time leaderboards read an index instead of sorting. Counts from the old
+    per-type counter tables are folded into stat_totals once.
+    """
+    try:
+        with _db_lock:
+            conn = get_connection()
+            with conn:
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS stat_events (
+                        id INTEGER PRIMARY KEY,
+                        username TEXT NOT NULL,
+                        event_type TEXT NOT NULL,
+                        track_key TEXT,
+                        occurred_at REAL NOT NULL,
+                        session_id TEXT
+                    );
+                    CREATE INDEX IF NOT EXISTS stat_events_by_time
+                        ON stat_events (event_type, occurred_at, username);
+                    CREATE INDEX IF NOT EXISTS stat_events_by_session
+                        ON stat_events (session_id, event_type, username);
+                    CREATE INDEX IF NOT EXISTS stat_events_by_occurred_at
+                        ON stat_events (occurred_at);
+                    CREATE TABLE IF NOT EXISTS stat_totals (
+                        event_type TEXT NOT NULL,
+                        username TEXT NOT NULL,
+                        count INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (event_type, username)
+                    );
+                    CREATE INDEX IF NOT EXISTS stat_totals_by_count
+                        ON stat_totals (event_type, count DESC, username);
+                    """
+                )
+                legacy = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                for event_type in STAT_TYPES:
+                    if event_type in legacy:
+                        conn.execute(
+                            "INSERT INTO stat_totals (event_type, username, count) "  # noqa: S608
+                            f"SELECT ?, username, count FROM {event_type} WHERE true "
+                            "ON CONFLICT(event_type, username) DO UPDATE SET count = count + excluded.count",
+                            (event_type,),
+                        )
+                        conn.execute(f"DROP TABLE {event_type}")
+                        logger.info("Migrated all-time %s counts into stat_totals", event_type)
         logger.info("Stats SQLite database initialized successfully at %s", DB_PATH)
     except Exception as e:
         logger.exception("Failed to initialize stats database: %s", e)
 
 
-def increment_adds(username: str):
-    """Increment song addition counts for a username in both SQLite and Redis."""
-    if not username or username.lower() == "admin":
-        return
-    
-    # 1. Update SQLite (All-Time)
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO adds (username, count) VALUES (?, 1) ON CONFLICT(username) DO UPDATE SET count = count + 1",
-            (username,),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed to increment SQLite adds for %s: %s", username, e)
+def flush_stats() -> int:
+    """Write all buffered stat events, and their all-time totals, to SQLite in one transaction.
+
+    Events that fail to write are put back and retried on the next flush.
 
-    # 2. Update Redis (Session)
+    Returns:
+        The number of events written.
+    """
+    with _pending_lock:
+        if not _pending:
+            return 0
+        batch = _pending.copy()
+        _pending.clear()
+
+    totals = Counter((event_type, username) for username, event_type, *_ in batch)
     try:
-        client = get_redis_queue_client()
-        client.zincrby("stats:adds:session", 1, username)
+        with _db_lock:
+            conn = get_connection()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO stat_events (username, event_type, track_key, occurred_at, session_id) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    batch,
+                )
+                conn.executemany(
+                    "INSERT INTO stat_totals (event_type, username, count) VALUES (?, ?, ?) "
+                    "ON CONFLICT(event_type, username) DO UPDATE SET count = count + excluded.count",
+                    [(event_type, username, count) for (event_type, username), count in totals.items()],
+                )
     except Exception as e:
-        logger.warning("Failed to increment Redis adds for %s: %s", username, e)
+        logger.warning("Failed to flush %d stat events to SQLite: %s", len(batch), e)
+        with _pending_lock:
+            _pending[:0] = batch
+        return 0
+    # All-time leaderboards now include these events
+    invalidate_leaderboards()
+    return len(batch)
 
 
-def increment_skips_cast(username: str):
-    """Increment cast skips counts for a username in both SQLite and Redis."""
-    if not username or username.lower() == "admin":
-        return
+async def stats_writer():
+    """Background task that flushes buffered stat events every STATS_FLUSH_INTERVAL seconds."""
+    logger.info("Stats writer started.")
+    while True:
+        await asyncio.sleep(STATS_FLUSH_INTERVAL)
+        await asyncio.to_thread(flush_stats)
 
-    # 1. Update SQLite (All-Time)
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO skips_cast (username, count) VALUES (?, 1) ON CONFLICT(username) DO UPDATE SET count = count + 1",
-            (username,),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed to increment SQLite skips_cast for %s: %s", username, e)
 
-    # 2. Update Redis (Session)
-    try:
-        client = get_redis_queue_client()
-        client.zincrby("stats:skips_cast:session", 1, username)
-    except Exception as e:
-        logger.warning("Failed to increment Redis skips_cast for %s: %s", username, e)
+def _decode(value) -> str | None:
+    return value.decode("utf-8") if isinstance(value, bytes) else value if isinstance(value, str) else None
+
 
+def _increment(event_type: str, username: str, track_key=None):
+    """Record one stat event for a username without touching the disk.
 
-def increment_skips_received(username: str):
-    """Increment skips received counts for a username in both SQLite and Redis."""
+    The event is buffered for stats_writer; the session count goes straight to Redis, in the same
+    round trip that reads the current session id.
+    """
     if not username or username.lower() == "admin":
         return
 
-    # 1. Update SQLite (All-Time)
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO skips_received (username, count) VALUES (?, 1) ON CONFLICT(username) DO UPDATE SET count = count + 1",
-            (username,),
-        )
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.warning("Failed to increment SQLite skips_received for %s: %s", username, e)
-
-    # 2. Update Redis (Session)
+    # 1. Update Redis (Session)
+    session_id = None
     try:
         client = get_redis_queue_client()
-        client.zincrby("stats:skips_received:session", 1, username)
+        pipe = client.pipeline()
+        pipe.zincrby(f"stats:{event_type}:session", 1, username)
+        pipe.incr(LEADERBOARDS_VERSION_KEY)
+        pipe.set(SESSION_ID_KEY, uuid.uuid4().hex, nx=True)
+        pipe.get(SESSION_ID_KEY)
+        session_id = _decode(pipe.execute()[-1])
     except Exception as e:
-        logger.warning("Failed to increment Redis skips_received for %s: %s", username, e)
+        logger.warning("Failed to increment Redis %s for %s: %s", event_type, username, e)
+
+    # 2. Buffer SQLite (Events and All-Time)
+    track_key = str(track_key) if track_key is not None else None
+    with _pending_lock:
+        _pending.append((username, event_type, track_key, time.time(), session_id))
+
+
+def increment_adds(username: str, track_key=None):
+    """Record that a username added a track, in both SQLite and Redis."""
+    _increment("adds", username, track_key)
+
+
+def increment_skips_cast(username: str, track_key=None):
+    """Record that a username voted to skip a track, in both SQLite and Redis."""
+    _increment("skips_cast", username, track_key)
+
+
+def increment_skips_received(username: str, track_key=None):
+    """Record that a track a username added was skipped, in both SQLite and Redis."""
+    _increment("skips_received", username, track_key)
 
 
 def clear_session_stats():
-    """Clear all session metrics in Redis."""
+    """Clear all session metrics in Redis and start a new session for stat events."""
     try:
         client = get_redis_queue_client()
-        client.delete("stats:adds:session", "stats:skips_cast:session", "stats:skips_received:session")
+        pipe = client.pipeline()
+        pipe.delete(*(f"stats:{event_type}:session" for event_type in STAT_TYPES))
+        pipe.set(SESSION_ID_KEY, uuid.uuid4().hex)
+        pipe.incr(LEADERBOARDS_VERSION_KEY)
+        pipe.execute()
         logger.info("Session stats have been cleared in Redis.")
     except Exception as e:
         logger.warning("Failed to clear session stats in Redis: %s", e)
 
 
-def _inject_roles(stats_dict: dict) -> dict:
-    """Helper to inject role names for usernames in leaderboards."""
+def set_user_role(name: str, role: str):
+    """Remember the role a username registered with, for labelling leaderboard entries.
+
+    The leaderboard caches only go stale when the role changes, not on every reconnect.
+    """
     try:
         client = get_redis_queue_client()
-        roles_bytes = client.hgetall("stats:user_roles")
-        roles = {
-            (k.decode("utf-8") if isinstance(k, bytes) else k): (v.decode("utf-8") if isinstance(v, bytes) else v)
-            for k, v in roles_bytes.items()
-        }
-    except Exception:
-        roles = {}
-
-    for cat in ["adds", "skips_cast", "skips_received"]:
-        for item in stats_dict[cat]:
+        if _decode(client.hget(USER_ROLES_KEY, name)) == role:
+            return
+        pipe = client.pipeline()
+        pipe.hset(USER_ROLES_KEY, name, role)
+        pipe.incr(LEADERBOARDS_VERSION_KEY)
+        pipe.execute()
+    except Exception as e:
+        logger.debug("Failed to store the role for %s: %s", name, e)
+
+
+def invalidate_leaderboards():
+    """Mark every worker's cached leaderboards as stale."""
+    try:
+        get_redis_queue_client().incr(LEADERBOARDS_VERSION_KEY)
+    except Exception as e:
+        logger.debug("Failed to invalidate cached leaderboards: %s", e)
+
+
+def _inject_roles(stats_dict: dict, roles: dict) -> dict:
+    """Helper to inject role names for usernames in leaderboards."""
+    for cat in STAT_TYPES:
+        for item in stats_dict.get(cat, []):
             username = item["username"]
             user_lower = username.lower()
             role = roles.get(username)
@@ -159,48 +302,155 @@ def _inject_roles(stats_dict: dict) -> dict:
     return stats_dict
 
 
-def get_session_stats() -> dict:
-    """Fetch sorted session leaderboard rankings from Redis."""
-    stats = {"adds": [], "skips_cast": [], "skips_received": []}
+def _read_session(limit: int) -> tuple[dict, dict, str | None]:
+    """Read the session top-N for every stat type, the user roles and the stats version.
+
+    All of it comes back from one pipelined round trip to Redis.
+
+    Returns:
+        (session leaderboards without roles, roles by username, stats version).
+    """
+    stats = {event_type: [] for event_type in STAT_TYPES}
     try:
-        client = get_redis_queue_client()
-        
-        # Redis returns a list of tuples (member, score)
-        adds = client.zrevrange("stats:adds:session", 0, -1, withscores=True)
-        stats["adds"] = [{"username": m.decode("utf-8") if isinstance(m, bytes) else m, "count": int(s)} for m, s in adds]
-        
-        skips_cast = client.zrevrange("stats:skips_cast:session", 0, -1, withscores=True)
-        stats["skips_cast"] = [{"username": m.decode("utf-8") if isinstance(m, bytes) else m, "count": int(s)} for m, s in skips_cast]
-        
-        skips_received = client.zrevrange("stats:skips_received:session", 0, -1, withscores=True)
-        stats["skips_received"] = [{"username": m.decode("utf-8") if isinstance(m, bytes) else m, "count": int(s)} for m, s in skips_received]
+        pipe = get_redis_queue_client().pipeline(transaction=False)
+        pipe.get(LEADERBOARDS_VERSION_KEY)
+        pipe.hgetall(USER_ROLES_KEY)
+        for event_type in STAT_TYPES:
+            pipe.zrevrange(f"stats:{event_type}:session", 0, limit - 1, withscores=True)
+        version, roles, *boards = pipe.execute()
     except Exception as e:
         logger.warning("Failed to fetch Redis session stats: %s", e)
-    
-    return _inject_roles(stats)
+        return stats, {}, None
 
+    for event_type, board in zip(STAT_TYPES, boards, strict=True):
+        # Redis returns a list of tuples (member, score)
+        stats[event_type] = [{"username": _decode(m), "count": int(s)} for m, s in board]
+    roles = {_decode(k): _decode(v) for k, v in roles.items()}
+    return stats, roles, _decode(version) or "0"
 
-def get_alltime_stats() -> dict:
-    """Fetch sorted all-time leaderboard rankings from SQLite."""
-    stats = {"adds": [], "skips_cast": [], "skips_received": []}
+
+def get_session_stats(limit: int = STATS_TOP_N) -> dict:
+    """Fetch the top session leaderboard rankings from Redis."""
+    stats, roles, _ = _read_session(limit)
+    return _inject_roles(stats, roles)
+
+
+def get_alltime_stats(limit: int = STATS_TOP_N, roles: dict | None = None) -> dict:
+    """Fetch the top all-time leaderboard rankings from SQLite."""
+    if roles is None:
+        try:
+            roles = {_decode(k): _decode(v) for k, v in get_redis_queue_client().hgetall(USER_ROLES_KEY).items()}
+        except Exception:
+            roles = {}
+    stats = {event_type: get_leaderboard(event_type, limit=limit)["entries"] for event_type in STAT_TYPES}
+    return _inject_roles(stats, roles)
+
+
+def get_leaderboards() -> dict:
+    """Fetch the session and all-time top-N leaderboards, from the shared cache when it is current.
+
+    A cache hit costs one Redis round trip. A miss builds both leaderboards from one pipelined
+    Redis read and the SQLite indexes, then caches them under the version read beforehand, so a
+    stat recorded while building leaves the new copy already stale. All-time counts trail the
+    session ones by up to STATS_FLUSH_INTERVAL; the writer's flush bumps the version again.
+
+    Returns:
+        {"session": ..., "all_time": ...}, each holding a list per stat type.
+    """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT username, count FROM adds ORDER BY count DESC")
-        stats["adds"] = [{"username": row[0], "count": row[1]} for row in cursor.fetchall()]
-        
-        cursor.execute("SELECT username, count FROM skips_cast ORDER BY count DESC")
-        stats["skips_cast"] = [{"username": row[0], "count": row[1]} for row in cursor.fetchall()]
-        
-        cursor.execute("SELECT username, count FROM skips_received ORDER BY count DESC")
-        stats["skips_received"] = [{"username": row[0], "count": row[1]} for row in cursor.fetchall()]
-        
-        conn.close()
+        cached, version = get_redis_queue_client().mget(LEADERBOARDS_CACHE_KEY, LEADERBOARDS_VERSION_KEY)
+        if cached:
+            entry = json.loads(cached)
+            if entry["version"] == (_decode(version) or "0"):
+                return entry["leaderboards"]
     except Exception as e:
-        logger.warning("Failed to fetch SQLite all-time stats: %s", e)
-        
-    return _inject_roles(stats)
+        logger.debug("Failed to read cached leaderboards: %s", e)
+
+    session, roles, version = _read_session(STATS_TOP_N)
+    leaderboards = {
+        "session": _inject_roles(session, roles),
+        "all_time": get_alltime_stats(STATS_TOP_N, roles),
+    }
+    if version is not None:
+        try:
+            entry = json.dumps({"version": version, "leaderboards": leaderboards})
+            get_redis_queue_client().set(LEADERBOARDS_CACHE_KEY, entry, ex=LEADERBOARDS_CACHE_TTL)
+        except Exception as e:
+            logger.debug("Failed to cache leaderboards: %s", e)
+    return leaderboards
+
+
+def _leaderboard_query(event_type: str, window: str) -> tuple[str, str, tuple] | None:
+    """Build the ranking and user-count queries for a leaderboard window.
+
+    Returns:
+        (ranking SQL, count SQL, parameters), or None if the window has no events to rank.
+
+    Raises:
+        ValueError: If window is not one of STATS_WINDOWS.
+    """
+    if window not in STATS_WINDOWS:
+        msg = f"Unknown stats window: {window}"
+        raise ValueError(msg)
+    if window == "all":
+        where, params = "event_type = ?", (event_type,)
+        return (
+            f"SELECT username, count FROM stat_totals WHERE {where} ORDER BY count DESC, username",  # noqa: S608
+            f"SELECT COUNT(*) FROM stat_totals WHERE {where}",  # noqa: S608
+            params,
+        )
+    if window == "session":
+        session_id = None
+        try:
+            session_id = _decode(get_redis_queue_client().get(SESSION_ID_KEY))
+        except Exception as e:
+            logger.warning("Failed to read the stats session id from Redis: %s", e)
+        if session_id is None:
+            return None
+        where, params = "session_id = ? AND event_type = ?", (session_id, event_type)
+    else:
+        where, params = "event_type = ? AND occurred_at >= ?", (event_type, time.time() - STATS_WINDOWS[window])
+    return (
+        (
+            f"SELECT username, COUNT(*) AS count FROM stat_events WHERE {where} "  # noqa: S608
+            "GROUP BY username ORDER BY count DESC, username"
+        ),
+        f"SELECT COUNT(DISTINCT username) FROM stat_events WHERE {where}",  # noqa: S608
+        params,
+    )
+
+
+def get_leaderboard(event_type: str, window: str = "all", limit: int | None = None, offset: int = 0) -> dict:
+    """Fetch one page of a leaderboard from SQLite.
+
+    All-time rankings walk the stat_totals count index; windowed ones aggregate the matching
+    range of the stat_events time or session index. Ties are ordered by username so pages
+    never overlap. Events still buffered for stats_writer show up after its next flush.
+
+    Returns:
+        The page of {"username", "count"} entries and the total number of ranked users.
+
+    Raises:
+        ValueError: If event_type or window is unknown.
+    """
+    if event_type not in STAT_TYPES:
+        msg = f"Unknown stat type: {event_type}"
+        raise ValueError(msg)
+    page = {"entries": [], "total": 0}
+    query = _leaderboard_query(event_type, window)
+    if query is None:
+        return page
+    ranking, count, params = query
+
+    try:
+        with read_only_database() as conn:
+            rows = conn.execute(f"{ranking} LIMIT ? OFFSET ?", (*params, -1 if limit is None else limit, offset))
+            page["entries"] = [{"username": row[0], "count": row[1]} for row in rows.fetchall()]
+            page["total"] = conn.execute(count, params).fetchone()[0]
+    except Exception as e:
+        logger.warning("Failed to fetch SQLite %s leaderboard for %s: %s", window, event_type, e)
+    return page
+
 
 # Initialize database on module import
 init_db()
@@ -43,6 +43,26 @@ def reset_player_cache():
     plex._cached_active_player_name = None
 
 
+@pytest.fixture(autouse=True)
+def reset_resync_state():
+    """Forget shared Plexamp resync results so one test's check is never reused by the next."""
+    from backend.services import plex
+    plex._resync_task = None
+    plex._last_resync_at = None
+    yield
+    plex._resync_task = None
+    plex._last_resync_at = None
+
+
+@pytest.fixture(autouse=True)
+def reset_track_cache():
+    """Drop prefetched Plex track objects so they never leak between tests."""
+    from backend.services import plex
+    plex._track_cache.clear()
+    yield
+    plex._track_cache.clear()
+
+
 @pytest.fixture
 def mock_plex_track():
     """Create a mock Plex Track object with test attributes.
@@ -69,6 +89,8 @@ def mock_redis(mocker, mock_settings):
     mock_redis_queue = MagicMock()
     mock_redis_cache = MagicMock()
     mock_redis_cache.get.return_value = None
+    # Transactional pipelines record their commands on the client mock itself
+    mock_redis_queue.pipeline.return_value = mock_redis_queue
 
     mocker.patch(
         "backend.services.redis_client.get_redis_queue_client",
@@ -0,0 +1,88 @@
+"""Tests for the async artwork proxy."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from backend.config import settings
+from backend.services import artwork
+
+
+@pytest.fixture(autouse=True)
+def art_client():
+    """Route the shared art client through an in-memory transport."""
+
+    def handler(request):
+        if request.url.path == "/missing":
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"x" * (artwork.ART_CHUNK_SIZE + 10))
+
+    artwork.get_art_client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    artwork._host_slots.clear()
+    artwork._art_cache.clear()
+    yield
+    del artwork.get_art_client.client
+    artwork._host_slots.clear()
+    artwork._art_cache.clear()
+
+
+async def _drain(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_open_art_stream_releases_slot():
+    """The image is relayed in large chunks and the host slot is returned afterwards."""
+    stream = await artwork.open_art_stream("http://plex:32400/thumb")
+    body = await _drain(stream)
+
+    assert len(body) == artwork.ART_CHUNK_SIZE + 10
+    assert artwork._host_slots["plex:32400"]._value == artwork.MAX_CONNECTIONS_PER_HOST
+
+
+@pytest.mark.asyncio
+async def test_open_art_stream_not_found_releases_slot():
+    """A Plex error becomes a 404 without leaking the slot."""
+    with pytest.raises(HTTPException) as exc:
+        await artwork.open_art_stream("http://plex:32400/missing")
+
+    assert exc.value.status_code == 404
+    assert artwork._host_slots["plex:32400"]._value == artwork.MAX_CONNECTIONS_PER_HOST
+
+
+@pytest.mark.asyncio
+async def test_open_art_stream_sheds_load_when_host_saturated(mocker):
+    """Requests that cannot get a host slot in time are rejected with a 503."""
+    mocker.patch.object(artwork, "ART_QUEUE_TIMEOUT", 0.05)
+    streams = [
+        await artwork.open_art_stream("http://plex:32400/thumb")
+        for _ in range(artwork.MAX_CONNECTIONS_PER_HOST)
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        await artwork.open_art_stream("http://plex:32400/thumb")
+    assert exc.value.status_code == 503
+
+    # Other hosts are unaffected by the saturated one
+    other = await artwork.open_art_stream("http://friend:32400/thumb")
+    await _drain(other)
+
+    await asyncio.gather(*(_drain(s) for s in streams))
+    assert artwork._host_slots["plex:32400"]._value == artwork.MAX_CONNECTIONS_PER_HOST
+
+
+@pytest.mark.asyncio
+async def test_warm_art_serves_later_requests_from_memory(mocker):
+    """Prefetched art is returned without resolving or downloading it again."""
+    mocker.patch.object(settings, "testing", False)
+    mock_resolve = mocker.patch(
+        "backend.services.artwork.resolve_art_url", return_value="http://plex:32400/thumb"
+    )
+
+    await artwork.warm_art(7, "track", "server-a")
+    stream = await artwork.fetch_art_stream(7, "track", server_id="server-a")
+
+    assert len(await _drain(stream)) == artwork.ART_CHUNK_SIZE + 10
+    mock_resolve.assert_called_once()
@@ -0,0 +1,258 @@
+"""Multi-worker tests for the Redis WebSocket backplane.
+
+These start two real uvicorn workers against the Redis at TUNEBOX_TEST_REDIS_URL
+(redis://localhost:6379 by default) and are skipped when it is unreachable. Point it at a
+scratch instance: the tests overwrite the playback clock and now-playing keys.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import redis
+from websockets.asyncio.client import connect
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+TEST_REDIS_URL = os.environ.get("TUNEBOX_TEST_REDIS_URL", "redis://localhost:6379")
+STATE_KEYS = (
+    "ws:clients",
+    "ws:skip_votes",
+    "ws:client_weights",
+    "ws:vote_totals",
+    "ws:event_log",
+    "orchestrator:leader",
+    "playback_clock",
+)
+
+
+@pytest.fixture(scope="module")
+def redis_url():
+    """Provide the URL of a reachable local Redis, or skip."""
+    client = redis.StrictRedis.from_url(TEST_REDIS_URL, socket_connect_timeout=0.5)
+    try:
+        client.ping()
+    except redis.exceptions.RedisError:
+        pytest.skip(f"No Redis reachable at {TEST_REDIS_URL}")
+    client.delete(*STATE_KEYS)
+    yield TEST_REDIS_URL
+    client.delete(*STATE_KEYS)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, deadline: float):
+    while True:
+        try:
+            if httpx.get(f"http://{url}/", timeout=0.5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            pytest.fail(f"Worker at {url} did not start")
+        time.sleep(0.2)
+
+
+@pytest.fixture(scope="module")
+def workers(redis_url, tmp_path_factory):
+    """Run two uvicorn workers that share the Redis backplane and a scratch stats database.
+
+    Yields:
+        The base URLs of both workers.
+    """
+    env = {
+        **os.environ,
+        "REDIS_URL": redis_url,
+        "TESTING": "true",
+        "ADMIN_TOKEN": "backplane-test",
+        "STATS_DB_PATH": str(tmp_path_factory.mktemp("stats") / "stats.db"),
+    }
+    processes = []
+    urls = []
+    for _ in range(2):
+        port = _free_port()
+        processes.append(
+            subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+                cwd=REPO_ROOT,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        )
+        urls.append(f"127.0.0.1:{port}")
+
+    deadline = time.monotonic() + 20
+    for url in urls:
+        _wait_until_up(url, deadline)
+
+    yield urls
+
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.wait(timeout=10)
+
+
+async def _receive_until(ws, predicate, within: float = 5.0) -> dict:
+    """Read frames until one matches predicate, for up to within seconds.
+
+    Returns:
+        The first matching frame.
+    """
+    async with asyncio.timeout(within):
+        while True:
+            frame = json.loads(await ws.recv())
+            if predicate(frame):
+                return frame
+
+
+@pytest.mark.asyncio
+async def test_events_reach_sockets_on_other_workers(workers):
+    """A queue broadcast triggered on one worker is delivered to sockets on the other."""
+    worker_a, worker_b = workers
+    async with connect(f"ws://{worker_b}/ws") as listener:
+        await listener.send(json.dumps({"type": "queue_update"}))
+        await _receive_until(listener, lambda frame: frame.get("type") == "queue_update")
+
+        async with connect(f"ws://{worker_a}/ws") as trigger:
+            await trigger.send(json.dumps({"type": "queue_update"}))
+            await _receive_until(trigger, lambda frame: frame.get("type") == "queue_update")
+
+        # Worker B's own snapshot was already consumed, so this one came over the backplane
+        frame = await _receive_until(listener, lambda frame: frame.get("type") == "queue_update")
+        assert "queue" in frame
+
+
+@pytest.mark.asyncio
+async def test_skip_votes_and_registry_span_workers(workers):
+    """Clients on different workers are counted together and see each other's votes."""
+    worker_a, worker_b = workers
+    async with (
+        connect(f"ws://{worker_a}/ws") as guest_a,
+        connect(f"ws://{worker_b}/ws") as guest_b,
+    ):
+        await guest_a.send(json.dumps({"type": "client_control", "client_id": "backplane-a", "name": "Phone A"}))
+        await _receive_until(guest_a, lambda frame: frame.get("type") == "skip_vote_update")
+        await guest_b.send(json.dumps({"type": "client_control", "client_id": "backplane-b", "name": "Phone B"}))
+
+        status = await _receive_until(guest_a, lambda frame: frame.get("status", {}).get("total") == 2)
+        assert status["status"]["votes"] == 0
+
+        await guest_a.send(json.dumps({"type": "cast_skip_vote", "client_id": "backplane-a", "vote": True}))
+        status = await _receive_until(guest_b, lambda frame: frame.get("status", {}).get("votes") == 1)
+        assert status["status"]["total"] == 2
+        assert status["status"]["voted_ids"] == ["backplane-a"]
+
+        async with httpx.AsyncClient() as http:
+            response = await http.get(
+                f"http://{worker_b}/api/auth/clients", headers={"x-admin-token": "backplane-test"}
+            )
+        assert {client["client_id"] for client in response.json()} >= {"backplane-a", "backplane-b"}
+
+
+@pytest.mark.asyncio
+async def test_renamed_client_is_still_dropped_by_its_own_worker(workers, redis_url):
+    """Renaming a client through another worker keeps its owner, so disconnecting still frees its weight."""
+    worker_a, worker_b = workers
+    queue_db = redis.StrictRedis.from_url(redis_url, db=0, decode_responses=True)
+    total_before = int(queue_db.hget("ws:vote_totals", "total") or 0)
+
+    async with connect(f"ws://{worker_b}/ws") as guest:
+        await guest.send(json.dumps({"type": "client_control", "client_id": "backplane-rename", "name": "Phone"}))
+        await _receive_until(guest, lambda frame: frame.get("status", {}).get("total") == total_before + 1)
+        owner = json.loads(queue_db.hget("ws:clients", "backplane-rename"))["worker"]
+
+        async with httpx.AsyncClient() as http:
+            response = await http.post(
+                f"http://{worker_a}/api/auth/clients/backplane-rename/rename",
+                json={"name": "Kitchen"},
+                headers={"x-admin-token": "backplane-test"},
+            )
+        assert response.status_code == 200
+        await _receive_until(guest, lambda frame: frame.get("type") == "rename_client")
+        entry = json.loads(queue_db.hget("ws:clients", "backplane-rename"))
+        assert (entry["name"], entry["worker"]) == ("Kitchen", owner)
+
+    async with asyncio.timeout(5):
+        while queue_db.hexists("ws:clients", "backplane-rename"):
+            await asyncio.sleep(0.1)
+    assert int(queue_db.hget("ws:vote_totals", "total") or 0) == total_before
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_from_last_seq_on_another_worker(workers):
+    """A client that reconnects with its last seq is replayed what it missed instead of a snapshot."""
+    worker_a, worker_b = workers
+    async with connect(f"ws://{worker_a}/ws") as listener:
+        await listener.send(json.dumps({"type": "queue_update"}))
+        frame = await _receive_until(listener, lambda frame: frame.get("type") == "queue_update")
+        last_seq = frame["seq"]
+
+    async with connect(f"ws://{worker_a}/ws") as trigger:
+        await trigger.send(json.dumps({"type": "queue_update"}))
+        missed = await _receive_until(trigger, lambda frame: frame.get("type") == "queue_update")
+
+    async with connect(f"ws://{worker_b}/ws") as resumed:
+        await resumed.send(json.dumps({"type": "queue_update", "last_seq": last_seq}))
+        frame = await _receive_until(resumed, lambda frame: frame.get("type") == "queue_update")
+        assert frame["seq"] == missed["seq"]
+        with pytest.raises(TimeoutError):
+            await _receive_until(resumed, lambda frame: frame.get("type") == "queue_update", within=0.5)
+
+    async with connect(f"ws://{worker_b}/ws") as stale:
+        await stale.send(json.dumps({"type": "queue_update", "last_seq": "1-0"}))
+        frame = await _receive_until(stale, lambda frame: frame.get("type") == "queue_update")
+        assert frame["seq"] not in {last_seq, missed["seq"]}
+
+
+@pytest.mark.asyncio
+async def test_single_leader_and_replicated_clock(workers, redis_url):
+    """Exactly one worker holds the orchestrator lease, and both report the leader's clock."""
+    queue_db = redis.StrictRedis.from_url(redis_url, db=0, decode_responses=True)
+    cache_db = redis.StrictRedis.from_url(redis_url, db=1, decode_responses=True)
+
+    async with asyncio.timeout(10):
+        while not queue_db.get("orchestrator:leader"):
+            await asyncio.sleep(0.2)
+    leader = queue_db.get("orchestrator:leader")
+
+    queue_db.set(
+        "playback_clock",
+        json.dumps({
+            "track_name": "Shared Song",
+            "state": "playing",
+            "accumulated_elapsed": 30.0,
+            "last_resume_time": time.time(),
+            "playback_active": False,
+        }),
+    )
+    cache_db.set("now_playing", json.dumps({"item_id": 1, "title": "Shared Song", "artist": "A", "duration": 180}))
+    tracks = []
+    try:
+        # The leader owns the clock and adopts an outside write on its next orchestrator tick
+        async with httpx.AsyncClient() as http, asyncio.timeout(5):
+            for worker in workers:
+                while True:
+                    track = (await http.get(f"http://{worker}/api/music/now-playing")).json()["current_track"]
+                    if track["track_state"] == "playing":
+                        break
+                    await asyncio.sleep(0.2)
+                tracks.append(track)
+    finally:
+        cache_db.delete("now_playing")
+
+    for track in tracks:
+        assert track["title"] == "Shared Song"
+        assert 30.0 <= track["elapsed_time"] < 35.0
+    assert queue_db.get("orchestrator:leader") == leader
@@ -0,0 +1,179 @@
+"""Tests for the concurrent WebSocket broadcast hub."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from backend import broadcast as hub
+
+
+class FakeSocket:
+    """Minimal stand-in for a WebSocket that records frames after an optional delay."""
+
+    def __init__(self, delay=0.0, fail=False):
+        """Create a socket that takes delay seconds per frame, or fails every send."""
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed = False
+
+    async def send_text(self, payload):
+        """Record a frame after the delay, or raise like a dropped connection."""
+        if self.fail:
+            msg = "socket gone"
+            raise RuntimeError(msg)
+        await asyncio.sleep(self.delay)
+        self.sent.append(payload)
+
+    async def send_bytes(self, payload):
+        """Record a binary frame the same way as a text one."""
+        await self.send_text(payload)
+
+    async def close(self):
+        """Mark the socket closed."""
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_broadcast_serializes_once(mocker):
+    """Every socket receives the same payload string produced by a single json.dumps call."""
+    spy = mocker.spy(hub.json, "dumps")
+    group = {str(i): FakeSocket() for i in range(20)}
+
+    delivered = await hub.broadcast({"type": "queue_update", "queue": []}, group)
+
+    assert delivered == 20
+    assert spy.call_count == 1
+    payloads = {ws.sent[0] for ws in group.values()}
+    assert len(payloads) == 1
+    assert json.loads(payloads.pop())["type"] == "queue_update"
+
+
+@pytest.mark.asyncio
+async def test_slow_and_broken_sockets_are_dropped_without_delaying_others():
+    """A stalled socket costs at most the send timeout and is evicted along with failed ones."""
+    fast = FakeSocket()
+    slow = FakeSocket(delay=5)
+    broken = FakeSocket(fail=True)
+    queue_group = {"fast": fast, "slow": slow}
+    control_group = {"broken": broken}
+
+    start = time.perf_counter()
+    delivered = await hub.broadcast({"message": "hi"}, queue_group, control_group, send_timeout=0.05)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(0)
+
+    assert delivered == 1
+    assert elapsed < 1
+    assert list(queue_group) == ["fast"]
+    assert control_group == {}
+    assert slow.closed
+    assert broken.closed
+
+
+@pytest.mark.asyncio
+async def test_outbox_broadcast_does_not_wait_on_the_network():
+    """Sockets with an outbox get frames queued, and the writer delivers them later."""
+    ws = FakeSocket(delay=0.05)
+    outbox = hub.attach_outbox(ws)
+    try:
+        start = time.perf_counter()
+        delivered = await hub.broadcast({"n": 1}, {"a": ws})
+        assert delivered == 1
+        assert time.perf_counter() - start < 0.01
+        assert ws.sent == []
+
+        await asyncio.sleep(0.1)
+        assert [json.loads(frame) for frame in ws.sent] == [{"n": 1}]
+        assert outbox.size == 0
+    finally:
+        hub.detach_outbox(ws)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_outbox_coalesces_pending_frames_by_kind():
+    """Only the newest pending frame per coalesce key survives, ordinary frames are all kept."""
+    ws = FakeSocket()
+    outbox = hub.attach_outbox(ws)
+    try:
+        for i in range(5):
+            outbox.put(json.dumps({"tick": i}), coalesce="now_playing")
+            outbox.put(json.dumps({"queue": i}), coalesce="queue_update")
+        outbox.put(json.dumps({"message": "pong"}))
+        outbox.put(json.dumps({"message": "pong"}))
+
+        assert len(outbox.frames) == 4
+        await asyncio.sleep(0.01)
+        assert [json.loads(frame) for frame in ws.sent] == [
+            {"tick": 4},
+            {"queue": 4},
+            {"message": "pong"},
+            {"message": "pong"},
+        ]
+    finally:
+        hub.detach_outbox(ws)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_outbox_evicts_clients_that_stay_over_budget():
+    """A stalled client is disconnected once it stays over budget past the grace period."""
+    ws = FakeSocket(delay=10)
+    outbox = hub.Outbox(ws, max_frames=2, grace=0.05)
+    hub._outboxes[ws] = outbox
+    group = {"stalled": ws}
+    try:
+        for i in range(3):
+            assert await hub.broadcast({"n": i}, group) == 1
+        assert outbox.over_budget_since is not None
+
+        await asyncio.sleep(0.1)
+        assert await hub.broadcast({"n": 3}, group) == 0
+        await asyncio.sleep(0)
+
+        assert outbox.closed
+        assert group == {}
+        assert ws.closed
+    finally:
+        hub.detach_outbox(ws)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_msgpack_connections_get_binary_frames():
+    """A connection that negotiated msgpack receives binary frames; the others keep JSON text."""
+    msgpack = pytest.importorskip("msgpack")
+    text_ws, binary_ws = FakeSocket(), FakeSocket()
+    hub.attach_outbox(text_ws)
+    hub.attach_outbox(binary_ws)
+    try:
+        assert hub.negotiate_encoding(binary_ws, "msgpack") == "msgpack"
+        assert hub.negotiate_encoding(text_ws, "carrier-pigeon") == "json"
+
+        message = {"type": "queue_update", "queue": [{"item_id": 1, "title": "Song"}]}
+        assert await hub.broadcast(message, {"text": text_ws, "binary": binary_ws}) == 2
+        await asyncio.sleep(0.01)
+
+        assert json.loads(text_ws.sent[0]) == message
+        assert isinstance(binary_ws.sent[0], bytes)
+        assert msgpack.unpackb(binary_ws.sent[0]) == message
+    finally:
+        hub.detach_outbox(text_ws)
+        hub.detach_outbox(binary_ws)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_msgpack_falls_back_to_json_when_not_installed(mocker):
+    """Without msgpack installed a client asking for it is sent JSON text."""
+    mocker.patch.object(hub, "msgpack", None)
+    ws = FakeSocket()
+    hub.attach_outbox(ws)
+    try:
+        assert hub.negotiate_encoding(ws, "msgpack") == "json"
+    finally:
+        hub.detach_outbox(ws)
+        await asyncio.sleep(0)
@@ -0,0 +1,86 @@
+"""Tests for background mood enrichment of queue entries."""
+
+import asyncio
+import contextlib
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import enrichment
+from backend.services.redis import add_to_queue_redis
+
+
+def _mood(tag):
+    m = MagicMock()
+    m.tag = tag
+    return m
+
+
+def test_resolve_moods_cascades_to_album_and_caches(mocker):
+    """Album moods are used when the track has none, and cached per album."""
+    track = MagicMock()
+    track.moods = []
+    track.parentRatingKey = 900
+    track.album.return_value.moods = [_mood("Energetic"), _mood("Happy")]
+    mocker.patch("backend.services.enrichment.load_queue_track", return_value=track)
+    mocker.patch("backend.services.enrichment.get_cached_data", return_value=None)
+    mock_cache = mocker.patch("backend.services.enrichment.cache_data")
+
+    moods = enrichment.resolve_moods({"item_id": 1, "server_id": None})
+
+    assert moods == ["Energetic", "Happy"]
+    mock_cache.assert_called_once_with(
+        "moods:primary:album:900", ["Energetic", "Happy"], ttl=enrichment.MOOD_CACHE_TTL
+    )
+    track.artist.assert_not_called()
+
+
+def test_resolve_moods_uses_cached_parent(mocker):
+    """A cached album lookup avoids the Plex round trip entirely."""
+    track = MagicMock()
+    track.moods = []
+    track.parentRatingKey = 900
+    mocker.patch("backend.services.enrichment.load_queue_track", return_value=track)
+    mocker.patch("backend.services.enrichment.get_cached_data", return_value=["Chill"])
+
+    assert enrichment.resolve_moods({"item_id": 1}) == ["Chill"]
+    track.album.assert_not_called()
+
+
+def test_add_to_queue_defers_parent_moods(mock_redis, mock_plex_track, mocker):
+    """Adding a track without moods writes it immediately and schedules enrichment."""
+    mocker.patch("backend.services.redis.is_song_in_queue", return_value=False)
+    mock_enqueue = mocker.patch("backend.services.enrichment.enqueue_mood_enrichment")
+    mock_redis_queue, _ = mock_redis
+    mock_redis_queue.lrange.return_value = []
+    mock_plex_track.moods = []
+
+    add_to_queue_redis(mock_plex_track)
+
+    mock_redis_queue.rpush.assert_called_once()
+    mock_plex_track.album.assert_not_called()
+    mock_enqueue.assert_called_once()
+    assert mock_enqueue.call_args[0][0]["item_id"] == "12345"
+
+
+@pytest.mark.asyncio
+async def test_worker_sleeps_until_an_entry_is_queued_from_another_thread(mocker):
+    """The worker wakes for an entry queued off the event loop and rebroadcasts the queue once."""
+    mocker.patch("backend.services.enrichment.resolve_moods", return_value=["Chill"])
+    mock_update = mocker.patch("backend.services.enrichment.update_queue_entry", return_value=True)
+    mock_send = mocker.patch("backend.websockets.send_queue")
+    worker = asyncio.create_task(enrichment.mood_enrichment_worker())
+    await asyncio.sleep(0.05)
+    mock_update.assert_not_called()
+
+    await asyncio.to_thread(enrichment.enqueue_mood_enrichment, {"item_id": 7, "server_id": "s1"})
+    for _ in range(100):
+        if mock_send.await_count:
+            break
+        await asyncio.sleep(0.01)
+
+    worker.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await worker
+    mock_update.assert_called_once_with(7, "s1", moods=["Chill"])
+    mock_send.assert_awaited_once()
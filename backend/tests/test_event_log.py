@@ -0,0 +1,39 @@
+"""Tests for the sequence-numbered event log that lets reconnecting clients resume."""
+
+from collections import deque
+
+import pytest
+import redis
+
+from backend import event_log
+from backend.event_log import append_event, events_since
+
+
+@pytest.fixture(autouse=True)
+def local_log(mocker):
+    """Run against an empty per-worker log with Redis unreachable."""
+    mocker.patch("backend.event_log.get_redis_queue_client", side_effect=redis.exceptions.ConnectionError)
+    mocker.patch.object(event_log, "_local_log", deque(maxlen=3))
+
+
+def test_replays_only_missed_events_for_the_group():
+    """Events after the client's seq come back in order, filtered to its group, with their seqs."""
+    first = append_event({"type": "queue_update", "queue": [1]}, ("queue_update",), "queue_update")
+    append_event({"type": "skip_vote_update"}, ("client_control", "music_control"))
+    last = append_event({"type": "queue_update", "queue": [1, 2]}, ("queue_update",), "queue_update")
+
+    missed = events_since(first, "queue_update")
+
+    assert missed == [({"type": "queue_update", "queue": [1, 2], "seq": last}, "queue_update")]
+    assert events_since(last, "queue_update") == []
+
+
+def test_seq_outside_the_window_needs_snapshots():
+    """A trimmed, unknown or foreign seq cannot be resumed from."""
+    first = append_event({"type": "queue_update"}, ("queue_update",))
+    for _ in range(3):
+        append_event({"type": "queue_update"}, ("queue_update",))
+
+    assert events_since(first, "queue_update") is None
+    assert events_since("not-a-seq", "queue_update") is None
+    assert events_since("1700000000000-0", "queue_update") is None
@@ -0,0 +1,78 @@
+"""Tests for the Server-Sent Events feed for read-only displays."""
+
+import asyncio
+import json
+import zlib
+from collections import deque
+
+import pytest
+import redis
+
+from backend import event_log
+from backend.event_log import append_event
+from backend.routers.events import event_stream
+from backend.websockets import active_connections, fan_out
+
+
+@pytest.fixture(autouse=True)
+def local_log(mocker):
+    """Log events on this worker only, with Redis unreachable."""
+    mocker.patch("backend.event_log.get_redis_queue_client", side_effect=redis.exceptions.ConnectionError)
+    mocker.patch.object(event_log, "_local_log", deque(maxlen=10))
+
+
+@pytest.fixture
+def mock_queue():
+    """Provide a small queue snapshot."""
+    return [{"item_id": 1, "title": "Song 1"}, {"item_id": 2, "title": "Song 2"}]
+
+
+def _events(text: str) -> list[dict]:
+    """Parse the data lines of SSE text, keeping each event's id."""
+    events = []
+    for block in text.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "data" in fields:
+            events.append({"id": fields.get("id"), **json.loads(fields["data"])})
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_live_events_each_decodable(mocker, mock_queue):
+    """A gzip stream yields a queue snapshot, then each broadcast as soon as it happens."""
+    mocker.patch("backend.routers.events.get_redis_queue", return_value=mock_queue)
+    stream = event_stream(["queue_update"], compress=True)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        snapshot = _events(decompressor.decompress(await anext(stream)).decode())
+        assert [event["queue"] for event in snapshot] == [mock_queue]
+        assert len(active_connections["queue_update"]) == 1
+
+        pending = asyncio.create_task(anext(stream))
+        await asyncio.sleep(0.01)
+        await fan_out({"type": "queue_update", "queue": []}, "queue_update")
+        live = _events(decompressor.decompress(await pending).decode())
+
+        assert live[0]["queue"] == []
+        assert live[0]["id"] == live[0]["seq"]
+    finally:
+        await stream.aclose()
+    assert active_connections["queue_update"] == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_from_last_event_id(mocker):
+    """A display reconnecting with Last-Event-ID gets only the missed events for its channels."""
+    get_queue = mocker.patch("backend.routers.events.get_redis_queue")
+    first = append_event({"type": "queue_update", "queue": [1]}, ("queue_update",))
+    append_event({"type": "skip_vote_update"}, ("client_control", "music_control"))
+    missed = append_event({"type": "queue_update", "queue": [1, 2]}, ("queue_update",))
+
+    stream = event_stream(["queue_update"], last_event_id=first)
+    try:
+        events = _events((await anext(stream)).decode())
+    finally:
+        await stream.aclose()
+
+    assert [(event["id"], event["queue"]) for event in events] == [(missed, [1, 2])]
+    get_queue.assert_not_called()
@@ -0,0 +1,75 @@
+"""Tests for streaming play history and stat event exports."""
+
+import csv
+import io
+import json
+import sqlite3
+
+import pytest
+
+from backend.services import export, history, stats
+
+
+@pytest.fixture(autouse=True)
+def export_db(tmp_path, monkeypatch, mock_redis):
+    """Fill a fresh stats database with five stat events an hour apart.
+
+    Yields:
+        The path of the database file.
+    """
+    db_path = tmp_path / "stats.db"
+    monkeypatch.setattr(stats, "DB_PATH", str(db_path))
+    monkeypatch.setattr(stats, "_connection", None)
+    stats._pending.clear()
+    stats.init_db()
+    history.init_history_db()
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            "INSERT INTO stat_events (username, event_type, track_key, occurred_at, session_id) "
+            "VALUES (?, 'adds', ?, ?, 's1')",
+            [(f"guest{n}", str(n), 1000.0 + n * 3600) for n in range(5)],
+        )
+    yield db_path
+    stats.close_db()
+
+
+def test_ndjson_export_streams_a_time_range_in_batches(monkeypatch):
+    """Rows in [since, until) come out in time order, one chunk per batch of rows."""
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+
+    chunks = list(export.export_ndjson("events", since=1000.0 + 3600, until=1000.0 + 4 * 3600))
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert [row["username"] for row in rows] == ["guest1", "guest2", "guest3"]
+    assert rows[0] == {
+        "id": 2,
+        "username": "guest1",
+        "event_type": "adds",
+        "track_key": "1",
+        "occurred_at": 4600.0,
+        "session_id": "s1",
+    }
+
+
+def test_csv_export_endpoint_is_admin_only(monkeypatch):
+    """The export endpoint streams CSV with a header row, but only with the admin token."""
+    from fastapi.testclient import TestClient  # noqa: PLC0415
+
+    from backend.config import settings  # noqa: PLC0415
+    from backend.main import app  # noqa: PLC0415
+
+    monkeypatch.setattr(settings, "admin_token", "test_admin_token")
+    client = TestClient(app)
+
+    assert client.get("/api/stats/export/events?format=csv").status_code == 401
+    headers = {"X-Admin-Token": "test_admin_token"}
+    assert client.get("/api/stats/export/queue", headers=headers).status_code == 404
+
+    response = client.get("/api/stats/export/events?format=csv&since=8200", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == list(export.EXPORTS["events"][2])
+    assert [row[1] for row in rows[1:]] == ["guest2", "guest3", "guest4"]
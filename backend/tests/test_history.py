@@ -0,0 +1,119 @@
+"""Tests for the long-term play history log and its rankings."""
+
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import history, stats
+
+
+@pytest.fixture(autouse=True)
+def history_db(tmp_path, monkeypatch):
+    """Point the play history at a fresh stats database file.
+
+    Yields:
+        The path of the database file.
+    """
+    db_path = tmp_path / "stats.db"
+    monkeypatch.setattr(stats, "DB_PATH", str(db_path))
+    monkeypatch.setattr(stats, "_connection", None)
+    history.init_history_db()
+    yield db_path
+    stats.close_db()
+
+
+def _song(key: int, artist: str, added_by: str | None = "guest1", server_id: str | None = None):
+    return SimpleNamespace(
+        ratingKey=key,
+        title=f"Song {key}",
+        grandparentTitle=artist,
+        parentTitle="Album",
+        server_id=server_id,
+        added_by=added_by,
+    )
+
+
+def test_plays_are_logged_with_how_they_ended(history_db):
+    """Each play is a row; starting a track closes an unfinished one without counting an outcome."""
+    history.record_play_start(_song(1, "Daft Punk"))
+    history.record_play_end(completed=True)
+    history.record_play_start(_song(2, "Justice", server_id="remote"))
+    history.record_play_end(skipped=True)
+    history.record_play_start(_song(1, "Daft Punk", added_by="guest2"))
+    history.record_play_start(_song(3, "Daft Punk"))
+
+    with sqlite3.connect(history_db) as conn:
+        rows = conn.execute(
+            "SELECT track_key, server_id, added_by, ended_at IS NOT NULL, completed, skipped FROM play_history"
+        ).fetchall()
+    assert rows == [
+        ("1", "", "guest1", 1, 1, 0),
+        ("2", "remote", "guest1", 1, 0, 1),
+        ("1", "", "guest2", 1, 0, 0),
+        ("3", "", "guest1", 0, 0, 0),
+    ]
+
+    top = history.most_played(limit=2)
+    assert [(track["track_key"], track["plays"], track["skips"]) for track in top] == [("1", 2, 0), ("2", 1, 1)]
+    assert history.most_skipped() == [
+        {"track_key": "2", "server_id": "remote", "title": "Song 2", "artist": "Justice", "plays": 1, "skips": 1},
+    ]
+    assert history.top_artists() == [
+        {"artist": "Daft Punk", "plays": 3, "skips": 0},
+        {"artist": "Justice", "plays": 1, "skips": 1},
+    ]
+
+
+def test_windowed_rankings_only_count_recent_plays(history_db):
+    """Rankings since a time aggregate only plays that started after it."""
+    history.record_play_start(_song(1, "Daft Punk"))
+    with sqlite3.connect(history_db) as conn:
+        conn.execute("UPDATE play_history SET started_at = started_at - 7200")
+    history.record_play_start(_song(2, "Justice"))
+    history.record_play_end(skipped=True)
+
+    since = time.time() - 3600
+    assert [t["track_key"] for t in history.most_played(since=since)] == ["2"]
+    assert [t["track_key"] for t in history.most_skipped(since=since)] == ["2"]
+    assert history.top_artists(since=since) == [{"artist": "Justice", "plays": 1, "skips": 1}]
+    with pytest.raises(ValueError, match="Unknown track order"):
+        history.top_tracks("completions")
+
+
+def test_track_details_return_what_autoplay_needs_to_queue_a_track():
+    """Played tracks keep their latest duration and thumb; tracks without a duration are left out."""
+    history.record_play_start(SimpleNamespace(**vars(_song(1, "Daft Punk")), duration=1000, thumb="/old"))
+    history.record_play_start(SimpleNamespace(**vars(_song(1, "Daft Punk")), duration=1000, thumb="/new"))
+    history.record_play_start(_song(2, "Justice"))
+
+    assert history.track_details([("", "1"), ("", "2"), ("", "3")]) == {
+        ("", "1"): {"title": "Song 1", "artist": "Daft Punk", "duration": 1000, "thumb": "/new"},
+    }
+    assert history.track_details([]) == {}
+
+
+def test_autoplay_seeds_top_up_recent_plays_with_favourites(mocker):
+    """Recent plays seed first, long-term favourites fill the rest, and tracks skipped on their server never seed."""
+    from backend.services.plex import autoplay_seeds  # noqa: PLC0415
+
+    mocker.patch(
+        "backend.services.plex.most_played",
+        return_value=[
+            {"track_key": "5", "server_id": None},
+            {"track_key": "6", "server_id": "remote"},
+            {"track_key": "7", "server_id": None},
+            {"track_key": "8", "server_id": None},
+        ],
+    )
+    mocker.patch(
+        "backend.services.plex.most_skipped",
+        return_value=[
+            {"track_key": "2", "server_id": None},
+            {"track_key": "7", "server_id": None},
+            {"track_key": "8", "server_id": "remote"},
+        ],
+    )
+
+    assert autoplay_seeds([1, 2, 1]) == [1, 5, 8]
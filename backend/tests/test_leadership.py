@@ -0,0 +1,68 @@
+"""Tests for orchestrator leader election."""
+
+import pytest
+
+from backend.backplane import WORKER_ID
+from backend.services import leadership
+
+
+@pytest.fixture(autouse=True)
+def reset_lease():
+    """Start every test as a follower."""
+    leadership._lease_expires_at = 0.0
+    yield
+    leadership._lease_expires_at = 0.0
+
+
+@pytest.fixture
+def lock_client(mocker):
+    """Patch the Redis client used for the leader lock.
+
+    Returns:
+        The mocked Redis client.
+    """
+    client = mocker.MagicMock()
+    mocker.patch("backend.services.leadership.get_redis_queue_client", return_value=client)
+    return client
+
+
+def test_claim_takes_free_lock(lock_client):
+    """A worker becomes leader when the lock is free."""
+    lock_client.eval.return_value = 0
+    lock_client.set.return_value = True
+
+    assert leadership.claim_leadership() is True
+    assert leadership.is_leader() is True
+    lock_client.set.assert_called_once_with(
+        leadership.LEADER_KEY, WORKER_ID, nx=True, px=int(leadership.LEADER_LEASE_TTL * 1000)
+    )
+
+
+def test_claim_renews_own_lease_without_retaking(lock_client):
+    """The current leader extends its lease instead of racing for the lock again."""
+    lock_client.eval.return_value = 1
+
+    assert leadership.claim_leadership() is True
+    lock_client.set.assert_not_called()
+
+
+def test_claim_steps_down_when_another_worker_holds_the_lock(lock_client):
+    """A worker whose lease was taken over stops acting as leader immediately."""
+    leadership._lease_expires_at = float("inf")
+    lock_client.eval.return_value = 0
+    lock_client.set.return_value = None
+
+    assert leadership.claim_leadership() is False
+    assert leadership.is_leader() is False
+
+
+def test_redis_outage_keeps_lease_until_it_expires(lock_client, mocker):
+    """An unreachable Redis does not end leadership early, but the lease still runs out."""
+    lock_client.eval.side_effect = ConnectionError("down")
+    leadership._lease_expires_at = 100.0
+
+    mocker.patch("backend.services.leadership.time.monotonic", return_value=99.0)
+    assert leadership.claim_leadership() is True
+
+    mocker.patch("backend.services.leadership.time.monotonic", return_value=101.0)
+    assert leadership.claim_leadership() is False
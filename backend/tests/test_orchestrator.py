@@ -31,6 +31,7 @@ async def test_orchestrator_starts_song(mocker):
     import backend.services.plex  # noqa: PLC0415
 
     backend.services.plex.playback_active = True
+    mocker.patch("backend.services.plex.is_leader", return_value=True)
 
     mock_queue = [
         {
@@ -64,6 +65,24 @@ async def test_orchestrator_starts_song(mocker):
     mock_play_song.assert_called_once_with(mock_player, mock_track)
 
 
+@pytest.mark.asyncio
+async def test_orchestrator_idles_without_leadership(mocker):
+    """Verify that a worker without the orchestrator lease never starts playback."""
+    import backend.services.plex  # noqa: PLC0415
+
+    backend.services.plex.playback_active = True
+    mocker.patch("backend.services.plex.is_leader", return_value=False)
+    mock_get_queue = mocker.patch("backend.services.plex.get_redis_queue", return_value=[{"item_id": "123"}])
+    mock_play_song = mocker.patch("backend.services.plex.play_song")
+
+    task = asyncio.create_task(playback_orchestrator())
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    mock_get_queue.assert_not_called()
+    mock_play_song.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_resync_detects_drift(mocker):
     """Test that check_plexamp_resync detects drift and aligns the local tracker."""
@@ -101,6 +120,27 @@ async def test_resync_detects_drift(mocker):
     assert pytest.approx(track_time_tracker.accumulated_elapsed) == expected_elapsed
 
 
+@pytest.mark.asyncio
+async def test_resync_is_shared_by_concurrent_callers(mocker):
+    """A connection storm triggers one Plex check, and a recent result is reused."""
+    calls = []
+
+    async def slow_resync(force_align):
+        calls.append(force_align)
+        await asyncio.sleep(0.05)
+
+    mocker.patch("backend.services.plex._resync_plexamp", side_effect=slow_resync)
+
+    await asyncio.gather(*(check_plexamp_resync(force_align=True) for _ in range(50)))
+    await check_plexamp_resync()
+    assert calls == [True]
+
+    # A plain check does not satisfy a caller that needs the timer force-aligned
+    mocker.patch("backend.services.plex._last_resync_at", None)
+    await asyncio.gather(check_plexamp_resync(), check_plexamp_resync(force_align=True))
+    assert calls == [True, False, True]
+
+
 def test_reorder_queue_endpoint(mocker):
     """Test POST /api/music/queue/reorder with admin header."""
     from fastapi.testclient import TestClient
@@ -171,3 +211,20 @@ def test_skip_endpoint_admin_token(mocker):
     assert admin_resp.status_code == 200
     assert admin_resp.json() == {"message": "Track skipped successfully."}
 
+
+def test_only_followers_reread_the_playback_clock(mocker):
+    """The leader reports its own tracker; followers re-read the replicated clock at most once per interval."""
+    import backend.services.plex  # noqa: PLC0415
+
+    mocker.patch("backend.services.plex.get_cached_data", return_value={"title": "Song", "duration": 180})
+    mock_load = mocker.patch("backend.services.plex.load_playback_clock", return_value=None)
+    mocker.patch.object(backend.services.plex, "_last_clock_sync", float("-inf"))
+
+    mocker.patch("backend.services.plex.is_leader", return_value=True)
+    backend.services.plex.get_current_playing_track()
+    mock_load.assert_not_called()
+
+    mocker.patch("backend.services.plex.is_leader", return_value=False)
+    backend.services.plex.get_current_playing_track()
+    backend.services.plex.get_current_playing_track()
+    mock_load.assert_called_once()
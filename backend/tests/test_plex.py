@@ -3,13 +3,18 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
+from fastapi import HTTPException
 from plexapi.exceptions import PlexApiException
 
 from backend.config import settings
 from backend.services.plex import (
+    ART_MISS_CACHE_CONTROL,
+    generate_autoplay_tracks,
     get_active_player,
     get_myplex_account,
     get_plex_connection,
+    resolve_art_url,
+    sync_library_state,
 )
 
 
@@ -146,11 +151,11 @@ def test_get_active_player_fails_all_paths(mock_get_conn, mock_get_account):
         get_active_player("Target Player")
 
 
+@patch("backend.services.plex.get_cached_data", return_value=None)
+@patch("backend.services.plex.cache_data")
 @patch("backend.services.plex.get_target_plex_connection")
-def test_fetch_art_track_fallback(mock_get_target_conn):
-    """Verify fetch_art falls back to parentThumb or album.thumb for tracks without a direct thumb."""
-    from backend.services.plex import fetch_art
-
+def test_resolve_art_url_track_fallback(mock_get_target_conn, mock_cache_data, _mock_get_cached):
+    """Verify resolve_art_url falls back to parentThumb for tracks without a direct thumb."""
     mock_plex = MagicMock()
     mock_track = MagicMock()
     mock_track.thumb = None
@@ -160,12 +165,102 @@ def test_fetch_art_track_fallback(mock_get_target_conn):
     mock_plex._token = "mock-token"
     mock_get_target_conn.return_value = mock_plex
 
-    with patch("requests.get") as mock_req_get:
-        mock_resp = MagicMock()
-        mock_resp.ok = True
-        mock_req_get.return_value = mock_resp
+    url = resolve_art_url(123, "track", server_id="server-abc")
+
+    assert url == "http://localhost:32400/library/metadata/10/thumb?X-Plex-Token=mock-token"
+    mock_cache_data.assert_called_once_with("thumb_path:server-abc:track:123", "/library/metadata/10/thumb")
+
+
+@patch("backend.services.plex.get_cached_data", return_value=None)
+@patch("backend.services.plex.cache_negative")
+@patch("backend.services.plex.is_negatively_cached")
+@patch("backend.services.plex.get_target_plex_connection")
+def test_resolve_art_url_negative_caching(mock_get_target_conn, mock_is_neg, mock_cache_neg, _mock_get_cached):
+    """A missing thumb is remembered, and a remembered miss never reaches Plex."""
+    mock_plex = MagicMock()
+    mock_item = MagicMock(spec=["thumb"])
+    mock_item.thumb = None
+    mock_plex.fetchItem.return_value = mock_item
+    mock_get_target_conn.return_value = mock_plex
+    mock_is_neg.return_value = False
+
+    with pytest.raises(HTTPException) as exc:
+        resolve_art_url(55, "album")
+    assert exc.value.status_code == 404
+    assert exc.value.headers == {"Cache-Control": ART_MISS_CACHE_CONTROL}
+    mock_cache_neg.assert_called_once_with("art:primary:album:55")
+
+    mock_plex.fetchItem.reset_mock()
+    mock_is_neg.side_effect = lambda key: key.startswith("art:")
+    with pytest.raises(HTTPException) as exc:
+        resolve_art_url(55, "album")
+    assert exc.value.headers == {"Cache-Control": ART_MISS_CACHE_CONTROL}
+    mock_plex.fetchItem.assert_not_called()
+
+    # An unreachable server is a transient failure browsers must not remember
+    mock_is_neg.side_effect = lambda key: key.startswith("server:")
+    with pytest.raises(HTTPException) as exc:
+        resolve_art_url(55, "album")
+    assert exc.value.status_code == 404
+    assert exc.value.headers is None
+
+
+@patch("backend.services.plex.clear_negative_cache")
+@patch("backend.services.plex.cache_data")
+@patch("backend.services.plex.get_cached_data", return_value="100")
+@patch("backend.services.plex.get_plex_connection")
+def test_sync_library_state_invalidates_on_change(mock_get_conn, _mock_get_cached, mock_cache_data, mock_clear_neg):
+    """A changed library content marker clears the negative caches."""
+    mock_get_conn.return_value.library.section.return_value.contentChangedAt = 200
+
+    assert sync_library_state() is True
+    mock_cache_data.assert_called_once_with("library_content_marker", "200")
+    mock_clear_neg.assert_called_once()
+
+
+@patch("backend.services.plex.add_entry_to_queue_redis")
+@patch("backend.services.plex.get_redis_cache_client")
+@patch("backend.services.plex.get_playback_history", return_value=[1])
+@patch("backend.services.plex.most_skipped", return_value=[])
+@patch("backend.services.plex.autoplay_seeds", return_value=[1])
+@patch("backend.services.plex.recommend_tracks", return_value=[("", "2"), ("remote", "3"), ("", "4"), ("", "5")])
+@patch("backend.services.plex.track_details")
+@patch("backend.services.plex.get_track")
+def test_generate_autoplay_queues_recommendations_without_plex(
+    mock_get_track, mock_details, _mock_recommend, _mock_seeds, _mock_skipped, _mock_history, mock_cache_client, mock_add
+):
+    """Recommended tracks are queued from stored history details or the track cache, never fetched from Plex."""
+    mock_details.return_value = {("", "2"): {"title": "Two", "artist": None, "duration": 1000, "thumb": "/t/2"}}
+    mock_cache_client.return_value.get.return_value = None
+    cached_track = MagicMock(ratingKey=4, title="Four", grandparentTitle="Artist", duration=2000, thumb="/t/4")
+
+    with patch.dict("backend.services.plex._track_cache", {(None, "4"): (cached_track, 0)}):
+        generate_autoplay_tracks()
+
+    mock_get_track.assert_not_called()
+    mock_details.assert_called_once_with([("", "2"), ("", "4"), ("", "5")])
+    queued = {call.args[0]["item_id"]: call.args[0] for call in mock_add.call_args_list}
+    assert sorted(queued) == [2, 4]
+    assert queued[2]["artist"] == "Unknown Artist"
+    assert (queued[2]["duration"], queued[2]["album_art"], queued[2]["is_fallback"]) == (1000, "/t/2", True)
+
+
+@patch("backend.services.plex.add_entry_to_queue_redis")
+@patch("backend.services.plex.get_redis_cache_client")
+@patch("backend.services.plex.get_playback_history", return_value=[1])
+@patch("backend.services.plex.most_skipped", return_value=[])
+@patch("backend.services.plex.autoplay_seeds", return_value=[1])
+@patch("backend.services.plex.recommend_tracks", return_value=None)
+@patch("backend.services.plex.get_track")
+def test_generate_autoplay_asks_plex_for_related_tracks_only_without_recommendations(
+    mock_get_track, _mock_recommend, _mock_seeds, _mock_skipped, _mock_history, mock_cache_client, mock_add
+):
+    """Without usable recommendations the seeds' Plex related tracks are queued, leaving out recent plays."""
+    related = [MagicMock(type="track", ratingKey=key) for key in (1, 4, 5)]
+    mock_get_track.return_value.related.return_value = related
+    mock_cache_client.return_value.get.return_value = None
+
+    generate_autoplay_tracks()
 
-        res = fetch_art(123, "track", server_id="server-abc")
-        assert res is not None
-        mock_req_get.assert_called_once()
-        assert "http://localhost:32400/library/metadata/10/thumb" in mock_req_get.call_args[0][0]
+    mock_get_track.assert_called_once_with(1)
+    assert sorted(call.args[0]["item_id"] for call in mock_add.call_args_list) == [4, 5]
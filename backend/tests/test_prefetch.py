@@ -0,0 +1,46 @@
+"""Tests for the upcoming-queue prefetch stage."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.services import plex, prefetch
+
+
+@pytest.mark.asyncio
+async def test_warm_entry_caches_track_thumb_and_art(mocker):
+    """Warming an entry loads the track once, seeds the thumb path and downloads the art."""
+    track = MagicMock()
+    mock_get_track = mocker.patch("backend.services.plex.get_track", return_value=track)
+    mock_cache = mocker.patch("backend.services.prefetch.cache_data")
+    mocker.patch("backend.services.prefetch.get_cached_data", return_value=None)
+    mock_warm_art = mocker.patch("backend.services.prefetch.warm_art")
+
+    entry = {"item_id": 42, "album_art": "/library/metadata/42/thumb/1", "server_id": None}
+    await prefetch.warm_entry(entry)
+
+    assert plex.load_queue_track(entry) is track
+    mock_get_track.assert_called_once_with(42)
+    mock_cache.assert_called_once_with("thumb_path:primary:track:42", "/library/metadata/42/thumb/1")
+    mock_warm_art.assert_awaited_once_with(42, "track", None)
+
+
+def test_request_prefetch_keeps_only_upcoming_window():
+    """Only the first PREFETCH_DEPTH entries of the newest snapshot are scheduled."""
+    queue = [{"item_id": i} for i in range(prefetch.PREFETCH_DEPTH + 3)]
+
+    prefetch.request_prefetch(queue)
+
+    assert [e["item_id"] for e in prefetch._upcoming] == list(range(prefetch.PREFETCH_DEPTH))
+    assert prefetch._wakeup.is_set()
+    prefetch._wakeup.clear()
+
+
+def test_prune_track_cache_drops_entries_outside_window():
+    """Track objects for entries that left the upcoming window are released."""
+    plex._track_cache[None, "1"] = (MagicMock(), 0)
+    plex._track_cache[None, "2"] = (MagicMock(), 0)
+
+    plex.prune_track_cache([{"item_id": 2}])
+
+    assert list(plex._track_cache) == [(None, "2")]
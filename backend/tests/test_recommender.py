@@ -0,0 +1,51 @@
+"""Tests for the co-occurrence recommender behind autoplay."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from backend.services.recommender import GUEST_WEIGHT, PARTY_GAP, CooccurrenceModel  # noqa: E402
+
+
+def _plays(*plays: tuple[str, str | None, float], first_id: int = 1) -> list[tuple]:
+    """Turn (track_key, added_by, started_at) tuples into play_history rows on the primary server."""
+    return [(first_id + n, "", key, added_by, started_at) for n, (key, added_by, started_at) in enumerate(plays)]
+
+
+def test_neighbouring_plays_and_shared_guests_co_occur():
+    """Nearby plays score by distance, a shared guest adds weight, and a new party starts fresh."""
+    model = CooccurrenceModel()
+    model.update(
+        _plays(
+            ("a", "guest1", 0),
+            ("b", "guest2", 200),
+            ("c", "guest1", 400),
+            ("d", "guest3", 400 + PARTY_GAP + 1),
+        )
+    )
+
+    scores = model.scores([model.track_ids["", "a"]])
+    assert scores[model.track_ids["", "b"]] == pytest.approx(1.0)
+    assert scores[model.track_ids["", "c"]] == pytest.approx(0.5 + GUEST_WEIGHT)
+    assert scores[model.track_ids["", "d"]] == 0
+
+    assert model.recommend([("", "a")]) == [("", "b"), ("", "c")]
+    assert model.recommend([("", "a")], exclude=[("", "b")], k=1) == [("", "c")]
+    assert model.recommend([("", "unknown")]) == []
+
+
+def test_incremental_updates_match_a_full_build():
+    """Folding plays in two batches yields the same matrix as one build over all of them."""
+    plays = _plays(*((key, f"guest{n % 2}", n * 180.0) for n, key in enumerate("abcabdcea")))
+
+    full = CooccurrenceModel()
+    full.update(plays)
+    incremental = CooccurrenceModel()
+    incremental.update(plays[:4])
+    incremental.update(plays[4:])
+
+    assert incremental.last_play_id == full.last_play_id == len(plays)
+    assert incremental.tracks == full.tracks
+    np.testing.assert_array_equal(incremental.indptr, full.indptr)
+    np.testing.assert_array_equal(incremental.indices, full.indices)
+    np.testing.assert_allclose(incremental.data, full.data)
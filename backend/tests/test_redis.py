@@ -8,13 +8,18 @@ import pytest
 from backend.services.redis import (
     add_to_queue_redis,
     cache_data,
+    cache_negative,
     clear_cache,
+    clear_negative_cache,
     clear_redis_queue,
     get_cached_data,
     get_redis_queue,
+    get_top_vibes,
+    is_negatively_cached,
     move_to_top_redis_queue,
     remove_from_redis_queue,
     reorder_redis_queue,
+    update_queue_entry,
 )
 
 
@@ -135,7 +140,7 @@ def test_clear_redis_queue(mock_redis):
     ):
         response = clear_redis_queue()
 
-    mock_redis_queue.delete.assert_called_once_with("playback_queue")
+    mock_redis_queue.delete.assert_called_once_with("playback_queue", "queue_vibes")
     assert response == {"message": "The queue has been cleared."}
 
 
@@ -301,3 +306,63 @@ def test_move_to_top_redis_queue(mock_redis):
     mock_redis_queue.rpush.assert_called_once_with("playback_queue", item_0, item_2, item_1)
 
 
+def test_negative_cache_roundtrip(mock_redis):
+    """Negative entries are written with a TTL under their own prefix and can be purged."""
+    _, mock_redis_cache = mock_redis
+    mock_redis_cache.exists.return_value = 1
+    mock_redis_cache.scan_iter.return_value = iter(["negative:art:primary:album:1"])
+
+    cache_negative("art:primary:album:1")
+    mock_redis_cache.setex.assert_called_once_with("negative:art:primary:album:1", 300, "1")
+
+    assert is_negatively_cached("art:primary:album:1") is True
+    assert clear_negative_cache() == 1
+    mock_redis_cache.delete.assert_called_once_with("negative:art:primary:album:1")
+
+
+def test_update_queue_entry_sets_fields_in_place(mock_redis):
+    """update_queue_entry rewrites only the matching entry inside a watched transaction."""
+    mock_redis_queue, _ = mock_redis
+    pipe = mock_redis_queue.pipeline.return_value.__enter__.return_value
+    pipe.lrange.return_value = [
+        json.dumps({"item_id": 1, "title": "A", "moods": []}),
+        json.dumps({"item_id": 2, "title": "B", "moods": []}),
+    ]
+
+    assert update_queue_entry(2, moods=["Chill"]) is True
+
+    pipe.watch.assert_called_once_with("playback_queue")
+    index, payload = pipe.lset.call_args[0][1:]
+    assert index == 1
+    assert json.loads(payload)["moods"] == ["Chill"]
+    pipe.execute.assert_called_once()
+
+
+def test_queue_mutations_maintain_vibe_histogram(mock_redis, mock_plex_track, mocker):
+    """Inserts and removals adjust the mood histogram in the same transaction as the queue."""
+    mocker.patch("backend.services.redis.is_song_in_queue", return_value=False)
+    mock_redis_queue, _ = mock_redis
+    mock_redis_queue.lrange.return_value = []
+    mock_plex_track.moods = ["Chill", "Mellow"]
+
+    add_to_queue_redis(mock_plex_track)
+
+    mock_redis_queue.zincrby.assert_any_call("queue_vibes", 1, "Chill")
+    mock_redis_queue.zincrby.assert_any_call("queue_vibes", 1, "Mellow")
+    mock_redis_queue.execute.assert_called_once()
+
+    mock_redis_queue.reset_mock()
+    mock_redis_queue.lrange.return_value = [json.dumps({"item_id": "12345", "title": "Test Song", "moods": ["Chill"]})]
+    remove_from_redis_queue("12345")
+
+    mock_redis_queue.zincrby.assert_called_once_with("queue_vibes", -1, "Chill")
+    mock_redis_queue.zremrangebyscore.assert_called_once_with("queue_vibes", "-inf", 0)
+
+
+def test_get_top_vibes_reads_sorted_set(mock_redis):
+    """Top vibes are a single ZREVRANGE over the histogram."""
+    mock_redis_queue, _ = mock_redis
+    mock_redis_queue.zrevrange.return_value = ["Party", "Happy", "Chill"]
+
+    assert get_top_vibes() == ["Party", "Happy", "Chill"]
+    mock_redis_queue.zrevrange.assert_called_once_with("queue_vibes", 0, 2)
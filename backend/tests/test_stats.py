@@ -0,0 +1,164 @@
+"""Tests for the stat event store, its leaderboards and its write-behind buffer."""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from backend.services import stats
+
+
+@pytest.fixture(autouse=True)
+def stats_db(tmp_path, monkeypatch, mock_redis):
+    """Point the stats store at a fresh database file.
+
+    Yields:
+        The path of the database file.
+    """
+    db_path = tmp_path / "stats.db"
+    monkeypatch.setattr(stats, "DB_PATH", str(db_path))
+    monkeypatch.setattr(stats, "_connection", None)
+    stats._pending.clear()
+    stats.init_db()
+    yield db_path
+    stats.close_db()
+
+
+def _count(db_path, event_type: str, username: str) -> int | None:
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            "SELECT count FROM stat_totals WHERE event_type = ? AND username = ?", (event_type, username)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def test_connection_uses_wal(stats_db):
+    """The shared connection journals in WAL mode with relaxed syncing."""
+    with stats._db_lock:
+        conn = stats.get_connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+
+def test_reads_do_not_wait_for_the_writer(stats_db):
+    """Leaderboard reads use their own read-only connection, so a held write lock never delays them."""
+    stats.increment_adds("guest1")
+    stats.flush_stats()
+
+    with stats._db_lock:
+        assert stats.get_leaderboard("adds")["entries"] == [{"username": "guest1", "count": 1}]
+    with stats.read_only_database() as conn, pytest.raises(sqlite3.OperationalError, match="readonly"):
+        conn.execute("DELETE FROM stat_totals")
+
+
+def test_increments_are_buffered_until_flushed(stats_db):
+    """Events only reach SQLite on flush, with one all-time total per user and type."""
+    for _ in range(3):
+        stats.increment_adds("guest1")
+    stats.increment_skips_cast("guest1")
+    stats.increment_adds("admin")
+
+    assert _count(stats_db, "adds", "guest1") is None
+    assert stats.flush_stats() == 4
+    assert _count(stats_db, "adds", "guest1") == 3
+    assert _count(stats_db, "skips_cast", "guest1") == 1
+    assert _count(stats_db, "adds", "admin") is None
+
+    # Reads never write; the new add shows up once the writer flushes it
+    stats.increment_adds("guest1")
+    assert stats.get_alltime_stats()["adds"] == [{"username": "guest1", "count": 3, "role": "guest"}]
+    assert stats.flush_stats() == 1
+    assert stats.get_alltime_stats()["adds"] == [{"username": "guest1", "count": 4, "role": "guest"}]
+
+
+def test_failed_flush_keeps_increments(stats_db):
+    """Events survive a failed write and go out with the next flush."""
+    stats.increment_skips_received("guest2")
+    with patch.object(stats, "get_connection", side_effect=sqlite3.OperationalError("database is locked")):
+        assert stats.flush_stats() == 0
+
+    assert stats.flush_stats() == 1
+    assert _count(stats_db, "skips_received", "guest2") == 1
+
+
+def test_windowed_leaderboards_page_through_events(stats_db, mocker):
+    """Hour, session and all-time windows rank only their events, a page at a time."""
+    client = mocker.patch("backend.services.stats.get_redis_queue_client").return_value
+    client.pipeline.return_value.execute.return_value = [1, False, "tonight"]
+    client.get.return_value = "tonight"
+    for username, adds in [("guest1", 1), ("guest2", 3), ("guest3", 2)]:
+        for _ in range(adds):
+            stats.increment_adds(username, 12345)
+    stats.flush_stats()
+    # An add from a previous party, three hours ago
+    with sqlite3.connect(stats_db) as conn:
+        conn.execute(
+            "INSERT INTO stat_events (username, event_type, track_key, occurred_at, session_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ("guest4", "adds", "1", time.time() - 3 * 3600, "last-week"),
+        )
+        conn.execute("INSERT INTO stat_totals (event_type, username, count) VALUES ('adds', 'guest4', 9)")
+
+    assert stats.get_leaderboard("adds", "hour", limit=2) == {
+        "entries": [{"username": "guest2", "count": 3}, {"username": "guest3", "count": 2}],
+        "total": 3,
+    }
+    session_page = stats.get_leaderboard("adds", "session", limit=2, offset=2)
+    assert session_page["entries"] == [{"username": "guest1", "count": 1}]
+    assert stats.get_leaderboard("adds", "all", limit=1) == {
+        "entries": [{"username": "guest4", "count": 9}],
+        "total": 4,
+    }
+    with pytest.raises(ValueError, match="Unknown stats window"):
+        stats.get_leaderboard("adds", "fortnight")
+
+
+def test_legacy_counter_tables_are_migrated(stats_db, monkeypatch):
+    """Counts from the old per-type tables are folded into the all-time totals."""
+    stats.close_db()
+    with sqlite3.connect(stats_db) as conn:
+        conn.execute("CREATE TABLE skips_cast (username TEXT PRIMARY KEY, count INTEGER DEFAULT 0)")
+        conn.execute("INSERT INTO skips_cast VALUES ('guest1', 5)")
+
+    stats.init_db()
+
+    assert _count(stats_db, "skips_cast", "guest1") == 5
+    with sqlite3.connect(stats_db) as conn:
+        assert not conn.execute("SELECT name FROM sqlite_master WHERE name = 'skips_cast'").fetchall()
+
+
+def test_leaderboards_are_cached_until_the_stats_version_changes(stats_db, mocker):
+    """One pipelined read builds the top-N boards; later reads reuse them until a stat changes."""
+    client = mocker.patch("backend.services.stats.get_redis_queue_client").return_value
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = ["3", {"guest1": "guest"}, [("guest1", 2.0)], [], []]
+    client.mget.return_value = [None, "3"]
+
+    leaderboards = stats.get_leaderboards()
+
+    assert leaderboards["session"]["adds"] == [{"username": "guest1", "count": 2, "role": "guest"}]
+    pipe.zrevrange.assert_any_call("stats:adds:session", 0, stats.STATS_TOP_N - 1, withscores=True)
+    cached = client.set.call_args.args[1]
+
+    pipe.execute.reset_mock()
+    client.mget.return_value = [cached, "3"]
+    assert stats.get_leaderboards() == leaderboards
+    pipe.execute.assert_not_called()
+
+    client.mget.return_value = [cached, "4"]
+    stats.get_leaderboards()
+    pipe.execute.assert_called_once()
+
+
+def test_reconnecting_with_the_same_role_keeps_the_leaderboard_cache(mocker):
+    """Only a changed role invalidates the cached leaderboards."""
+    client = mocker.patch("backend.services.stats.get_redis_queue_client").return_value
+    client.hget.return_value = b"guest"
+
+    stats.set_user_role("guest1", "guest")
+    client.pipeline.assert_not_called()
+
+    stats.set_user_role("guest1", "admin")
+    client.pipeline.return_value.hset.assert_called_once_with(stats.USER_ROLES_KEY, "guest1", "admin")
+    client.pipeline.return_value.incr.assert_called_once_with(stats.LEADERBOARDS_VERSION_KEY)
@@ -166,3 +166,19 @@ def test_tracker_update(tracker):
     assert tracker.track_name == "New Track"
     assert tracker.is_playing is True
     assert tracker.start_time is not None
+
+
+def test_tracker_snapshot_restores_on_another_tracker():
+    """Test that a replicated clock reports the same position and notifies on every change."""
+    changes = []
+    leader = TrackTimeTracker(on_change=lambda: changes.append(leader.snapshot()))
+    leader.start("Test Track")
+    leader.seek(42.0, playing=False)
+
+    follower = TrackTimeTracker()
+    follower.restore(changes[-1])
+
+    assert len(changes) == 2
+    assert follower.track_name == "Test Track"
+    assert follower.is_playing is False
+    assert follower.elapsed_time == pytest.approx(42.0)
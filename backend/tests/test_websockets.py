@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+import time
 from unittest.mock import patch
 
 import pytest
@@ -12,10 +13,15 @@ from fastapi.websockets import WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
 from backend.routers.music import router
+import backend.websockets as websockets_module
 from backend.websockets import (
+    SkipVoteTally,
     active_connections,
+    broadcast_skip_status,
+    event_sessions,
     send_current_playing,
     send_queue,
+    sweep_connections,
     websocket_handler,
 )
 
@@ -178,6 +184,205 @@ async def test_send_queue(mock_queue, mock_redis):
     assert sent_data["queue"] == mock_queue
 
 
+@pytest.mark.asyncio
+async def test_send_queue_coalesces_bursts(mock_queue, mock_redis):
+    """Concurrent queue broadcasts within the window are merged into one read and one frame."""
+    mock_ws = MockWebSocket()
+    await mock_ws.accept()
+    active_connections["queue_update"][str(id(mock_ws))] = mock_ws
+
+    mock_redis_queue, _ = mock_redis
+    mock_redis_queue.lrange.return_value = [json.dumps(item) for item in mock_queue]
+    counters = websockets_module.broadcast_counters["queue"]
+    requested, emitted = counters["requested"], counters["emitted"]
+
+    await asyncio.gather(*(send_queue() for _ in range(10)))
+
+    assert len(mock_ws.sent_messages) == 1
+    assert mock_redis_queue.lrange.call_count == 1
+    assert counters["requested"] - requested == 10
+    assert counters["emitted"] - emitted == 1
+
+
+def test_skip_vote_tally_tracks_joins_leaves_and_votes():
+    """Weighted totals follow joins, role changes, votes and departures without a recount."""
+    tally = SkipVoteTally()
+    tally.join("guest", 1)
+    tally.join("admin", 2)
+    tally.vote("admin", vote=True)
+    tally.vote("stranger", vote=True)
+    assert tally.status() == {"votes": 2, "total": 3, "voted_ids": ["admin"]}
+
+    tally.join("admin", 1)
+    assert (tally.votes, tally.total) == (1, 2)
+
+    tally.vote("guest", vote=True)
+    tally.leave("admin")
+    assert tally.status() == {"votes": 1, "total": 1, "voted_ids": ["guest"]}
+
+    tally.clear()
+    assert (tally.votes, tally.total) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_skip_vote_broadcasts_are_coalesced(mock_redis):
+    """A burst of vote changes within the interval goes out as one status frame."""
+    mock_ws = MockWebSocket()
+    await mock_ws.accept()
+    active_connections["client_control"]["voter"] = mock_ws
+    counters = websockets_module.broadcast_counters["skip_votes"]
+    requested, emitted = counters["requested"], counters["emitted"]
+
+    for _ in range(10):
+        await broadcast_skip_status()
+    await asyncio.sleep(websockets_module.VOTE_BROADCAST_INTERVAL + 0.1)
+
+    assert len(mock_ws.sent_messages) == 1
+    assert json.loads(mock_ws.sent_messages[0])["type"] == "skip_vote_update"
+    assert counters["requested"] - requested == 10
+    assert counters["emitted"] - emitted == 1
+
+
+@pytest.mark.asyncio
+async def test_stat_changes_push_one_leaderboard_frame(mocker):
+    """Stats sockets get a single stats_update frame for a burst of stat changes."""
+    mock_ws = MockWebSocket()
+    await mock_ws.accept()
+    active_connections["stats"]["board"] = mock_ws
+    leaderboards = {"session": {"adds": [{"username": "guest1", "count": 1, "role": "guest"}]}, "all_time": {}}
+    get_leaderboards = mocker.patch("backend.services.stats.get_leaderboards", return_value=leaderboards)
+    mocker.patch.object(websockets_module._stats_broadcasts, "window", 0.01)
+
+    for _ in range(5):
+        websockets_module.broadcast_stats()
+    await asyncio.sleep(0.1)
+
+    assert [json.loads(message) for message in mock_ws.sent_messages] == [
+        {"type": "stats_update", **leaderboards, "seq": mocker.ANY},
+    ]
+    get_leaderboards.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_multiplex_connection_gets_one_snapshot(mock_current_track, mock_queue):
+    """One socket joins several channels, gets a single snapshot frame and each broadcast once."""
+    mock_ws = MockWebSocket()
+    channels = ["music_control", "queue_update", "client_control"]
+
+    with (
+        patch("backend.websockets.get_current_playing_track", return_value={**mock_current_track, "item_id": 7}),
+        patch("backend.websockets.get_redis_queue", return_value=mock_queue),
+    ):
+        handler_task = asyncio.create_task(websocket_handler(mock_ws))
+        await mock_ws.receive_queue.put(
+            json.dumps({"type": "multiplex", "channels": channels, "client_id": "phone", "name": "Phone"})
+        )
+        await asyncio.sleep(0.1)
+
+        frames = [json.loads(message) for message in mock_ws.sent_messages]
+        assert len(frames) == 1
+        snapshot = frames[0]
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["channels"] == channels
+        assert snapshot["music_control"]["current_track"]["title"] == "Test Song"
+        assert snapshot["queue_update"]["queue"] == mock_queue
+        assert snapshot["skip_votes"]["total"] == 1
+        assert all(active_connections[channel].get("phone") is mock_ws for channel in channels)
+
+        # Sent to both client_control and music_control, but this socket gets it once
+        await asyncio.sleep(websockets_module.VOTE_BROADCAST_INTERVAL + 0.1)
+        assert [json.loads(message)["type"] for message in mock_ws.sent_messages[1:]] == ["skip_vote_update"]
+
+        await mock_ws.receive_queue.put("__DISCONNECT__")
+        await handler_task
+
+    assert all("phone" not in active_connections[channel] for channel in channels)
+
+
+@pytest.mark.asyncio
+async def test_sweeper_evicts_clients_that_miss_their_ping(monkeypatch):
+    """A silent client is pinged, kept while it answers, and evicted from every registry once it stops."""
+    monkeypatch.setattr(websockets_module, "PING_INTERVAL", 0.05)
+    monkeypatch.setattr(websockets_module, "PONG_DEADLINE", 0.05)
+    from backend.websockets import client_registry  # noqa: PLC0415
+
+    mock_ws = MockWebSocket()
+    handler_task = asyncio.create_task(websocket_handler(mock_ws))
+    await mock_ws.receive_queue.put(json.dumps({"type": "client_control", "client_id": "quiet", "name": "Quiet"}))
+    await asyncio.sleep(0.1)
+
+    await sweep_connections()
+    await asyncio.sleep(0.01)
+    assert json.loads(mock_ws.sent_messages[-1])["type"] == "ping"
+
+    await mock_ws.receive_queue.put(json.dumps({"type": "pong"}))
+    await asyncio.sleep(0.01)
+    await sweep_connections()
+    assert "quiet" in active_connections["client_control"]
+    assert client_registry["quiet"]["last_seen"]
+
+    await asyncio.sleep(0.1)
+    await sweep_connections()
+    await asyncio.sleep(0.1)
+    await sweep_connections()
+    await asyncio.sleep(0.01)
+
+    assert "quiet" not in active_connections["client_control"]
+    assert "quiet" not in client_registry
+    assert websockets_module.skip_tally.total == 0
+    assert mock_ws.closed
+
+    await mock_ws.receive_queue.put("__DISCONNECT__")
+    await handler_task
+
+
+@pytest.mark.asyncio
+async def test_sweeper_only_writes_last_seen_to_the_shared_entry(mocker):
+    """Refreshing last_seen leaves the rest of the shared entry, which other workers may have edited, alone."""
+    merge_client = mocker.patch("backend.websockets.merge_client", return_value=True)
+    store_client = mocker.patch("backend.websockets.store_client")
+
+    mock_ws = MockWebSocket()
+    handler_task = asyncio.create_task(websocket_handler(mock_ws))
+    await mock_ws.receive_queue.put(json.dumps({"type": "client_control", "client_id": "seen", "name": "Seen"}))
+    await asyncio.sleep(0.1)
+    store_client.reset_mock()
+
+    await sweep_connections()
+
+    merge_client.assert_called_once_with("seen", {"last_seen": mocker.ANY})
+    store_client.assert_not_called()
+
+    await mock_ws.receive_queue.put("__DISCONNECT__")
+    await handler_task
+
+
+@pytest.mark.asyncio
+async def test_time_sync_echoes_client_time_with_server_timestamps(mock_current_track):
+    """A time_sync request is answered with the server's receive and send times."""
+    mock_ws = MockWebSocket()
+    with patch("backend.websockets.get_current_playing_track", return_value={**mock_current_track, "item_id": 7}):
+        handler_task = asyncio.create_task(websocket_handler(mock_ws))
+        await mock_ws.receive_queue.put(json.dumps({"type": "music_control"}))
+        await asyncio.sleep(0.05)
+        now_playing = next(
+            frame for frame in map(json.loads, mock_ws.sent_messages) if frame.get("message") == "Current track update"
+        )
+
+        before = time.time()
+        await mock_ws.receive_queue.put(json.dumps({"type": "time_sync", "client_time": 1234.5}))
+        await asyncio.sleep(0.05)
+        reply = json.loads(mock_ws.sent_messages[-1])
+
+        await mock_ws.receive_queue.put("__DISCONNECT__")
+        await handler_task
+
+    assert reply["type"] == "time_sync"
+    assert reply["client_time"] == pytest.approx(1234.5)
+    assert before <= reply["server_receive"] <= reply["server_send"] <= time.time()
+    assert now_playing["track_started_at"] == pytest.approx(now_playing["server_time"] - 60000)
+
+
 @pytest.mark.asyncio
 async def test_websocket_heartbeat(caplog):
     """Test the heartbeat functionality."""
@@ -316,9 +521,63 @@ async def test_websocket_client_control_registration():
         pass
 
 
+@pytest.mark.asyncio
+async def test_handler_errors_still_release_the_client():
+    """A connection that ends in an error rather than a disconnect is still dropped from every registry."""
+    from backend.websockets import client_registry  # noqa: PLC0415
+
+    mock_ws = MockWebSocket()
+    handler_task = asyncio.create_task(websocket_handler(mock_ws))
+    await mock_ws.receive_queue.put(json.dumps({"type": "client_control", "client_id": "broken", "name": "Broken"}))
+    await asyncio.sleep(0.1)
+    assert websockets_module.skip_tally.total == 1
+
+    await mock_ws.receive_queue.put("not json")
+    with pytest.raises(json.JSONDecodeError):
+        await handler_task
+
+    assert "broken" not in active_connections["client_control"]
+    assert "broken" not in client_registry
+    assert websockets_module.skip_tally.total == 0
+
+
+@pytest.mark.asyncio
+async def test_now_playing_ticks_only_reach_legacy_clients(mock_current_track):
+    """Event-mode clients get frames on state changes only, legacy clients keep their 1 second ticks."""
+    legacy_ws = MockWebSocket()
+    events_ws = MockWebSocket()
+    await legacy_ws.accept()
+    await events_ws.accept()
+    active_connections["music_control"]["legacy"] = legacy_ws
+    active_connections["music_control"]["events"] = events_ws
+    event_sessions.add("events")
+
+    with patch("backend.websockets.get_current_playing_track", return_value=mock_current_track):
+        await send_current_playing()
+        await send_current_playing(tick=True)
+        await send_current_playing(tick=True)
+
+    paused_track = {**mock_current_track, "track_state": "paused"}
+    with patch("backend.websockets.get_current_playing_track", return_value=paused_track):
+        await send_current_playing(tick=True)
+        await send_current_playing(tick=True)
+
+    assert len(legacy_ws.sent_messages) == 4
+    assert len(events_ws.sent_messages) == 2
+
+    playing_frame, paused_frame = (json.loads(frame) for frame in events_ws.sent_messages)
+    assert playing_frame["playback_rate"] == pytest.approx(1.0)
+    assert paused_frame["playback_rate"] == pytest.approx(0.0)
+    assert paused_frame["current_track"]["track_state"] == "paused"
+    assert paused_frame["server_time"] >= playing_frame["server_time"]
+
+
 @pytest.fixture(autouse=True)
 def cleanup():
     """Clean up mock websocket connections."""
     yield
     for connection_type in active_connections:
         active_connections[connection_type].clear()
+    event_sessions.clear()
+    websockets_module._last_now_playing_state = None
+    websockets_module.skip_tally = SkipVoteTally()
@@ -56,13 +56,41 @@ def is_song_in_queue(item, server_id=None):
 class TrackTimeTracker:
     """Keep track of what time a song is at even when paused/resumed or stopped."""
 
-    def __init__(self):
-        """Initialize a TrackTimeTracker object."""
+    def __init__(self, on_change=None):
+        """Initialize a TrackTimeTracker object.
+
+        on_change, if given, is called with no arguments after every start, pause, resume, seek or stop.
+        """
         self.track_name = None
         self.state = "stopped"  # "playing", "paused", "stopped"
         self.accumulated_elapsed = 0.0
         self.last_resume_time = None
         self.current_track = None
+        self.on_change = on_change
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def snapshot(self):
+        """Capture the clock state so another process can restore it.
+
+        Returns:
+            A JSON-serializable dict of the clock state.
+        """
+        return {
+            "track_name": self.track_name,
+            "state": self.state,
+            "accumulated_elapsed": self.accumulated_elapsed,
+            "last_resume_time": self.last_resume_time,
+        }
+
+    def restore(self, snapshot):
+        """Adopt clock state captured by snapshot(), without notifying on_change."""
+        self.track_name = snapshot.get("track_name")
+        self.state = snapshot.get("state", "stopped")
+        self.accumulated_elapsed = float(snapshot.get("accumulated_elapsed") or 0.0)
+        self.last_resume_time = snapshot.get("last_resume_time")
 
     @property
     def last_update_time(self):
@@ -98,6 +126,7 @@ class TrackTimeTracker:
         self.state = "playing"
         self.accumulated_elapsed = 0.0
         self.last_resume_time = time.time()
+        self._changed()
 
     def pause(self):
         """Pause the track and record elapsed time."""
@@ -105,12 +134,21 @@ class TrackTimeTracker:
             self.accumulated_elapsed += time.time() - self.last_resume_time
             self.state = "paused"
             self.last_resume_time = None
+            self._changed()
 
     def resume(self):
         """Resume the track from where it left off."""
         if self.state == "paused":
             self.last_resume_time = time.time()
             self.state = "playing"
+            self._changed()
+
+    def seek(self, elapsed, playing):
+        """Jump to elapsed seconds, playing or paused from there."""
+        self.accumulated_elapsed = float(elapsed)
+        self.state = "playing" if playing else "paused"
+        self.last_resume_time = time.time() if playing else None
+        self._changed()
 
     def stop(self):
         """Stop tracking the track."""
@@ -118,6 +156,7 @@ class TrackTimeTracker:
         self.track_name = None
         self.accumulated_elapsed = 0.0
         self.last_resume_time = None
+        self._changed()
 
     def reset(self):
         """Reset track time."""
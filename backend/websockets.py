@@ -3,11 +3,35 @@
 import asyncio
 import json
 import logging
+import time
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from backend.backplane import (
+    cast_vote,
+    clear_votes,
+    drop_client,
+    load_clients,
+    load_vote_status,
+    merge_client,
+    publish_client_update,
+    publish_event,
+    store_client,
+)
+from backend.broadcast import (
+    Coalescer,
+    attach_outbox,
+    broadcast,
+    detach_outbox,
+    evict,
+    negotiate_encoding,
+    send,
+)
+from backend.event_log import append_event, events_since, latest_seq
 from backend.services.plex import get_current_playing_track, get_redis_queue
+from backend.services.prefetch import request_prefetch
+from backend.services.redis import get_top_vibes
 
 router = APIRouter()
 
@@ -19,18 +43,39 @@ active_connections = {
     "music_control": {},  # Store music control connections
     "queue_update": {},  # Store queue update connections
     "client_control": {},  # Store per-browser control connections
+    "stats": {},  # Store stats leaderboard connections
     "unknown": {},
 }
 
-# Registry of named browser sessions keyed by client_id (browser-generated UUID)
+# Registry of named browser sessions on this worker keyed by client_id (browser-generated UUID).
+# The cluster-wide registry lives in Redis; this copy serves reads while Redis is unreachable.
 client_registry: dict[str, dict] = {}
 
+# music_control sessions that negotiated event-driven now-playing frames instead of 1 second ticks
+event_sessions: set[str] = set()
+
+# (item_id, track_state) of the last now-playing frame sent to every music_control socket
+_last_now_playing_state: tuple | None = None
+
+# Connection type that subscribes to several of the groups above over one socket
+MULTIPLEX = "multiplex"
+MULTIPLEX_CHANNELS = ("music_control", "queue_update", "client_control", "stats")
+
+QUEUE_BROADCAST_WINDOW = 0.05
+
+# A connection silent for PING_INTERVAL seconds is pinged and must answer within PONG_DEADLINE
+PING_INTERVAL = 20.0
+PONG_DEADLINE = 10.0
+SWEEP_INTERVAL = 5.0
+VOTE_BROADCAST_INTERVAL = 0.25
+STATS_BROADCAST_INTERVAL = 1.0
+
 
 async def send_to_specific_client(session_id: str, message: dict, message_type: str):
     """Send a message to a specific WebSocket client based on session ID."""
     try:
         connection = active_connections[message_type][session_id]
-        await connection.send_text(json.dumps(message))
+        await send(connection, message)
     except KeyError:
         logger.exception(
             "Session ID %s not found in %s", session_id, active_connections
@@ -40,40 +85,110 @@ async def send_to_specific_client(session_id: str, message: dict, message_type:
 async def send_to_client_id(client_id: str, message: dict):
     """Send a message to all WS connections belonging to a browser client_id."""
     ws = active_connections["client_control"].get(client_id)
-    if ws:
-        try:
-            await ws.send_text(json.dumps(message))
-        except Exception:
-            logger.exception("Failed to send to client_id %s", client_id)
-            active_connections["client_control"].pop(client_id, None)
-            client_registry.pop(client_id, None)
+    if ws is None:
+        # The client may be connected to another worker
+        publish_event(message, target=client_id)
+    elif not await send(ws, message):
+        logger.error("Failed to send to client_id %s", client_id)
+        active_connections["client_control"].pop(client_id, None)
+        client_registry.pop(client_id, None)
+        drop_client(client_id)
+
+
+async def fan_out(message: dict, *group_names: str, coalesce: str | None = None):
+    """Deliver a message to this worker's sockets in the named groups and publish it to the other workers.
+
+    The message is logged first and carries the resulting seq, so clients can resume from it.
+    """
+    message = {**message, "seq": append_event(message, group_names, coalesce)}
+    publish_event(message, group_names, coalesce)
+    await broadcast(message, *(active_connections[name] for name in group_names), coalesce=coalesce)
+
+
+async def deliver_event(event: dict):
+    """Deliver a message published by another worker to this worker's own sockets.
+
+    Registry changes made on another worker are applied to this worker's entry for the client instead.
+    """
+    global _last_now_playing_state
+    if "client_update" in event:
+        update = event["client_update"]
+        if update["client_id"] in client_registry:
+            client_registry[update["client_id"]].update(update["fields"])
+        return
+    message = event["message"]
 
+    if event.get("target"):
+        ws = active_connections["client_control"].get(event["target"])
+        if ws is not None:
+            await send(ws, message)
+        return
 
-from collections import Counter
+    if event.get("coalesce") == "now_playing":
+        # Keep the tick loop from re-announcing a state change another worker already sent
+        track = message.get("current_track")
+        _last_now_playing_state = (track["item_id"], track["track_state"]) if track else None
 
+    groups = [active_connections[name] for name in event.get("groups", []) if name in active_connections]
+    await broadcast(message, *groups, coalesce=event.get("coalesce"))
 
-def calculate_top_vibes(play_queue: list) -> list[str]:
-    """Aggregate track moods and retrieve the top 3."""
-    if not play_queue:
-        return []
-    
-    moods = []
-    for item in play_queue:
-        item_moods = item.get("moods")
-        if item_moods and isinstance(item_moods, list):
-            moods.extend(item_moods)
-            
-    if moods:
-        counts = Counter(moods)
-        return [tag for tag, _ in counts.most_common(3)]
-        
-    return []
+
+def get_connected_clients() -> dict[str, dict]:
+    """Return the registry entries of clients connected to any worker."""
+    clients = load_clients()
+    return client_registry if clients is None else clients
+
+
+def update_client(client_id: str, **fields) -> dict | None:
+    """Change fields of a connected client's registry entry, wherever it is connected.
+
+    Returns:
+        The updated entry, or None if the client is not connected.
+    """
+    entry = get_connected_clients().get(client_id)
+    if entry is None:
+        return None
+    entry = {**entry, **fields}
+    entry.pop("worker", None)
+    if client_id in client_registry:
+        client_registry[client_id].update(fields)
+    # The worker serving the client stays its owner, so that worker still drops it on disconnect
+    if not merge_client(client_id, fields) and client_id in client_registry:
+        store_client(client_id, client_registry[client_id], vote_weight(entry.get("role", "guest")))
+    publish_client_update(client_id, fields)
+    return entry
+
+
+def calculate_top_vibes() -> list[str]:
+    """Retrieve the top 3 moods across the queue from the Redis mood histogram."""
+    return get_top_vibes(3)
 
 
 async def send_queue():
-    """Send the current queue to all connected WebSocket clients of 'queue_update' message_type."""
+    """Send the current queue to all connected WebSocket clients of 'queue_update' message_type.
+
+    Calls arriving within QUEUE_BROADCAST_WINDOW of each other share one broadcast, so a burst of
+    queue mutations reads and sends the queue once. Returns after that broadcast has gone out.
+    """
+    await _queue_broadcasts.request()
+
+
+async def _broadcast_queue():
     play_queue = get_redis_queue()
-    
+    request_prefetch(play_queue)
+    message = queue_message(play_queue)
+    logger.debug("Sending play queue: %s", message["queue"])
+
+    # Send the queue to all active connections of message_type 'queue_update'
+    await fan_out(message, "queue_update", coalesce="queue_update")
+
+
+def queue_message(play_queue: list[dict]) -> dict:
+    """Build a queue_update frame from the current queue.
+
+    Returns:
+        The frame, with the playing track standing in for an empty queue.
+    """
     # If the queue is empty but there's a currently playing track on the player,
     # prepend it so the UI always displays it at the top of the queue panel!
     if not play_queue:
@@ -89,27 +204,50 @@ async def send_queue():
                 "server_name": current.get("server_name"),
             }]
 
-    message = {
+    return {
         "type": "queue_update",
         "message": "Queue update",
         "queue": play_queue,  # No need for json.dumps here
-        "vibes": calculate_top_vibes(play_queue),
+        "vibes": calculate_top_vibes(),
     }
-    logger.debug("Sending play queue: %s", play_queue)
 
-    # Send the queue to all active connections of message_type 'queue_update'
-    for session_id in list(active_connections["queue_update"].keys()):
-        try:
-            logger.debug("Sending queue to connection %s", session_id)
-            await send_to_specific_client(session_id, message, "queue_update")
-        except Exception as e:
-            # ruff: noqa: TRY401
-            logger.exception("Failed to send to session %s: %s", session_id, e)
-            active_connections["queue_update"].pop(session_id, None)
 
+_queue_broadcasts = Coalescer(QUEUE_BROADCAST_WINDOW, _broadcast_queue)
+
+
+async def send_current_playing(tick: bool = False):
+    """Send the current playing track to connected WebSocket clients of 'music_control' message_type.
+
+    Every frame carries the server time it was built at and the playback rate, so clients in the
+    "events" now-playing mode can interpolate progress locally. Periodic ticks (tick=True) only go
+    to legacy clients, unless the track or play state changed since the last full frame, in which
+    case the tick is promoted to a state-change frame for everyone.
+    """
+    global _last_now_playing_state
+    message = now_playing_message()
+    track_data = message["current_track"]
+
+    state = (track_data["item_id"], track_data["track_state"]) if track_data else None
+    if tick and state == _last_now_playing_state:
+        if not track_data or track_data["track_state"] != "playing":
+            return
+    else:
+        tick = False
+        _last_now_playing_state = state
+
+    if tick:
+        # Legacy ticks come from each worker's own loop, so they are never published
+        await broadcast(message, active_connections["music_control"], coalesce="now_playing", exclude=event_sessions)
+    else:
+        await fan_out(message, "music_control", coalesce="now_playing")
+
+
+def now_playing_message() -> dict:
+    """Build a now-playing frame from the local playback clock.
 
-async def send_current_playing():
-    """Send the current playing track to all connected WebSocket clients of 'music_control' message_type."""
+    Returns:
+        The frame, with current_track None when nothing is playing.
+    """
     current_track = get_current_playing_track()
     logger.debug("Sending current playing track: %s", current_track)
 
@@ -127,16 +265,16 @@ async def send_current_playing():
     else:
         track_data = None
 
-    message = {"message": "Current track update", "current_track": track_data}
-
-    # Send the message to all active connections of message_type 'music_control'
-    for session_id in list(active_connections["music_control"].keys()):
-        try:
-            logger.debug("Sending current track to connection %s", session_id)
-            await send_to_specific_client(session_id, message, "music_control")
-        except Exception as e:
-            logger.exception("Failed to send to session %s: %s", session_id, e)
-            active_connections["music_control"].pop(session_id, None)
+    server_time = time.time()
+    playing = bool(track_data) and track_data["track_state"] == "playing"
+    return {
+        "message": "Current track update",
+        "current_track": track_data,
+        "server_time": server_time,
+        "playback_rate": 1.0 if playing else 0.0,
+        # Server wall time at which the track was at 0:00, for clients that know their clock offset
+        "track_started_at": server_time - track_data["elapsed_time"] if playing else None,
+    }
 
 
 async def update_websocket_clients():
@@ -144,31 +282,181 @@ async def update_websocket_clients():
     while True:
         try:
             # Lazy import to avoid circular dependencies
-            from backend.services.plex import track_time_tracker  # noqa: PLC0415
+            from backend.services.plex import sync_playback_clock, track_time_tracker  # noqa: PLC0415
 
-            if active_connections:
-                if track_time_tracker.is_playing:
-                    await send_current_playing()
-        except Exception as e:
-            logger.exception("Error in update_websocket_clients loop: %s", e)
+            if active_connections["music_control"]:
+                sync_playback_clock()
+                if track_time_tracker.is_playing or _last_now_playing_state is not None:
+                    await send_current_playing(tick=True)
+        except Exception:
+            logger.exception("Error in update_websocket_clients loop")
         await asyncio.sleep(1)
 
 
 def _register_client(client_id: str, name: str, role: str, is_display: bool = False):
-    """Upsert a client entry in the registry."""
-    existing = client_registry.get(client_id, {})
+    """Upsert a client entry in this worker's registry and the shared one in Redis."""
+    existing = client_registry.get(client_id) or get_connected_clients().get(client_id, {})
     client_registry[client_id] = {
         "name": name,
         "role": role,
         "is_display": is_display or existing.get("is_display", False),
         "connected_at": existing.get("connected_at", datetime.now(UTC).isoformat()),
     }
-    try:
-        from backend.services.redis import get_redis_queue_client
-        client = get_redis_queue_client()
-        client.hset("stats:user_roles", name, "display" if is_display else role)
-    except Exception:
-        pass
+    weight = vote_weight(role)
+    skip_tally.join(client_id, weight)
+    store_client(client_id, client_registry[client_id], weight)
+    from backend.services.stats import set_user_role  # noqa: PLC0415
+    set_user_role(name, "display" if is_display else role)
+
+
+def _negotiate_now_playing_mode(session_id: str, data: dict):
+    """Record whether a music_control session asked for event-driven frames or legacy 1 second ticks."""
+    mode = data.get("now_playing_mode")
+    if mode == "events":
+        event_sessions.add(session_id)
+    elif mode is not None:
+        event_sessions.discard(session_id)
+
+
+class LiveConnection:
+    """Liveness of one accepted socket: when it was last heard from and whether a ping is outstanding."""
+
+    def __init__(self, websocket: WebSocket, session_id: str, channels: list[str]):
+        """Track a socket that was just accepted, so it counts as heard from now."""
+        self.websocket = websocket
+        self.session_id = session_id
+        self.channels = channels
+        self.last_seen = time.monotonic()
+        self.last_seen_at = time.time()
+        self.reported_at = 0.0
+        self.pinged_at: float | None = None
+
+    def touch(self):
+        """Record that the client sent something, which also answers any outstanding ping."""
+        self.last_seen = time.monotonic()
+        self.last_seen_at = time.time()
+        self.pinged_at = None
+
+
+# Accepted sockets on this worker, swept for clients that stopped answering
+live_connections: dict[WebSocket, LiveConnection] = {}
+
+
+def _join_channels(websocket: WebSocket, session_id: str, channels: list[str]):
+    """Add an accepted socket to each of its groups under its session, creating unknown groups."""
+    for channel in channels:
+        active_connections.setdefault(channel, {})[session_id] = websocket
+
+
+async def _forget_connection(websocket: WebSocket, session_id: str, channels: list[str]):
+    """Remove a closed or dead socket from its groups, and its client from the registry and vote totals.
+
+    A client that already reconnected on another socket keeps its groups and registry entry.
+    """
+    live_connections.pop(websocket, None)
+    for group in active_connections.values():
+        if group.get(session_id) is websocket:
+            group.pop(session_id)
+    # Remove from client_registry only for client_control (keyed by client_id)
+    if "client_control" in channels and session_id not in active_connections["client_control"]:
+        client_registry.pop(session_id, None)
+        skip_tally.leave(session_id)
+        drop_client(session_id)
+        await broadcast_skip_status()
+
+
+async def sweep_connections():
+    """Ping quiet connections, evict those that missed their deadline and refresh clients' last_seen."""
+    now = time.monotonic()
+    for conn in list(live_connections.values()):
+        if conn.pinged_at is not None and now - conn.pinged_at > PONG_DEADLINE:
+            await _forget_connection(conn.websocket, conn.session_id, conn.channels)
+            evict(conn.websocket, "missed its ping deadline")
+            continue
+        if conn.pinged_at is None and now - conn.last_seen > PING_INTERVAL:
+            conn.pinged_at = now
+            if not await send(conn.websocket, {"type": "ping", "server_time": time.time()}):
+                await _forget_connection(conn.websocket, conn.session_id, conn.channels)
+                evict(conn.websocket, "failed to take a ping")
+                continue
+        entry = client_registry.get(conn.session_id)
+        if "client_control" in conn.channels and entry is not None and conn.last_seen_at > conn.reported_at:
+            conn.reported_at = conn.last_seen_at
+            entry["last_seen"] = datetime.fromtimestamp(conn.last_seen_at, UTC).isoformat()
+            # Only last_seen is written, so edits made on other workers survive; a missing entry is re-joined
+            if not merge_client(conn.session_id, {"last_seen": entry["last_seen"]}):
+                store_client(conn.session_id, entry, vote_weight(entry.get("role", "guest")))
+
+
+async def connection_sweeper():
+    """Background task that keeps the registries down to clients that are actually alive."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            await sweep_connections()
+        except Exception:
+            logger.exception("Error sweeping WebSocket connections.")
+
+
+def _requested_channels(data: dict) -> list[str]:
+    """Read the channels a multiplexed connection subscribes to, defaulting to all of them."""
+    requested = data.get("channels") or MULTIPLEX_CHANNELS
+    return [channel for channel in MULTIPLEX_CHANNELS if channel in requested]
+
+
+async def _resume(websocket: WebSocket, channels: list[str], last_seq) -> bool:
+    """Replay the events a reconnecting client missed since last_seq.
+
+    Returns:
+        True if the client was caught up, False if last_seq fell out of the log and it needs snapshots.
+    """
+    if last_seq is None:
+        return False
+    missed = events_since(last_seq, *channels)
+    if missed is None:
+        logger.info("Seq %s is outside the event log, sending %s snapshots.", last_seq, channels)
+        return False
+    for message, coalesce in missed:
+        await send(websocket, message, coalesce=coalesce)
+    logger.debug("Resumed %s session with %d missed events.", channels, len(missed))
+    return True
+
+
+async def _send_combined_snapshot(websocket: WebSocket, channels: list[str]):
+    """Send a multiplexed client the state of every channel it joined in one frame.
+
+    Each channel's entry holds the frame that channel's own snapshot would have sent. The seq is
+    read before any state, so resuming from it can only replay events the snapshot already covers.
+    """
+    snapshot = {"type": "snapshot", "channels": channels, "seq": latest_seq()}
+    if "music_control" in channels:
+        from backend.services.plex import check_plexamp_resync  # noqa: PLC0415
+        await check_plexamp_resync(force_align=True)
+        snapshot["music_control"] = now_playing_message()
+    if "music_control" in channels or "client_control" in channels:
+        snapshot["skip_votes"] = get_skip_vote_status()
+    if "queue_update" in channels:
+        snapshot["queue_update"] = queue_message(get_redis_queue())
+    if "stats" in channels:
+        from backend.services import stats  # noqa: PLC0415
+        snapshot["stats"] = await asyncio.to_thread(stats.get_leaderboards)
+    await send(websocket, snapshot)
+
+
+async def _send_snapshots(websocket: WebSocket, message_type: str, channels: list[str]):
+    """Bring a new client up to date with full now-playing, skip vote or queue state."""
+    if message_type == MULTIPLEX:
+        await _send_combined_snapshot(websocket, channels)
+    elif message_type == "music_control":
+        from backend.services.plex import check_plexamp_resync  # noqa: PLC0415
+        await check_plexamp_resync(force_align=True)
+        await send_current_playing()
+        status = get_skip_vote_status()
+        await send(websocket, {"type": "skip_vote_update", "status": status}, coalesce="skip_vote_update")
+    elif message_type == "queue_update":
+        await send_queue()
+    elif message_type == "stats":
+        await send(websocket, await stats_message(), coalesce="stats_update")
 
 
 # ruff: noqa: C901
@@ -192,49 +480,50 @@ async def websocket_handler(websocket: WebSocket):
         await websocket.close()
         return
 
-    # Ensure the correct category exists in active_connections
-    if message_type not in active_connections:
-        active_connections[message_type] = {}
+    # Frames to this socket go through its own bounded buffer and writer task from here on,
+    # as JSON text or, if the client asked for it, msgpack binary
+    attach_outbox(websocket)
+    negotiate_encoding(websocket, data.get("encoding"))
+
+    # A multiplexed connection joins several groups under one session; others join their own
+    channels = _requested_channels(data) if message_type == MULTIPLEX else [message_type]
 
     # client_control connections are keyed by client_id (browser-generated UUID)
-    if message_type == "client_control":
+    if "client_control" in channels:
         client_id = data.get("client_id", str(id(websocket)))
         name = data.get("name", "Unknown")
         role = data.get("role", "guest")
         is_display = data.get("is_display", False)
         _register_client(client_id, name, role, is_display)
-        active_connections["client_control"][client_id] = websocket
         session_id = client_id
         await broadcast_skip_status()
     else:
         session_id = str(id(websocket))
-        active_connections[message_type][session_id] = websocket
+    _join_channels(websocket, session_id, channels)
+    if "music_control" in channels:
+        _negotiate_now_playing_mode(session_id, data)
+    conn = live_connections[websocket] = LiveConnection(websocket, session_id, channels)
 
     logger.debug(
-        "Current active connections for '%s': %s",
-        message_type,
-        active_connections[message_type],
+        "Current active connections for %s: %s",
+        channels,
+        {channel: active_connections[channel] for channel in channels},
     )
     logger.info(
         "New WebSocket connection of type %s, session %s", message_type, session_id
     )
 
-    # Send initial state update immediately to the new client
+    # Catch a reconnecting client up from the event log, or send initial state snapshots
     try:
-        if message_type == "music_control":
-            from backend.services.plex import check_plexamp_resync  # noqa: PLC0415
-            await check_plexamp_resync(force_align=True)
-            await send_current_playing()
-            status = get_skip_vote_status()
-            await websocket.send_text(json.dumps({"type": "skip_vote_update", "status": status}))
-        elif message_type == "queue_update":
-            await send_queue()
-    except Exception as e:
-        logger.exception("Failed to send initial state to %s: %s", session_id, e)
+        if not await _resume(websocket, channels, data.get("last_seq")):
+            await _send_snapshots(websocket, message_type, channels)
+    except Exception:
+        logger.exception("Failed to send initial state to %s", session_id)
 
     try:
         while True:
             message = await websocket.receive_text()
+            conn.touch()
             data = json.loads(message)
             logger.debug("Received message from client %s", message)
 
@@ -246,7 +535,21 @@ async def websocket_handler(websocket: WebSocket):
 
             if message_type == "heartbeat":
                 logger.debug("sending heartbeat")
-                await websocket.send_text(json.dumps({"message": "pong"}))
+                await send(websocket, {"message": "pong"})
+
+            elif message_type == "time_sync":
+                # One NTP-style exchange: the client works out its clock offset from the four timestamps;
+                # the message was received when touch() stamped the connection
+                await send(websocket, {
+                    "type": "time_sync",
+                    "client_time": data.get("client_time"),
+                    "server_receive": conn.last_seen_at,
+                    "server_send": time.time(),
+                })
+
+            elif message_type == "pong":
+                # Answer to a server ping; touching the connection above was all it needed
+                pass
 
             elif message_type == "queue_update":
                 logger.debug("sending queue_update")
@@ -254,6 +557,7 @@ async def websocket_handler(websocket: WebSocket):
 
             elif message_type == "music_control":
                 logger.debug("sending current_playing")
+                _negotiate_now_playing_mode(session_id, data)
                 await send_current_playing()
 
             elif message_type == "client_control":
@@ -268,18 +572,19 @@ async def websocket_handler(websocket: WebSocket):
 
             elif message_type == "cast_skip_vote":
                 client_id = data.get("client_id")
-                vote = data.get("vote", False)
                 if client_id:
-                    if vote:
-                        skip_votes.add(client_id)
-                        voter = client_registry.get(client_id, {})
-                        voter_name = voter.get("name")
+                    if data.get("vote", False):
+                        skip_tally.vote(client_id, vote=True)
+                        cast_vote(client_id, vote=True)
+                        voter_name = client_registry.get(client_id, {}).get("name")
                         if voter_name:
-                            from backend.services.stats import increment_skips_cast
-                            increment_skips_cast(voter_name)
+                            from backend.services.stats import increment_skips_cast  # noqa: PLC0415
+                            increment_skips_cast(voter_name, (get_current_playing_track() or {}).get("item_id"))
+                            broadcast_stats()
                     else:
-                        skip_votes.discard(client_id)
-                    
+                        skip_tally.vote(client_id, vote=False)
+                        cast_vote(client_id, vote=False)
+
                     status = get_skip_vote_status()
                     if status["total"] > 0 and status["votes"] > status["total"] / 2:
                         from backend.services.plex import skip_current_track  # noqa: PLC0415
@@ -291,12 +596,13 @@ async def websocket_handler(websocket: WebSocket):
                                 current_track = queue[0]
                                 adder = current_track.get("added_by")
                                 if adder:
-                                    increment_skips_received(adder)
+                                    increment_skips_received(adder, current_track.get("item_id"))
+                                    broadcast_stats()
                         except Exception:
                             logger.exception("Failed to track skips_received stat")
 
                         try:
-                            skip_current_track()
+                            await asyncio.to_thread(skip_current_track)
                         except Exception:
                             logger.exception("Failed to skip track via skip vote")
                         await reset_skip_votes()
@@ -304,19 +610,17 @@ async def websocket_handler(websocket: WebSocket):
                         await broadcast_skip_status()
 
     except WebSocketDisconnect:
-        for key in list(active_connections.keys()):
-            if session_id in active_connections[key]:
-                active_connections[key].pop(session_id, None)
-        # Remove from client_registry only for client_control (keyed by client_id)
-        if message_type == "client_control":
-            client_registry.pop(session_id, None)
-            skip_votes.discard(session_id)
-            await broadcast_skip_status()
         logger.info(
             "WebSocket connection from %s closed. Active connections: %d",
             websocket.client,
             len(active_connections),
         )
+    finally:
+        # Whatever ended the connection, its groups, registry entry and vote weight go with it
+        await _forget_connection(websocket, session_id, channels)
+        detach_outbox(websocket)
+        if session_id not in active_connections["music_control"]:
+            event_sessions.discard(session_id)
 
 
 @router.websocket("/ws")
@@ -325,67 +629,128 @@ async def websocket_endpoint(websocket: WebSocket):
     await websocket_handler(websocket)
 
 
-# Skip voting system state
-skip_votes: set[str] = set()
+def vote_weight(role: str) -> int:
+    """Weigh a client's skip vote by its role: admins count double, everyone else once."""
+    return 2 if role == "admin" else 1
 
 
-def get_skip_vote_status():
-    """Calculate current weighted votes and connected potential total."""
-    connected_clients = list(active_connections["client_control"].keys())
-    
-    total_weight = 0
-    voted_weight = 0
-    
-    for client_id in connected_clients:
-        client = client_registry.get(client_id, {})
-        role = client.get("role", "guest")
-        
-        # Calculate vote weight
-        if role == "admin":
-            weight = 2
-        else: # guest / display / unknown / member
-            weight = 1
-            
-        total_weight += weight
-        if client_id in skip_votes:
-            voted_weight += weight
-            
-    return {
-        "votes": voted_weight,
-        "total": total_weight,
-        "voted_ids": list(skip_votes & set(connected_clients))
-    }
+class SkipVoteTally:
+    """Running weighted skip vote totals for the clients connected to this worker.
 
+    Totals are adjusted as clients join, leave and vote, so reading the status never walks the
+    registry. The shared totals in Redis are kept the same way; this copy serves while Redis is
+    unreachable.
+    """
+
+    def __init__(self):
+        """Start with no clients and no votes."""
+        self.weights: dict[str, int] = {}
+        self.voters: set[str] = set()
+        self.total = 0
+        self.votes = 0
+
+    def join(self, client_id: str, weight: int):
+        """Count a connected client, or re-weigh one that registered again with another role."""
+        delta = weight - self.weights.get(client_id, 0)
+        self.weights[client_id] = weight
+        self.total += delta
+        if client_id in self.voters:
+            self.votes += delta
+
+    def leave(self, client_id: str):
+        """Stop counting a disconnected client and withdraw its vote."""
+        weight = self.weights.pop(client_id, 0)
+        self.total -= weight
+        if client_id in self.voters:
+            self.voters.discard(client_id)
+            self.votes -= weight
+
+    def vote(self, client_id: str, vote: bool):
+        """Add or withdraw a connected client's vote; votes from unknown clients are ignored."""
+        if client_id not in self.weights:
+            return
+        if vote and client_id not in self.voters:
+            self.voters.add(client_id)
+            self.votes += self.weights[client_id]
+        elif not vote and client_id in self.voters:
+            self.voters.discard(client_id)
+            self.votes -= self.weights[client_id]
+
+    def clear(self):
+        """Drop every vote while keeping the connected total."""
+        self.voters.clear()
+        self.votes = 0
+
+    def status(self) -> dict:
+        """Summarize the tally in the shape sent to clients."""
+        return {"votes": self.votes, "total": self.total, "voted_ids": sorted(self.voters)}
 
-async def _send_safe(ws: WebSocket, message: dict):
-    """Safely send a JSON message over websocket, swallowing any connection failures."""
-    try:
-        await ws.send_text(json.dumps(message))
-    except Exception:
-        pass
+
+skip_tally = SkipVoteTally()
+
+
+def get_skip_vote_status():
+    """Return the current weighted votes and connected potential total across all workers."""
+    status = load_vote_status()
+    return status if status is not None else skip_tally.status()
 
 
 async def broadcast_skip_status():
-    """Broadcast skip vote updates to all client control and music control sockets."""
+    """Schedule a skip vote update for all client control and music control sockets.
+
+    Joins, leaves and votes arriving within VOTE_BROADCAST_INTERVAL share one status frame,
+    so a burst of votes costs one read and one broadcast and the rate stays bounded. Returns
+    without waiting for the window, so the caller's receive loop is never held up.
+    """
+    _vote_broadcasts.schedule()
+
+
+async def _broadcast_skip_status():
     status = get_skip_vote_status()
     message = {"type": "skip_vote_update", "status": status}
-    
-    for client_id, ws in list(active_connections["client_control"].items()):
-        asyncio.create_task(_send_safe(ws, message))
+    await fan_out(message, "client_control", "music_control", coalesce="skip_vote_update")
+
+
+_vote_broadcasts = Coalescer(VOTE_BROADCAST_INTERVAL, _broadcast_skip_status)
+
+
+def broadcast_stats():
+    """Schedule a leaderboard update for all stats sockets; must be called on the event loop.
 
-    for session_id, ws in list(active_connections["music_control"].items()):
-        asyncio.create_task(_send_safe(ws, message))
+    Stat changes within STATS_BROADCAST_INTERVAL share one frame, built from the cached
+    leaderboards, so clients can drop their polling of /api/stats.
+    """
+    _stats_broadcasts.schedule()
+
+
+async def stats_message() -> dict:
+    """Build a stats_update frame with the session and all-time top-N leaderboards.
+
+    Returns:
+        The frame.
+    """
+    from backend.services import stats  # noqa: PLC0415
+    return {"type": "stats_update", **await asyncio.to_thread(stats.get_leaderboards)}
+
+
+async def _broadcast_stats():
+    await fan_out(await stats_message(), "stats", coalesce="stats_update")
+
+
+_stats_broadcasts = Coalescer(STATS_BROADCAST_INTERVAL, _broadcast_stats)
+
+# How many broadcasts callers asked for versus how many were actually sent, per kind
+broadcast_counters = {
+    "queue": _queue_broadcasts.counters,
+    "skip_votes": _vote_broadcasts.counters,
+    "stats": _stats_broadcasts.counters,
+}
 
 
 async def reset_skip_votes():
     """Clear all cast skip votes and broadcast a reset event."""
-    skip_votes.clear()
+    skip_tally.clear()
+    clear_votes()
     status = get_skip_vote_status()
     message = {"type": "skip_vote_reset", "status": status}
-    
-    for client_id, ws in list(active_connections["client_control"].items()):
-        asyncio.create_task(_send_safe(ws, message))
-
-    for session_id, ws in list(active_connections["music_control"].items()):
-        asyncio.create_task(_send_safe(ws, message))
-
+    await fan_out(message, "client_control", "music_control")
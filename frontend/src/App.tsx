@@ -1661,6 +1661,8 @@ function App() {
           setIsDisplay(false);
         } else if (data.message === "pong") {
           window.clearTimeout(pongTimeout);
+        } else if (data.type === "ping") {
+          ws.send(JSON.stringify({ type: "pong" }));
         }
       } catch (err) {
         console.error("Error parsing WS message:", err);
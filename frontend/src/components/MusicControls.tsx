@@ -83,6 +83,8 @@ const MusicControlsComponent = ({
               setSkipTotal(status.total);
               const cid = localStorage.getItem("tunebox_client_id") || "";
               setHasVoted(status.voted_ids.includes(cid));
+            } else if (data.type === "ping") {
+              socketRef.current?.send(JSON.stringify({ type: "pong" }));
             } else if (data.type === "skip_vote_reset") {
               setSkipVotes(0);
               setSkipTotal(data.status ? data.status.total : 0);
@@ -170,6 +170,8 @@ const QueueComponent = () => {
               setVibes(data.vibes || []);
             } else if (data.message === "pong") {
               clearTimeout(pongTimeoutRef.current!);
+            } else if (data.type === "ping") {
+              socketRef.current?.send(JSON.stringify({ type: "pong" }));
             }
           } catch (error) {
             console.error("Error parsing WebSocket message:", error);
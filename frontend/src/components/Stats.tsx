@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { Typography } from "@mui/material";
 import axios from "axios";
@@ -30,10 +30,50 @@ export default function Stats({ apiBase }: { apiBase: string }) {
   const [loading, setLoading] = useState(true);
   const [hideStaff, setHideStaff] = useState(true);
 
+  const socketRef = useRef<WebSocket | null>(null);
+
   useEffect(() => {
     fetchStats();
   }, []);
 
+  // Leaderboard changes are pushed over a stats WebSocket instead of polled
+  useEffect(() => {
+    const wsUrl = apiBase.replace(/^http/, "ws") + "/ws";
+    let reconnectTimer: number | undefined;
+    let closed = false;
+
+    const connect = () => {
+      const socket = new WebSocket(wsUrl);
+      socketRef.current = socket;
+      socket.onopen = () => {
+        socket.send(JSON.stringify({ type: "stats", message: "subscribe" }));
+      };
+      socket.onmessage = (event) => {
+        try {
+          const message = JSON.parse(event.data);
+          if (message.type === "stats_update") {
+            setData({ session: message.session, all_time: message.all_time });
+            setLoading(false);
+          } else if (message.type === "ping") {
+            socket.send(JSON.stringify({ type: "pong" }));
+          }
+        } catch (error) {
+          console.error("Error parsing stats WebSocket message:", error);
+        }
+      };
+      socket.onclose = () => {
+        if (!closed) reconnectTimer = window.setTimeout(connect, 5000);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      socketRef.current?.close();
+    };
+  }, [apiBase]);
+
   const fetchStats = async () => {
     try {
       setLoading(true);